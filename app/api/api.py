@@ -4,10 +4,12 @@ from app.api.routers import (
     account_type_router,
     action_router,
     analytics_router,
+    asset_router,
     auth_router,
     city_router,
     configuration_router,
     country_router,
+    deletion_job_router,
     device_router,
     enrolment_router,
     factory_reset_protection_router,
@@ -33,12 +35,16 @@ api_router.include_router(root_router, tags=["Root"])
 # Include all other routers
 api_router.include_router(action_router, prefix="/actions", tags=["actions"])
 api_router.include_router(analytics_router, prefix="/analytics", tags=["analytics"])
+api_router.include_router(asset_router, prefix="/assets", tags=["assets"])
 api_router.include_router(auth_router, prefix="/auth", tags=["authentication"])
 api_router.include_router(city_router, prefix="/cities", tags=["cities"])
 api_router.include_router(
     configuration_router, prefix="/configurations", tags=["configurations"]
 )
 api_router.include_router(country_router, prefix="/countries", tags=["countries"])
+api_router.include_router(
+    deletion_job_router, prefix="/deletion-jobs", tags=["deletion-jobs"]
+)
 api_router.include_router(device_router, prefix="/devices", tags=["devices"])
 api_router.include_router(enrolment_router, prefix="/enrolments", tags=["enrolments"])
 api_router.include_router(
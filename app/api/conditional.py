@@ -0,0 +1,113 @@
+"""
+GET condicional (ETag / If-None-Match) para listados y catálogos.
+
+El ETag no se calcula sobre el cuerpo: sale de marcadores de cambio baratos
+de la consulta (número de filas y `max(updated_at)`, o un hash agregado de
+las filas para catálogos sin `updated_at`) más la ruta y los parámetros de la
+petición. Si el cliente ya tiene esa versión se responde 304 sin cargar ni
+serializar las filas.
+
+Es un ETag débil (`W/`): identifica el contenido lógico, no los bytes, y es
+el mismo con o sin compresión. Los cambios en objetos anidados que no
+actualizan la fila principal solo se reflejan si su tabla se añade como
+marcador (p. ej. los pagos en el listado de planes).
+
+Uso en un endpoint:
+
+    etag = make_etag(request, await change_marker(query))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    return with_etag(serializer_for(Schema).response(await query), etag)
+"""
+
+from datetime import datetime
+from hashlib import blake2b
+from typing import Any, Optional, Tuple, Type
+
+from fastapi import Request, Response
+from tortoise.connection import connections
+from tortoise.expressions import Subquery
+from tortoise.functions import Count, Max
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+Marker = Tuple[Any, ...]
+
+# El cliente siempre revalida; la respuesta puede guardarse pero no en cachés compartidas
+CACHE_CONTROL = "private, no-cache"
+
+
+async def change_marker(query: QuerySet, field: str = "updated_at") -> Marker:
+    """(filas, último cambio) de la consulta, sin paginación ni orden."""
+    model = query.model
+    pk = model._meta.pk_attr
+    ids = query._clone()
+    ids._limit = None
+    ids._offset = None
+    ids._orderings = []
+    # Con filtros sobre relaciones Tortoise agrupa por la clave primaria al
+    # agregar: se agrega sobre la tabla base filtrando por `pk IN (subconsulta)`
+    rows = await (
+        model.filter(**{f"{pk}__in": Subquery(ids.values(pk))})
+        .annotate(_marker_count=Count(pk), _marker_last=Max(field))
+        .values("_marker_count", "_marker_last")
+    )
+    if not rows:
+        return (0, None)
+    last = rows[0]["_marker_last"]
+    return (
+        rows[0]["_marker_count"],
+        last.isoformat() if isinstance(last, datetime) else last,
+    )
+
+
+async def table_marker(model: Type[Model]) -> Marker:
+    """
+    Marcador de una tabla de catálogo sin `updated_at`.
+
+    Suma de `hashtext` de cada fila completa: cambia con cualquier alta, baja
+    o modificación y es barato para tablas pequeñas (países, roles...).
+    """
+    meta = model._meta
+    connection = connections.get(meta.default_connection)
+    rows = await connection.execute_query_dict(
+        f'SELECT count(*) AS n, sum(hashtext(t::text)::bigint) AS h FROM "{meta.db_table}" t'
+    )
+    return (rows[0]["n"], rows[0]["h"])
+
+
+def make_etag(request: Request, *markers: Marker) -> str:
+    digest = blake2b(digest_size=16)
+    digest.update(request.url.path.encode())
+    digest.update(b"?")
+    digest.update(str(sorted(request.query_params.multi_items())).encode())
+    for marker in markers:
+        digest.update(repr(marker).encode())
+    return f'W/"{digest.hexdigest()}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def not_modified(request: Request, etag: str) -> bool:
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # Comparación débil: se ignora el prefijo W/
+    return any(_opaque(tag) == _opaque(etag) for tag in header.split(","))
+
+
+def not_modified_response(etag: str) -> Response:
+    return Response(
+        status_code=304, headers={"ETag": etag, "Cache-Control": CACHE_CONTROL}
+    )
+
+
+def with_etag(response: Response, etag: str) -> Response:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = CACHE_CONTROL
+    return response
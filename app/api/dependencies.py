@@ -1,6 +1,9 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+from fastapi import Depends, HTTPException, Query, status
 from fastapi.security import OAuth2PasswordBearer
 from app.infra.postgres.models import User
+from app.infra.postgres.projection import Projection, ProjectionError, ResponseShape
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
@@ -15,3 +18,29 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
             headers={"WWW-Authenticate": "Bearer"},
         )
     return user
+
+
+def projection(shape: ResponseShape):
+    """
+    Dependencia para `?fields=` y `?expand=`.
+
+    Devuelve None cuando no se pide ninguna proyección, para que el endpoint
+    siga usando su respuesta completa.
+    """
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None, description="Campos a devolver separados por coma (p. ej. payment_id,value,plan.value)"
+        ),
+        expand: Optional[str] = Query(
+            None, description="Relaciones a incluir separadas por coma (p. ej. plan.user)"
+        ),
+    ) -> Optional[Projection]:
+        if not fields and not expand:
+            return None
+        try:
+            return shape.project(fields, expand)
+        except ProjectionError as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return dependency
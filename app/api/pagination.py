@@ -0,0 +1,61 @@
+"""
+Paginación por cursor en los endpoints (ver `app.infra.postgres.pagination`).
+
+El cursor de la página siguiente viaja en la cabecera `X-Next-Cursor`
+(ausente en la última página) y el cliente lo devuelve en `?cursor=`.
+
+    async def list_items(response: Response, page: CursorPage = Depends(cursor_page)):
+        rows = await paginate(query, "item_id", after=page.after, limit=page.limit)
+        return with_next_cursor(response, rows, "item_id", limit=page.limit)
+"""
+
+from typing import Any, List, NamedTuple, Optional
+
+from fastapi import HTTPException, Query, Response, status
+
+from app.infra.postgres.pagination import (
+    Cursor,
+    CursorError,
+    decode_cursor,
+    encode_cursor,
+)
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class CursorPage(NamedTuple):
+    after: Optional[Cursor]
+    limit: int
+
+
+def cursor_page(
+    cursor: Optional[str] = Query(
+        None,
+        description=f"Valor de la cabecera {NEXT_CURSOR_HEADER} de la página anterior",
+    ),
+    limit: int = Query(
+        100, ge=1, le=1000, description="Número de registros a devolver"
+    ),
+) -> CursorPage:
+    try:
+        return CursorPage(decode_cursor(cursor) if cursor else None, limit)
+    except CursorError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+def with_next_cursor(
+    response: Response,
+    rows: List[Any],
+    pk: str,
+    *,
+    limit: int,
+    field: str = "created_at",
+) -> List[Any]:
+    """Recorta la fila de más de `paginate` y pone la cabecera del cursor siguiente."""
+    if len(rows) <= limit:
+        return rows
+    rows = rows[:limit]
+    last = rows[-1]
+    get = last.get if isinstance(last, dict) else lambda name: getattr(last, name)
+    response.headers[NEXT_CURSOR_HEADER] = encode_cursor(get(field), get(pk))
+    return rows
@@ -1,15 +1,18 @@
 from .account_type import router as account_type_router
 from .action import router as action_router
 from .analytics import router as analytics_router
+from .asset import router as asset_router
 from .authentication import router as auth_router
 from .city import router as city_router
 from .configuration import router as configuration_router
 from .country import router as country_router
+from .deletion_job import router as deletion_job_router
 from .device import router as device_router
 from .enrolment import router as enrolment_router
 from .factory_reset_protection import router as factory_reset_protection_router
 from .internal_auth import router as internal_auth_router
 from .location import router as location_router
+from .metrics import router as metrics_router
 from .payment import router as payment_router
 from .plan import router as plan_router
 from .region import router as region_router
@@ -24,14 +27,17 @@ from .user import router as user_router
 __all__ = [
     "action_router",
     "analytics_router",
+    "asset_router",
     "auth_router",
     "city_router",
     "configuration_router",
     "country_router",
+    "deletion_job_router",
     "device_router",
     "enrolment_router",
     "internal_auth_router",
     "location_router",
+    "metrics_router",
     "payment_router",
     "plan_router",
     "region_router",
@@ -0,0 +1,47 @@
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import JSONResponse
+
+from app.api.pagination import CursorPage, cursor_page, with_next_cursor
+from app.infra.postgres.models.asset import AssetKind
+from app.infra.postgres.routing import replica_reads
+from app.schemas.asset import AssetResponse
+from app.services.asset import asset_service
+
+router = APIRouter()
+
+
+@router.get(
+    "",
+    response_class=JSONResponse,
+    response_model=List[AssetResponse],
+    status_code=200,
+)
+@replica_reads
+async def get_assets(
+    response: Response,
+    store_id: Optional[UUID] = Query(
+        None, description="Tienda del vendedor (o del cliente)"
+    ),
+    customer_id: Optional[UUID] = Query(None),
+    vendor_id: Optional[UUID] = Query(None),
+    kind: Optional[AssetKind] = Query(None, description="device o television"),
+    state: Optional[str] = Query(None),
+    page: CursorPage = Depends(cursor_page),
+):
+    """
+    Dispositivos y televisores en una sola lista, los más recientes primero.
+    La página siguiente se pide con la cabecera X-Next-Cursor.
+    """
+    assets = await asset_service.list_page(
+        store_id=store_id,
+        customer_id=customer_id,
+        vendor_id=vendor_id,
+        kind=kind,
+        state=state,
+        after=page.after,
+        limit=page.limit,
+    )
+    return with_next_cursor(response, assets, "asset_id", limit=page.limit)
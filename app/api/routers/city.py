@@ -1,9 +1,11 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Request
 from fastapi.responses import JSONResponse, Response
 
+from app.api.conditional import make_etag, not_modified, not_modified_response, table_marker, with_etag
+from app.infra.postgres.models.city import City
 from app.schemas.city import CityCreate, CityDB, CityUpdate
 from app.services.city import city_service
 
@@ -17,9 +19,16 @@ router = APIRouter()
     status_code=200,
 )
 async def get_all_cities(
+    request: Request,
+    response: Response,
     name: Optional[str] = Query(None, description="Filter cities by name (case-insensitive, partial match)"),
     region_id: Optional[UUID] = Query(None, description="Filter cities by region ID")
 ):
+    etag = make_etag(request, await table_marker(City))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    with_etag(response, etag)
+
     filters = {}
     if name:
         filters["name__icontains"] = name
@@ -1,3 +1,4 @@
+import logging
 from typing import List
 from uuid import UUID
 
@@ -11,6 +12,8 @@ from app.schemas.configuration import (
 )
 from app.services.configuration import configuration_service
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -21,18 +24,15 @@ router = APIRouter()
     status_code=200,
 )
 async def get_all_configurations(key: str = None, store_id: UUID = None):
-    import sys
-    
     filters = {}
     if key:
         filters["key"] = key
-        print(f"DEBUG: Filtrando configuraciones por key={key}", file=sys.stderr)
-    
+
     # Add store_id filter if provided
     if store_id:
         filters["store_id"] = store_id
-        print(f"DEBUG: Filtrando configuraciones por store_id={store_id}", file=sys.stderr)
-    
+    logger.debug("Filtrando configuraciones por %s", sorted(filters))
+
     # Get configurations with all filters applied at database level
     configurations = await configuration_service.get_all(payload=filters) if filters else await configuration_service.get_all()
     
@@ -3,9 +3,11 @@ from uuid import UUID
 import json
 import os
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Request
 from fastapi.responses import JSONResponse, Response
 
+from app.api.conditional import make_etag, not_modified, not_modified_response, table_marker, with_etag
+from app.infra.postgres.models.country import Country
 from app.schemas.country import CountryCreate, CountryDB, CountryUpdate
 from app.schemas.account_type import AccountTypeInDB
 from app.services.country import country_service
@@ -19,10 +21,13 @@ router = APIRouter()
     response_model=List[CountryDB],
     status_code=200,
 )
-async def get_all_countries_direct():
+async def get_all_countries_direct(request: Request, response: Response):
     """Get all countries directly from the database without any filtering or pagination"""
-    from app.infra.postgres.models.country import Country
-    
+    etag = make_etag(request, await table_marker(Country))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    with_etag(response, etag)
+
     # Query all countries directly from the model
     countries = await Country.all()
     
@@ -46,10 +51,19 @@ async def get_all_countries_direct():
     response_model=List[CountryDB],
     status_code=200,
 )
-async def get_all_countries(name: Optional[str] = Query(None, description="Filter countries by name (case-insensitive, partial match)")):
+async def get_all_countries(
+    request: Request,
+    response: Response,
+    name: Optional[str] = Query(None, description="Filter countries by name (case-insensitive, partial match)"),
+):
     import logging
     logger = logging.getLogger(__name__)
-    
+
+    etag = make_etag(request, await table_marker(Country))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    with_etag(response, etag)
+
     filters = {}
     if name:
         filters["name__icontains"] = name
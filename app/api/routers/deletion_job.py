@@ -0,0 +1,83 @@
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.infra.postgres.models.deletion_job import DeletionEntity, DeletionJobState
+from app.schemas.deletion_job import DeletionJobCreate, DeletionJobOut
+from app.services.deletion_job import deletion_job_service
+
+router = APIRouter()
+
+
+@router.post(
+    "",
+    response_class=JSONResponse,
+    response_model=DeletionJobOut,
+    status_code=202,
+)
+async def create_deletion_job(
+    job_in: DeletionJobCreate, request: Request, response: Response
+):
+    """
+    Programa el borrado por lotes de una tienda o un usuario y sus dependientes.
+
+    Responde 202 con el trabajo; su estado y progreso se consultan en
+    `Location`. Repetir la petición devuelve el mismo trabajo (y reanuda uno
+    fallido); si el registro ya se borró, 200 con el trabajo completado.
+    """
+    result = await deletion_job_service.enqueue(
+        entity=job_in.entity, entity_id=job_in.entity_id
+    )
+    if result is None:
+        raise HTTPException(
+            status_code=404, detail=f"{job_in.entity.value.capitalize()} not found"
+        )
+    job, open_ = result
+    if not open_:
+        response.status_code = 200
+    response.headers["Location"] = request.url_for(
+        "get_deletion_job", job_id=str(job.job_id)
+    )
+    return job
+
+
+@router.get(
+    "",
+    response_class=JSONResponse,
+    response_model=List[DeletionJobOut],
+    status_code=200,
+)
+async def get_deletion_jobs(
+    entity: Optional[DeletionEntity] = Query(None),
+    entity_id: Optional[UUID] = Query(None),
+    state: Optional[DeletionJobState] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    payload = {
+        key: value
+        for key, value in {
+            "entity": entity,
+            "entity_id": entity_id,
+            "state": state,
+        }.items()
+        if value is not None
+    }
+    return await deletion_job_service.crud.get_all(
+        skip=skip, limit=limit, payload=payload
+    )
+
+
+@router.get(
+    "/{job_id}",
+    response_class=JSONResponse,
+    response_model=DeletionJobOut,
+    status_code=200,
+)
+async def get_deletion_job(job_id: UUID = Path(...)):
+    job = await deletion_job_service.get(id=job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Deletion job not found")
+    return job
@@ -1,13 +1,19 @@
+import logging
 from typing import Dict, List, Optional
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, Path, Query, status
 from fastapi.responses import JSONResponse, Response
 
+from app.infra.postgres.models.asset import AssetKind
+from app.infra.postgres.routing import replica_reads
 from app.schemas.device import DeviceCreate, DeviceDB, DeviceUpdate
 from app.schemas.general import CountResponse
+from app.services.asset import asset_service
 from app.services.device import device_service
 
+logger = logging.getLogger(__name__)
+
 # Device Router
 router = APIRouter()
 
@@ -18,21 +24,14 @@ router = APIRouter()
     response_model=List[DeviceDB],
     status_code=200,
 )
+@replica_reads
 async def get_all_devices(
     enrolment_id: Optional[str] = Query(None),
     user_id: Optional[str] = Query(None),
     store_id: Optional[UUID] = Query(
-        None, description="Filter devices by store_id of the user"
+        None, description="Filter devices by the vendor's store (or the customer's)"
     ),
 ):
-    import sys
-
-    # Debug log for parameters
-    if store_id:
-        print(
-            f"DEBUG: get_all_devices called with store_id={store_id}", file=sys.stderr
-        )
-
     try:
         # Construir payload para el servicio
         payload = {}
@@ -40,38 +39,16 @@ async def get_all_devices(
             payload["enrolment_id"] = enrolment_id
         if user_id:
             payload["user_id"] = user_id
-
-        # Obtener dispositivos a través del servicio
-        devices = await device_service.get_all(payload=payload)
-
-        # Si se proporciona store_id, filtrar los dispositivos donde el usuario en el enrollment pertenece a la tienda especificada
+        # Misma regla de tienda que /devices/count (tabla asset)
         if store_id:
-            print(f"DEBUG: Filtering devices for store_id={store_id}", file=sys.stderr)
-            filtered_devices = []
-            for device in devices:
-                # Verificar si el dispositivo tiene un enrollment con usuario o vendedor asociado a la tienda
-                if device.enrolment and (
-                    (
-                        device.enrolment.user
-                        and device.enrolment.user.store_id == store_id
-                    )
-                    or (
-                        device.enrolment.vendor
-                        and device.enrolment.vendor.store_id == store_id
-                    )
-                ):
-                    filtered_devices.append(device)
-
-            # Debug output
-            print(
-                f"DEBUG: Filtered - Found {len(filtered_devices)} devices for store_id={store_id}",
-                file=sys.stderr,
+            payload["device_id__in"] = asset_service.ids_in_store(
+                store_id, AssetKind.DEVICE
             )
-            return filtered_devices
 
-        return devices
+        # Obtener dispositivos a través del servicio
+        return await device_service.get_all(payload=payload)
     except Exception as e:
-        print(f"ERROR: Exception in get_all_devices: {str(e)}", file=sys.stderr)
+        logger.exception("Error retrieving devices")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving devices: {str(e)}",
@@ -95,14 +72,16 @@ async def create_device(new_device: DeviceCreate):
     response_model=CountResponse,
     status_code=200,
 )
-async def count_devices():
+async def count_devices(
+    store_id: Optional[UUID] = Query(None, description="Count only this store's devices"),
+):
     """
     Count the total number of devices in the system.
 
     Returns:
         CountResponse: Object containing the total count of devices
     """
-    count = await device_service.count()
+    count = await device_service.count(store_id=store_id)
     return {"count": count}
 
 
@@ -156,3 +135,16 @@ async def delete_device(device_id: UUID = Path(...)):
     deleted = await device_service.delete(id=device_id)
     if deleted == 0:
         raise HTTPException(status_code=404, detail="Device not found")
+
+
+@router.post(
+    "/{device_id}/restore",
+    response_class=JSONResponse,
+    response_model=DeviceDB,
+    status_code=200,
+)
+async def restore_device(device_id: UUID = Path(...)):
+    device = await device_service.restore(id=device_id)
+    if device is None:
+        raise HTTPException(status_code=404, detail="Deleted device not found")
+    return device
@@ -4,6 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, HTTPException, Path
 from fastapi.responses import JSONResponse, Response
 
+from app.schemas.device_enrolment import DeviceEnrolmentCreate, DeviceEnrolmentResponse
 from app.schemas.enrolment import EnrolmentCreate, EnrolmentDB, EnrolmentUpdate
 from app.services.enrolment import enrolment_service
 
@@ -34,6 +35,25 @@ async def create_enrolment(new_enrolment: EnrolmentCreate):
     return enrolment
 
 
+@router.post(
+    "/device",
+    response_class=JSONResponse,
+    response_model=DeviceEnrolmentResponse,
+    status_code=201,
+)
+async def enrol_device(new_enrolment: DeviceEnrolmentCreate):
+    """
+    Enrola un dispositivo en una sola llamada y una sola transacción:
+    enrolment, dispositivo, SIMs, plan opcional y consumo de tokens de la
+    tienda (por defecto la del vendedor). Devuelve todo lo creado junto con
+    la configuración de la tienda.
+
+    409 si el IMEI o un ICC ID ya existen o si la tienda no tiene tokens; en
+    ese caso no se crea nada.
+    """
+    return await enrolment_service.enrol_device(obj_in=new_enrolment)
+
+
 @router.get(
     "/{enrolment_id}",
     response_class=JSONResponse,
@@ -1,15 +1,19 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path
+from fastapi import APIRouter, HTTPException, Path, Query, Request, Response
 from fastapi.responses import JSONResponse
 
+from app.api.conditional import make_etag, not_modified, not_modified_response, with_etag
+
 from app.infra.postgres.models.factory_reset_protection import (
     FactoryResetProtectionState,
 )
 from app.schemas.factory_reset_protection import (
     FactoryResetProtectionCreate,
+    FactoryResetProtectionMembership,
     FactoryResetProtectionResponse,
+    FactoryResetProtectionSnapshot,
     FactoryResetProtectionUpdate,
 )
 from app.services.factory_reset_protection import factory_reset_protection_service
@@ -24,13 +28,7 @@ async def get_all_factory_protections(
     state: Optional[FactoryResetProtectionState] = None,
     store_id: Optional[UUID] = None,
 ):
-    payload = {}
-    if state:
-        payload["state"] = state
-    if store_id:
-        payload["store_id"] = store_id
-
-    return await factory_reset_protection_service.get_all(payload=payload)
+    return await factory_reset_protection_service.list_accounts(state=state, store_id=store_id)
 
 
 @router.post(
@@ -44,6 +42,42 @@ async def create_factory_protection(new_factory_reset: FactoryResetProtectionCre
     return await factory_reset_protection_service.create(obj_in=new_factory_reset)
 
 
+@router.get(
+    "/store/{store_id}/snapshot",
+    response_model=FactoryResetProtectionSnapshot,
+    response_class=JSONResponse,
+)
+async def get_store_snapshot(request: Request, response: Response, store_id: UUID = Path(...)):
+    """
+    Cuentas FRP de la tienda en formato compacto. El dispositivo guarda la
+    lista y revalida con If-None-Match: si no cambió recibe un 304 vacío.
+    """
+    accounts = await factory_reset_protection_service.store_accounts(store_id)
+    etag = make_etag(request, (accounts.version,))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    with_etag(response, etag)
+    return {"store_id": store_id, "version": accounts.version, "accounts": accounts.rows}
+
+
+@router.get(
+    "/store/{store_id}/check",
+    response_model=FactoryResetProtectionMembership,
+    response_class=JSONResponse,
+)
+async def check_store_account(
+    store_id: UUID = Path(...),
+    account_id: Optional[str] = Query(None),
+    email: Optional[str] = Query(None),
+):
+    """Indica si la tienda tiene una cuenta FRP activa con ese account_id y/o email."""
+    if account_id is None and email is None:
+        raise HTTPException(status_code=400, detail="Indique account_id o email")
+    return await factory_reset_protection_service.membership(
+        store_id, account_id=account_id, email=email
+    )
+
+
 @router.get(
     "/{factory_reset_protection_id}",
     response_model=FactoryResetProtectionResponse,
@@ -1,9 +1,9 @@
 from typing import Optional
 
 from fastapi import APIRouter, Header, HTTPException, status
-from passlib.context import CryptContext
 from pydantic import BaseModel
 
+from app.core.security import hash_password_async, verify_password_async
 from app.infra.postgres.models.user import User, UserState
 from app.schemas.user import UserCreate
 
@@ -24,8 +24,6 @@ router = APIRouter(
     include_in_schema=False,  # ocultar en /docs públicas
 )
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
 
 # -------------------- helpers actualizados -----------------------
 
@@ -67,7 +65,7 @@ async def verify_credentials(body: VerifyBody):
     """Verify username & password. Returns {valid: bool, user: ...}."""
     user = await User.filter(username=body.username).prefetch_related("role").first()
 
-    if not user or not pwd_context.verify(body.password, user.password):
+    if not user or not await verify_password_async(body.password, user.password):
         return {"valid": False, "user": None}
 
     return {"valid": True, "user": _user_to_response(user)}
@@ -88,7 +86,7 @@ async def create_internal_user(new_user: UserCreate):
         raise HTTPException(status_code=400, detail="Email already exists")
 
     # Hash password & save
-    hashed_pw = pwd_context.hash(new_user.password)
+    hashed_pw = await hash_password_async(new_user.password)
     user_obj = new_user.dict()
     user_obj["password"] = hashed_pw
 
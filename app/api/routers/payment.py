@@ -1,16 +1,43 @@
+import logging
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
+from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
 
+from app.api.conditional import (
+    change_marker,
+    make_etag,
+    not_modified,
+    not_modified_response,
+    with_etag,
+)
+from app.api.dependencies import projection
+from app.api.serialization import FastJSONResponse
+from app.core.records import RecordFormatError, detect_format
 from app.infra.postgres.crud.payment import crud_payment
 from app.infra.postgres.models.payment import Payment
-from app.schemas.payment import PaymentCreate, PaymentResponse, PaymentUpdate
+from app.infra.postgres.projection import Projection, ResponseShape
+from app.infra.postgres.routing import replica_reads
+from app.schemas.payment import (
+    PaymentCreate,
+    PaymentListItem,
+    PaymentResponse,
+    PaymentUpdate,
+)
+from app.schemas.payment_import import PaymentImportReport
+from app.services.payment_import import payment_import_service
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+PAYMENT_LIST_SHAPE = ResponseShape(PaymentListItem, Payment)
+PAYMENT_SHAPE = ResponseShape(PaymentResponse, Payment)
+
 # --- Endpoints CRUD básicos para Payment ---
 
 
@@ -18,12 +45,53 @@ router = APIRouter()
     "", response_class=JSONResponse, response_model=PaymentResponse, status_code=201
 )
 async def create_payment(new_payment: PaymentCreate):
-    obj = await crud_payment.create(obj_in=new_payment)
+    try:
+        obj = await crud_payment.create(obj_in=new_payment)
+    except IntegrityError as e:
+        error_message = str(e).lower()
+        if "unique constraint" in error_message or "duplicate key" in error_message:
+            raise HTTPException(
+                status_code=409, detail="Ya existe un pago con esta referencia para el plan."
+            )
+        if "foreign key" in error_message:
+            raise HTTPException(
+                status_code=400, detail="Referencia a entidad relacionada no válida."
+            )
+        raise HTTPException(status_code=400, detail="Datos de pago no válidos.")
     return obj
 
 
+@router.post(
+    "/bulk",
+    response_class=JSONResponse,
+    response_model=PaymentImportReport,
+    status_code=200,
+)
+async def bulk_import_payments(
+    request: Request,
+    format: Optional[str] = Query(
+        None, description="csv, ndjson o json. Por defecto se deduce del Content-Type"
+    ),
+):
+    """
+    Registra pagos de forma masiva a partir de un archivo de liquidación.
+
+    Idempotente: los pagos ya registrados con el mismo `plan_id` y
+    `reference` se cuentan como duplicados y no se vuelven a insertar. Si la
+    fila no indica `device_id` ni `television_id` se toma el del plan.
+    """
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+        body = await request.body()
+        return await payment_import_service.import_payments(body, fmt=fmt)
+    except RecordFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get("", response_class=JSONResponse, status_code=200)
+@replica_reads
 async def get_all_payments(
+    request: Request,
     plan_id: Optional[UUID] = Query(None),
     device_id: Optional[UUID] = Query(None),
     television_id: Optional[UUID] = Query(None),
@@ -34,28 +102,44 @@ async def get_all_payments(
     limit: int = Query(
         100, ge=1, le=1000, description="Número de registros a devolver"
     ),
+    fields: Optional[Projection] = Depends(projection(PAYMENT_LIST_SHAPE)),
 ):
-    import sys
+    payload = {
+        key: value
+        for key, value in (
+            ("plan_id", plan_id),
+            ("device_id", device_id),
+            ("television_id", television_id),
+        )
+        if value
+    }
+    store_filter = (
+        Q(plan__user__store_id=store_id) | Q(plan__vendor__store_id=store_id)
+        if store_id
+        else None
+    )
 
-    # Debug log for parameters
-    print(f"DEBUG: get_all_payments called with store_id={store_id}", file=sys.stderr)
+    # Si nada ha cambiado desde la última consulta del cliente: 304 sin cargar filas
+    marker_query = crud_payment.model.filter(**payload)
+    if store_filter is not None:
+        marker_query = marker_query.filter(store_filter)
+    etag = make_etag(request, await change_marker(marker_query))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
 
-    try:
-        # Construir payload para el método get_all
-        payload = {}
-        if plan_id:
-            payload["plan_id"] = plan_id
-        if device_id:
-            payload["device_id"] = device_id
-        if television_id:
-            payload["television_id"] = television_id
+    if fields:
+        # Respuesta dispersa: solo las columnas y relaciones pedidas
+        rows = await crud_payment.get_all_projected(
+            fields, skip=skip, limit=limit, payload=payload, q_filter=store_filter
+        )
+        return with_etag(FastJSONResponse(rows), etag)
 
+    try:
         # Obtener todos los pagos con los filtros básicos
         payments = await crud_payment.get_all(skip=skip, limit=limit, payload=payload)
 
         # Si se proporciona store_id, filtrar pagos donde el usuario o vendedor del plan pertenece a la tienda especificada
         if store_id:
-            print(f"DEBUG: Filtering payments for store_id={store_id}", file=sys.stderr)
             filtered_payments = []
             for payment in payments:
                 # Verificar si el pago tiene un plan con usuario o vendedor asociado a la tienda
@@ -67,10 +151,8 @@ async def get_all_payments(
                 ):
                     filtered_payments.append(payment)
 
-            # Debug output
-            print(
-                f"DEBUG: Filtered - Found {len(filtered_payments)} payments for store_id={store_id}",
-                file=sys.stderr,
+            logger.debug(
+                "Found %d payments for store_id=%s", len(filtered_payments), store_id
             )
             payments = filtered_payments
 
@@ -161,9 +243,9 @@ async def get_all_payments(
             }
             payment_list.append(payment_dict)
 
-        return payment_list
+        return with_etag(FastJSONResponse(payment_list), etag)
     except Exception as e:
-        print(f"ERROR: Exception in get_all_payments: {str(e)}", file=sys.stderr)
+        logger.exception("Error retrieving payments")
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error retrieving payments: {str(e)}",
@@ -176,7 +258,16 @@ async def get_all_payments(
     response_model=PaymentResponse,
     status_code=200,
 )
-async def get_payment_by_id(payment_id: UUID = Path(...)):
+async def get_payment_by_id(
+    payment_id: UUID = Path(...),
+    fields: Optional[Projection] = Depends(projection(PAYMENT_SHAPE)),
+):
+    if fields:
+        payment = await crud_payment.get_projected(fields, id=payment_id)
+        if not payment:
+            raise HTTPException(status_code=404, detail="Payment not found")
+        return FastJSONResponse(payment)
+
     payment = await crud_payment.get_by_id(_id=payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
@@ -1,21 +1,34 @@
+import asyncio
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
 from fastapi.responses import JSONResponse
-from tortoise.expressions import Q
-
+from tortoise.expressions import Q, Subquery
+
+from app.api.conditional import (
+    change_marker,
+    make_etag,
+    not_modified,
+    not_modified_response,
+    with_etag,
+)
+from app.api.dependencies import projection
+from app.api.serialization import FastJSONResponse, serializer_for
 from app.infra.postgres.crud.plan import crud_plan
+from app.infra.postgres.models.payment import Payment, Plan
+from app.infra.postgres.projection import Projection, ResponseShape
 from app.schemas.payment import (
     PlanCreate,
     PlanDB,
     PlanResponse,
     PlanUpdate,
-    PaymentInPlanResponse,
 )
 
 router = APIRouter()
 
+PLAN_SHAPE = ResponseShape(PlanResponse, Plan)
+
 
 @router.post("", response_class=JSONResponse, response_model=PlanDB, status_code=201)
 async def create_plan(new_plan: PlanCreate):
@@ -27,85 +40,61 @@ async def create_plan(new_plan: PlanCreate):
     "", response_class=JSONResponse, response_model=List[PlanResponse], status_code=200
 )
 async def get_all_plans(
+    request: Request,
     device_id: Optional[UUID] = Query(None, description="Filter plans by device_id"),
     television_id: Optional[UUID] = Query(
         None, description="Filter plans by television_id"
     ),
     user_id: Optional[UUID] = Query(None, description="Filter plans by user_id"),
     store_id: Optional[UUID] = Query(None, description="Filter plans by store_id"),
+    fields: Optional[Projection] = Depends(projection(PLAN_SHAPE)),
 ) -> List[PlanResponse]:
-    try:
-        query = crud_plan.model.all()
-
-        if device_id:
-            query = query.filter(device_id=device_id)
-        if television_id:
-            query = query.filter(television_id=television_id)
-        if user_id:
-            query = query.filter(user_id=user_id)
-        if store_id:
-            query = query.filter(
-                Q(user__store_id=store_id) | Q(vendor__store_id=store_id)
-            )
+    payload = {
+        key: value
+        for key, value in (
+            ("device_id", device_id),
+            ("television_id", television_id),
+            ("user_id", user_id),
+        )
+        if value
+    }
+    store_filter = (
+        Q(user__store_id=store_id) | Q(vendor__store_id=store_id) if store_id else None
+    )
+    query = crud_plan.model.filter(**payload)
+    if store_filter is not None:
+        query = query.filter(store_filter)
+
+    # Los pagos van anidados en cada plan: también cuentan como cambio
+    markers = await asyncio.gather(
+        change_marker(query),
+        change_marker(Payment.filter(plan_id__in=Subquery(query.values("plan_id")))),
+    )
+    etag = make_etag(request, *markers)
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+
+    if fields:
+        # Respuesta dispersa: solo las columnas y relaciones pedidas
+        rows = await crud_plan.get_all_projected(
+            fields,
+            limit=None,
+            payload=payload,
+            q_filter=store_filter,
+            order_by=["-initial_date"],
+        )
+        return with_etag(FastJSONResponse(rows), etag)
 
+    try:
         plans = (
             await query.order_by("-initial_date")
-            .prefetch_related(
-                "payments",
-                "user",
-                "user__role",
-                "user__store",
-                "vendor",
-                "vendor__role",
-                "vendor__store",
-                "device",
-                "device__enrolment",
-                "device__enrolment__user",
-                "device__enrolment__user__role",
-                "device__enrolment__vendor",
-                "device__enrolment__vendor__role",
-                "television",
-                "television__enrolment",
-                "television__enrolment__user",
-                "television__enrolment__user__role",
-                "television__enrolment__vendor",
-                "television__enrolment__vendor__role",
-            )
+            # Solo lo que expone PlanResponse
+            .prefetch_related("payments", "user", "vendor", "device", "television")
             .distinct()
         )
 
-        # Convertimos cada plan a PlanResponse
-        result = []
-        for plan in plans:
-            plan_response = PlanResponse(
-                plan_id=plan.plan_id,
-                user=plan.user,
-                user_id=plan.user_id,
-                device_id=plan.device_id,
-                vendor_id=plan.vendor_id,
-                vendor=plan.vendor,
-                device=plan.device,
-                television=plan.television,
-                initial_date=plan.initial_date,
-                value=plan.value,
-                quotas=plan.quotas,
-                period=plan.period,
-                contract=plan.contract,
-                payments=[
-                    PaymentInPlanResponse(
-                        payment_id=p.payment_id,
-                        value=p.value,
-                        method=p.method,
-                        state=p.state,
-                        date=p.date,
-                        reference=p.reference,
-                    )
-                    for p in plan.payments
-                ],
-            )
-            result.append(plan_response)
-
-        return result
+        # Las filas vienen de la base de datos: se serializan sin validar con Pydantic
+        return with_etag(serializer_for(PlanResponse).response(plans), etag)
 
     except Exception as e:
         raise HTTPException(
@@ -120,7 +109,16 @@ async def get_all_plans(
     response_model=PlanResponse,
     status_code=200,
 )
-async def get_plan_by_id(plan_id: UUID = Path(...)):
+async def get_plan_by_id(
+    plan_id: UUID = Path(...),
+    fields: Optional[Projection] = Depends(projection(PLAN_SHAPE)),
+):
+    if fields:
+        plan = await crud_plan.get_projected(fields, id=plan_id)
+        if not plan:
+            raise HTTPException(status_code=404, detail="Plan not found")
+        return FastJSONResponse(plan)
+
     # Create a custom method in the CRUD class to get a plan with all related data
     plan = (
         await crud_plan.model.filter(plan_id=plan_id)
@@ -214,3 +212,11 @@ async def delete_plan(plan_id: UUID = Path(...)):
     if not deleted:
         raise HTTPException(status_code=404, detail="Plan not found")
     return None
+
+
+@router.post("/{plan_id}/restore", response_class=JSONResponse, response_model=PlanDB, status_code=200)
+async def restore_plan(plan_id: UUID = Path(...)):
+    plan = await crud_plan.restore(id=plan_id)
+    if plan is None:
+        raise HTTPException(status_code=404, detail="Deleted plan not found")
+    return plan
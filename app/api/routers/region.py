@@ -1,9 +1,11 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Request
 from fastapi.responses import JSONResponse, Response
 
+from app.api.conditional import make_etag, not_modified, not_modified_response, table_marker, with_etag
+from app.infra.postgres.models.region import Region
 from app.schemas.region import RegionCreate, RegionDB, RegionUpdate
 from app.services.region import region_service
 
@@ -17,9 +19,16 @@ router = APIRouter()
     status_code=200,
 )
 async def get_all_regions(
+    request: Request,
+    response: Response,
     country_id: Optional[UUID] = Query(None, description="Filter regions by country ID"),
     name: Optional[str] = Query(None, description="Filter regions by name")
 ):
+    etag = make_etag(request, await table_marker(Region))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    with_etag(response, etag)
+
     filters = {}
     if country_id:
         filters["country_id"] = country_id
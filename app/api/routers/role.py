@@ -1,9 +1,11 @@
 from typing import List
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, HTTPException, Path, Query, Request
 from fastapi.responses import JSONResponse, Response
 
+from app.api.conditional import make_etag, not_modified, not_modified_response, table_marker, with_etag
+from app.infra.postgres.models.role import Role
 from app.schemas.role import RoleCreate, RoleDB, RoleUpdate
 from app.services.role import role_service
 
@@ -17,8 +19,15 @@ router = APIRouter()
     status_code=200,
 )
 async def get_all_roles(
+    request: Request,
+    response: Response,
     name: str = Query(None, description="Filtrar por nombre de rol")
 ):
+    etag = make_etag(request, await table_marker(Role))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+    with_etag(response, etag)
+
     payload = {}
     if name:
         payload["name__icontains"] = name
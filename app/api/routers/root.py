@@ -2,6 +2,8 @@ from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 
 from app.config import settings
+from app.core.lifecycle import is_ready
+from app.infra.postgres.client import pool_stats
 from app.schemas.root import HealtCheck
 
 router = APIRouter()
@@ -23,3 +25,28 @@ async def healt_check():
         "description": settings.DESCRIPTION,
         "environment": settings.ENVIRONMENT,
     }
+
+
+@router.get("/pool-stats", response_class=JSONResponse, status_code=200)
+async def get_pool_stats():
+    """Saturación de los pools de conexiones (tamaño, en uso, esperas, timeouts)."""
+    return pool_stats()
+
+
+@router.get("/health-check", response_class=JSONResponse, status_code=200)
+async def liveness():
+    """Liveness: el proceso responde (no consulta la base de datos)."""
+    return {"status": "ok"}
+
+
+@router.get(
+    "/ready",
+    response_class=JSONResponse,
+    status_code=200,
+    responses={503: {"description": "Calentamiento en curso o servicio deteniéndose"}},
+)
+async def readiness():
+    """Readiness: pools abiertos y cachés calientes."""
+    if not is_ready():
+        return JSONResponse(status_code=503, content={"status": "starting"})
+    return {"status": "ready"}
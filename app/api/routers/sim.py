@@ -4,7 +4,7 @@ from uuid import UUID
 from fastapi import APIRouter, Body, HTTPException, Path, Query, Response, status
 from fastapi.responses import JSONResponse
 
-from app.schemas.sim import Sim, SimCreate, SimUpdate
+from app.schemas.sim import Sim, SimBulkResult, SimBulkUpsert, SimCreate, SimUpdate
 from app.services import sim_service
 
 router = APIRouter()
@@ -25,6 +25,25 @@ async def get_all_sims(
     return await sim_service.get_all(skip=skip, limit=limit)
 
 
+@router.get(
+    "/by-device",
+    response_class=JSONResponse,
+    response_model=List[Sim],
+    status_code=status.HTTP_200_OK,
+    summary="Get SIM cards of several devices",
+    description="Retrieve the SIM cards of all the given devices in a single query.",
+)
+async def get_sims_by_devices(
+    device_ids: List[UUID] = Query(..., description="Device IDs (repeat the parameter)"),
+):
+    if len(device_ids) > 500:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="At most 500 device IDs per request",
+        )
+    return await sim_service.get_by_device_ids(device_ids=device_ids)
+
+
 @router.get(
     "/by-device/{device_id}",
     response_class=JSONResponse,
@@ -63,6 +82,26 @@ async def get_sim_by_number(
     return sim_card
 
 
+@router.get(
+    "/icc/{icc_id}",
+    response_class=JSONResponse,
+    response_model=Sim,
+    status_code=status.HTTP_200_OK,
+    summary="Get SIM card by ICC ID",
+    description="Retrieve a specific SIM card by its ICC ID.",
+)
+async def get_sim_by_icc_id(
+    icc_id: str = Path(..., description="The ICC ID of the SIM card")
+):
+    sim_card = await sim_service.get_by_icc_id(icc_id=icc_id)
+    if not sim_card:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"SIM card with ICC ID {icc_id} not found",
+        )
+    return sim_card
+
+
 @router.get(
     "/{sim_id}",
     response_class=JSONResponse,
@@ -93,6 +132,18 @@ async def create_sim(sim_card: SimCreate):
     return await sim_service.create(obj_in=sim_card)
 
 
+@router.post(
+    "/bulk",
+    response_class=JSONResponse,
+    response_model=SimBulkResult,
+    status_code=status.HTTP_200_OK,
+    summary="Create or update SIM cards in bulk",
+    description="Upsert up to 500 SIM cards keyed on ICC ID in a single statement.",
+)
+async def upsert_sims(payload: SimBulkUpsert):
+    return await sim_service.upsert_many(sims=payload.sims)
+
+
 @router.patch(
     "/{sim_id}",
     response_class=JSONResponse,
@@ -1,17 +1,32 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, Query
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from fastapi.responses import JSONResponse, Response
 
+from app.api.dependencies import projection
+from app.api.serialization import FastJSONResponse, serializer_for
+from app.infra.postgres.models.store import Store
+from app.infra.postgres.projection import Projection, ResponseShape
 from app.schemas.store import StoreCreate, StoreDB, StoreUpdate, StoreWithCountry
+from app.schemas.store_summary import StoreSummary
+from app.schemas.store_token import (
+    TokenAmount,
+    TokenBalance,
+    TokenLedgerEntry,
+    TokenShardConfig,
+)
 from app.schemas.user import UserUpdate
 from app.schemas.user_out import UserOut
 from app.services.store import store_service
+from app.services.store_summary import store_summary_service
+from app.services.store_token import store_token_service
 from app.services.user import user_service
 
 router = APIRouter()
 
+STORE_SHAPE = ResponseShape(StoreWithCountry, Store)
+
 
 @router.get(
     "/",
@@ -23,10 +38,14 @@ async def get_all_stores(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     admin_id: Optional[UUID] = None,
+    fields: Optional[Projection] = Depends(projection(STORE_SHAPE)),
 ):
     """Obtener todas las tiendas con información del país incluida"""
+    if fields:
+        rows = await store_service.get_all_projected(fields, skip=skip, limit=limit)
+        return FastJSONResponse(rows)
     stores = await store_service.get_all_with_country(skip=skip, limit=limit)
-    return stores
+    return serializer_for(StoreWithCountry).response(stores)
 
 
 @router.post(
@@ -52,8 +71,14 @@ async def create_store(
 async def get_store_by_id(
     store_id: UUID = Path(...),
     admin_id: Optional[UUID] = None,
+    fields: Optional[Projection] = Depends(projection(STORE_SHAPE)),
 ):
     """Obtener una tienda específica con información del país incluida"""
+    if fields:
+        store = await store_service.get_projected(fields, id=store_id)
+        if store is None:
+            raise HTTPException(status_code=404, detail="Store not found")
+        return FastJSONResponse(store)
     store = await store_service.get_with_country(id=store_id)
     if store is None:
         raise HTTPException(status_code=404, detail="Store not found")
@@ -161,3 +186,104 @@ async def remove_user_from_store(
     # Actualizar el usuario quitando el store_id
     user_update = UserUpdate(store_id=None)
     await user_service.update(id=user_id, obj_in=user_update)
+
+
+@router.get(
+    "/{store_id}/summary",
+    response_class=JSONResponse,
+    response_model=StoreSummary,
+    status_code=200,
+)
+async def get_store_summary(store_id: UUID = Path(...)):
+    """
+    Cifras del panel de la tienda en una petición: dispositivos y televisores
+    por estado, clientes, vendedores, planes activos y vencidos, pagos de hoy
+    y del mes y tokens. Se cachea unos segundos (STORE_SUMMARY_CACHE_TTL).
+    """
+    summary = await store_summary_service.summary(store_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+    return summary
+
+
+@router.get(
+    "/{store_id}/tokens",
+    response_class=JSONResponse,
+    response_model=TokenBalance,
+    status_code=200,
+)
+async def get_store_tokens(store_id: UUID = Path(...)):
+    """Saldo de tokens de la tienda (incluidos los contadores repartidos)"""
+    balance = await store_token_service.balance(store_id)
+    if balance is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+    return balance
+
+
+@router.post(
+    "/{store_id}/tokens/consume",
+    response_class=JSONResponse,
+    response_model=List[TokenLedgerEntry],
+    status_code=200,
+)
+async def consume_store_tokens(body: TokenAmount, store_id: UUID = Path(...)):
+    """
+    Consume tokens de la tienda de forma atómica.
+
+    Responde 409 si no hay saldo suficiente; en ese caso no se descuenta nada.
+    Devuelve los movimientos registrados en el libro.
+    """
+    entries = await store_token_service.consume(store_id, body.amount, reference=body.reference)
+    if entries is None:
+        if not await Store.exists(id=store_id):
+            raise HTTPException(status_code=404, detail="Store not found")
+        raise HTTPException(status_code=409, detail="Tokens insuficientes")
+    return entries
+
+
+@router.post(
+    "/{store_id}/tokens/credit",
+    response_class=JSONResponse,
+    response_model=TokenLedgerEntry,
+    status_code=201,
+)
+async def credit_store_tokens(body: TokenAmount, store_id: UUID = Path(...)):
+    """Suma tokens al saldo de la tienda"""
+    entry = await store_token_service.credit(store_id, body.amount, reference=body.reference)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+    return entry
+
+
+@router.put(
+    "/{store_id}/tokens/shards",
+    response_class=JSONResponse,
+    response_model=TokenBalance,
+    status_code=200,
+)
+async def configure_store_token_shards(body: TokenShardConfig, store_id: UUID = Path(...)):
+    """
+    Reparte el saldo entre varios contadores para tiendas con muchos
+    enrolamientos simultáneos (0 vuelve a un único contador).
+    """
+    balance = await store_token_service.configure_shards(store_id, body.shards)
+    if balance is None:
+        raise HTTPException(status_code=404, detail="Store not found")
+    return balance
+
+
+@router.get(
+    "/{store_id}/tokens/ledger",
+    response_class=JSONResponse,
+    response_model=List[TokenLedgerEntry],
+    status_code=200,
+)
+async def get_store_token_ledger(
+    store_id: UUID = Path(...),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000),
+):
+    """Movimientos de tokens de la tienda, del más reciente al más antiguo"""
+    if not await Store.exists(id=store_id):
+        raise HTTPException(status_code=404, detail="Store not found")
+    return await store_token_service.ledger(store_id, skip=skip, limit=limit)
@@ -1,13 +1,17 @@
+import logging
 from typing import Dict, List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from fastapi.responses import JSONResponse, Response
 
+from app.api.pagination import CursorPage, cursor_page, with_next_cursor
 from app.schemas.general import CountResponse
 from app.schemas.television import TelevisionCreate, TelevisionDB, TelevisionUpdate
 from app.services.television import television_service
 
+logger = logging.getLogger(__name__)
+
 # Television Router
 router = APIRouter()
 
@@ -19,66 +23,23 @@ router = APIRouter()
     status_code=200,
 )
 async def get_all_televisions(
-    enrolment_id: Optional[str] = Query(None),
-    user_id: Optional[str] = Query(None),
+    response: Response,
+    enrolment_id: Optional[UUID] = Query(None),
+    user_id: Optional[UUID] = Query(None),
     store_id: Optional[UUID] = Query(
-        None, description="Filter televisions by store_id of the user"
+        None, description="Filter televisions by the vendor's store (or the customer's)"
     ),
+    page: CursorPage = Depends(cursor_page),
 ):
-    import sys
-
-    # Debug log for parameters
-    if store_id:
-        print(
-            f"DEBUG: get_all_televisions called with store_id={store_id}",
-            file=sys.stderr,
-        )
-
-    try:
-        # Construir payload para el servicio
-        payload = {}
-        if enrolment_id:
-            payload["enrolment_id"] = enrolment_id
-        if user_id:
-            payload["user_id"] = user_id
-
-        # Obtener dispositivos a través del servicio
-        televisions = await television_service.get_all(payload=payload)
-
-        # Si se proporciona store_id, filtrar los dispositivos donde el usuario en el enrollment pertenece a la tienda especificada
-        if store_id:
-            print(
-                f"DEBUG: Filtering televisions for store_id={store_id}", file=sys.stderr
-            )
-            filtered_televisions = []
-            for television in televisions:
-                # Verificar si el dispositivo tiene un enrollment con usuario o vendedor asociado a la tienda
-                if television.enrolment and (
-                    (
-                        television.enrolment.user
-                        and television.enrolment.user.store_id == store_id
-                    )
-                    or (
-                        television.enrolment.vendor
-                        and television.enrolment.vendor.store_id == store_id
-                    )
-                ):
-                    filtered_televisions.append(television)
-
-            # Debug output
-            print(
-                f"DEBUG: Filtered - Found {len(filtered_televisions)} devices for store_id={store_id}",
-                file=sys.stderr,
-            )
-            return filtered_televisions
-
-        return televisions
-    except Exception as e:
-        print(f"ERROR: Exception in get_all_televisions: {str(e)}", file=sys.stderr)
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error retrieving televisions: {str(e)}",
-        )
+    """Televisores más recientes primero; la página siguiente se pide con X-Next-Cursor."""
+    televisions = await television_service.list_page(
+        enrolment_id=enrolment_id,
+        user_id=user_id,
+        store_id=store_id,
+        after=page.after,
+        limit=page.limit,
+    )
+    return with_next_cursor(response, televisions, "television_id", limit=page.limit)
 
 
 @router.post(
@@ -98,17 +59,47 @@ async def create_television(new_television: TelevisionCreate):
     response_model=CountResponse,
     status_code=200,
 )
-async def count_televisions():
+async def count_televisions(
+    store_id: Optional[UUID] = Query(None, description="Count only this store's televisions"),
+):
     """
     Count the total number of devices in the system.
 
     Returns:
         CountResponse: Object containing the total count of devices
     """
-    count = await television_service.count()
+    count = await television_service.count(store_id=store_id)
     return {"count": count}
 
 
+@router.get(
+    "/serials",
+    response_class=JSONResponse,
+    response_model=List[TelevisionDB],
+    status_code=200,
+)
+async def get_televisions_by_serials(
+    serial_number: List[str] = Query(..., description="Serial numbers (repeat the parameter)"),
+):
+    """Check-in por lotes: los televisores que existen, en el orden pedido."""
+    if len(serial_number) > 500:
+        raise HTTPException(status_code=400, detail="At most 500 serial numbers per request")
+    return await television_service.get_by_serials(serial_number)
+
+
+@router.get(
+    "/serial/{serial_number}",
+    response_class=JSONResponse,
+    response_model=TelevisionDB,
+    status_code=200,
+)
+async def get_television_by_serial(serial_number: str = Path(...)):
+    television = await television_service.get_by_serial(serial_number)
+    if television is None:
+        raise HTTPException(status_code=404, detail="Television not found")
+    return television
+
+
 @router.get(
     "/{television_id}",
     response_class=JSONResponse,
@@ -150,3 +141,16 @@ async def delete_television(television_id: UUID = Path(...)):
     deleted = await television_service.delete(id=television_id)
     if deleted == 0:
         raise HTTPException(status_code=404, detail="Television not found")
+
+
+@router.post(
+    "/{television_id}/restore",
+    response_class=JSONResponse,
+    response_model=TelevisionDB,
+    status_code=200,
+)
+async def restore_television(television_id: UUID = Path(...)):
+    television = await television_service.restore(id=television_id)
+    if television is None:
+        raise HTTPException(status_code=404, detail="Deleted television not found")
+    return television
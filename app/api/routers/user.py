@@ -1,18 +1,36 @@
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Path, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request
 from fastapi.responses import JSONResponse, Response
-from passlib.context import CryptContext
+from tortoise.expressions import Q
 
+from app.api.conditional import (
+    change_marker,
+    make_etag,
+    not_modified,
+    not_modified_response,
+    with_etag,
+)
+from app.api.dependencies import projection
+from app.api.serialization import FastJSONResponse, serializer_for
+
+from app.core.config import settings
+from app.core.records import RecordFormatError, detect_format
+from app.core.security import hash_password_async
+from app.infra.postgres.crud.user import USER_EXPANSIONS
+from app.infra.postgres.models import User
+from app.infra.postgres.projection import Projection, ResponseShape
+from app.infra.postgres.routing import replica_reads
 from app.schemas.user import UserCreate, UserUpdate
-from app.schemas.user_out import UserOut
+from app.schemas.user_import import UserImportReport
+from app.schemas.user_out import UserOut, UserUpdateOut
 from app.services.user import user_service
+from app.services.user_import import user_import_service
 
 router = APIRouter()
 
-# bcrypt context
-pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+USER_SHAPE = ResponseShape(UserOut, User)
 
 
 @router.get(
@@ -21,6 +39,7 @@ pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
     response_model=List[UserOut],
     status_code=200,
 )
+@replica_reads
 async def get_all_users(
     request: Request,
     role_name: Optional[str] = Query(None, description="Filtrar por nombre de rol"),
@@ -29,6 +48,7 @@ async def get_all_users(
     store_id: Optional[UUID] = Query(None, description="Filtrar por ID de tienda"),
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[Projection] = Depends(projection(USER_SHAPE)),
 ):
     """Obtiene todos los usuarios con sus roles resueltos. Permite filtrar y paginar."""
     payload = {}
@@ -36,19 +56,40 @@ async def get_all_users(
         payload["role__name__iexact"] = role_name
     if state:
         payload["state__iexact"] = state
+    if store_id:
+        payload["store_id"] = store_id
+    name_filter = Q(first_name__icontains=name) | Q(last_name__icontains=name) if name else None
+
+    # Si nada ha cambiado desde la última consulta del cliente: 304 sin cargar filas
+    marker_query = User.filter(**payload)
+    if name_filter is not None:
+        marker_query = marker_query.filter(name_filter)
+    etag = make_etag(request, await change_marker(marker_query))
+    if not_modified(request, etag):
+        return not_modified_response(etag)
+
+    if fields:
+        # Respuesta dispersa: solo las columnas y relaciones pedidas
+        rows = await user_service.get_all_projected(
+            fields,
+            skip=skip,
+            limit=limit,
+            payload=payload,
+            q_filter=name_filter,
+            order_by=["-created_at"],
+        )
+        return with_etag(FastJSONResponse(rows), etag)
     if name:
         # Implementamos una búsqueda que incluya tanto nombre como apellido
-        from tortoise.expressions import Q
-        return await user_service.get_all_with_filter(
-            Q(first_name__icontains=name) | Q(last_name__icontains=name),
+        users = await user_service.get_all_with_filter(
+            name_filter,
             payload=payload,
             skip=skip,
             limit=limit
         )
-    if store_id:
-        payload["store_id"] = store_id
+        return with_etag(serializer_for(UserOut).response(users), etag)
     users = await user_service.get_all(payload=payload, skip=skip, limit=limit, order_by=["-created_at"])
-    return users
+    return with_etag(serializer_for(UserOut).response(users), etag)
 
 
 @router.post(
@@ -59,21 +100,68 @@ async def get_all_users(
 )
 async def create_user(new_user: UserCreate):
     """Crea un nuevo usuario (hashea la contraseña antes de guardarla)."""
-    hashed_password = pwd_ctx.hash(new_user.password)
+    hashed_password = await hash_password_async(new_user.password)
     user_data_with_hashed_pass = new_user.copy(update={"password": hashed_password})
 
     user = await user_service.create(obj_in=user_data_with_hashed_pass)
     return user
 
 
+@router.post(
+    "/bulk",
+    response_class=JSONResponse,
+    response_model=UserImportReport,
+    status_code=200,
+)
+async def bulk_import_users(
+    request: Request,
+    store_id: Optional[UUID] = Query(
+        None, description="Tienda asignada a las filas que no indiquen store_id"
+    ),
+    format: Optional[str] = Query(
+        None, description="csv o ndjson. Por defecto se deduce del Content-Type"
+    ),
+):
+    """
+    Crea usuarios de forma masiva a partir de un cuerpo CSV o NDJSON.
+
+    Cada fila acepta `city`/`role` por nombre o `city_id`/`role_id`. Las filas
+    inválidas o duplicadas se reportan individualmente sin abortar la carga.
+    Las contraseñas se hashean siempre, salvo con
+    USER_IMPORT_ACCEPT_PASSWORD_HASHES, que guarda tal cual los hash bcrypt.
+    """
+    try:
+        fmt = detect_format(request.headers.get("content-type"), format)
+        if fmt == "json":
+            raise RecordFormatError("Use CSV o NDJSON para la carga de usuarios")
+        body = await request.body()
+        return await user_import_service.import_users(
+            body,
+            fmt=fmt,
+            default_store_id=store_id,
+            accept_password_hashes=settings.USER_IMPORT_ACCEPT_PASSWORD_HASHES,
+        )
+    except RecordFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
 @router.get(
     "/{user_id}",
     response_class=JSONResponse,
     response_model=UserOut,
     status_code=200,
 )
-async def get_user_by_id(user_id: UUID = Path(...)):
+async def get_user_by_id(
+    user_id: UUID = Path(...),
+    fields: Optional[Projection] = Depends(projection(USER_SHAPE)),
+):
     """Obtiene un usuario por su ID."""
+    if fields:
+        user = await user_service.get_projected(fields, id=user_id)
+        if user is None:
+            raise HTTPException(status_code=404, detail="User not found")
+        return FastJSONResponse(user)
+
     user = await user_service.get_by_id(user_id=user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
@@ -83,18 +171,43 @@ async def get_user_by_id(user_id: UUID = Path(...)):
 @router.patch(
     "/{user_id}",
     response_class=JSONResponse,
-    response_model=UserOut,
+    response_model=UserUpdateOut,
     status_code=200,
 )
-async def update_user(user_id: UUID, user_in: UserUpdate):
-    """Actualiza un usuario."""
+async def update_user(
+    user_id: UUID,
+    user_in: UserUpdate,
+    expand: Optional[str] = Query(
+        None, description="Relaciones a incluir en la respuesta: role,city,store"
+    ),
+):
+    """
+    Actualiza un usuario con un único UPDATE ... RETURNING.
+
+    Por defecto la respuesta solo trae los IDs de las relaciones; usar
+    `?expand=role,city,store` para incluirlas.
+    """
+    relations = [name.strip() for name in expand.split(",") if name.strip()] if expand else []
+    invalid = [name for name in relations if name not in USER_EXPANSIONS]
+    if invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"expand no soportado: {', '.join(invalid)}. Use: {', '.join(USER_EXPANSIONS)}",
+        )
+
     if user_in.password:
-        user_in.password = pwd_ctx.hash(user_in.password)
+        user_in.password = await hash_password_async(user_in.password)
 
-    user = await user_service.update(id=user_id, obj_in=user_in)
+    user = await user_service.update(id=user_id, obj_in=user_in, expand=relations)
     if user is None:
         raise HTTPException(status_code=404, detail="User not found")
-    return user
+    return UserUpdateOut(
+        **{
+            field: getattr(user, field)
+            for field in UserUpdateOut.__fields__
+            if field not in USER_EXPANSIONS or field in relations
+        }
+    )
 
 
 @router.delete(
@@ -109,6 +222,20 @@ async def delete_user(user_id: UUID):
     return Response(status_code=204)
 
 
+@router.post(
+    "/{user_id}/restore",
+    response_class=JSONResponse,
+    response_model=UserOut,
+    status_code=200,
+)
+async def restore_user(user_id: UUID = Path(...)):
+    """Recupera un usuario eliminado (y los planes borrados con él)."""
+    restored = await user_service.restore(id=user_id)
+    if restored is None:
+        raise HTTPException(status_code=404, detail="Deleted user not found")
+    return await user_service.get_by_id(user_id=user_id)
+
+
 @router.get(
     "/by-dni/{dni}",
     response_class=JSONResponse,
@@ -135,6 +262,7 @@ async def get_user_by_email(email: str = Path(..., description="Email del usuari
 
 
 @router.get("/by-store/{store_id}", response_model=List[UserOut])
+@replica_reads
 async def get_users_by_store(
     request: Request,
     store_id: UUID,
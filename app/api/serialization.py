@@ -0,0 +1,154 @@
+"""
+Serialización rápida para respuestas de listas.
+
+Los datos que salen de la base de datos ya son válidos, así que no hace falta
+pasarlos por la validación de Pydantic fila a fila. `RowSerializer` recorre
+una vez el esquema de respuesta, precalcula cómo convertir cada campo
+(Decimal → float, Enum → valor, esquemas anidados, listas y relaciones
+inversas de Tortoise) y después solo aplica esas funciones a cada fila.
+`FastJSONResponse` codifica el resultado con orjson, que serializa datetime,
+date y `uuid.UUID` de forma nativa. Los UUID que lee asyncpg son una subclase
+(`asyncpg.pgproto.pgproto.UUID`) que orjson no reconoce: pasan por `_default`.
+"""
+
+from decimal import Decimal
+from enum import Enum
+from functools import lru_cache
+from inspect import isawaitable
+from operator import attrgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type
+from uuid import UUID
+
+import orjson
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+from tortoise.fields.relational import ReverseRelation
+from tortoise.models import Model
+
+from app.core.metrics import register_cache
+
+Encoder = Callable[[Any], Any]
+
+
+def _default(value: Any) -> Any:
+    """Tipos que orjson no serializa de forma nativa."""
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, BaseModel):
+        return value.dict()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse codificada con orjson (Decimal se emite como número)."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _decimal(value: Any) -> Any:
+    return None if value is None else float(value)
+
+
+def _enum(value: Any) -> Any:
+    return value.value if isinstance(value, Enum) else value
+
+
+def _nested_schema(field: ModelField) -> Optional[Type[BaseModel]]:
+    for candidate in (field.type_, *(sub.type_ for sub in field.sub_fields or ())):
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+class RowSerializer:
+    """Convierte instancias ORM (o dicts) a estructuras JSON según un esquema."""
+
+    def __init__(self, schema: Type[BaseModel]) -> None:
+        self.schema = schema
+        self._fields: Optional[List[Tuple[str, Callable[[Any], Any], Encoder, Any]]] = (
+            None
+        )
+
+    @property
+    def fields(self) -> List[Tuple[str, Callable[[Any], Any], Encoder, Any]]:
+        if self._fields is None:
+            self._fields = [
+                (
+                    name,
+                    attrgetter(field.name),
+                    self._encoder_for(field),
+                    None if field.required else field.get_default(),
+                )
+                for name, field in self.schema.__fields__.items()
+            ]
+        return self._fields
+
+    @staticmethod
+    def _encoder_for(field: ModelField) -> Encoder:
+        nested = _nested_schema(field)
+        if nested is not None:
+            serializer = serializer_for(nested)
+            if field.shape == SHAPE_SINGLETON:
+                return serializer.one
+            return serializer.many
+        field_type = field.type_
+        if isinstance(field_type, type):
+            if issubclass(field_type, Decimal):
+                return _decimal
+            if issubclass(field_type, Enum):
+                return _enum
+        return _identity
+
+    def one(self, row: Any) -> Optional[Dict[str, Any]]:
+        if row is None or (isawaitable(row) and not isinstance(row, Model)):
+            # Relación no cargada: Tortoise devuelve una consulta pendiente.
+            # Las instancias de Model también son awaitables (`__await__`).
+            return None
+        if isinstance(row, dict):
+            return {
+                name: encode(row.get(name, default))
+                for name, _, encode, default in self.fields
+            }
+        result = {}
+        for name, getter, encode, default in self.fields:
+            try:
+                value = getter(row)
+            except AttributeError:
+                value = default
+            result[name] = encode(value)
+        return result
+
+    def many(self, rows: Optional[Iterable[Any]]) -> List[Dict[str, Any]]:
+        if rows is None:
+            return []
+        if isinstance(rows, ReverseRelation):
+            rows = rows.related_objects if rows._fetched else []
+        one = self.one
+        return [one(row) for row in rows]
+
+    def response(self, rows: Iterable[Any], status_code: int = 200) -> FastJSONResponse:
+        """Respuesta orjson para una lista de filas, sin validación de Pydantic."""
+        return FastJSONResponse(self.many(rows), status_code=status_code)
+
+
+@lru_cache(maxsize=None)
+def serializer_for(schema: Type[BaseModel]) -> RowSerializer:
+    """Serializador compartido por esquema (los campos se precalculan en el primer uso)."""
+    return RowSerializer(schema)
+
+
+register_cache("row_serializers", serializer_for)
@@ -0,0 +1,109 @@
+"""
+Caché en memoria con caducidad (TTL) por entrada.
+
+Es por proceso: con varios workers cada uno tiene la suya y una invalidación
+solo alcanza al worker que atendió la escritura; los demás sirven la versión
+anterior como mucho `ttl` segundos. Úsese para lecturas calientes que toleran
+ese desfase.
+
+`get_or_load` agrupa las cargas concurrentes de la misma clave (una consulta
+aunque lleguen cien peticiones a la vez) y no guarda el resultado de una carga
+que empezó antes de invalidar la clave.
+
+    snapshots = register_cache("frp_snapshots", TTLCache(ttl=60))
+    snapshot = await snapshots.get_or_load(store_id, lambda: load(store_id))
+    snapshots.invalidate(store_id)  # tras escribir
+
+Expone `hits`, `misses` y `len()` para `app.core.metrics.register_cache`.
+"""
+
+import asyncio
+from collections import OrderedDict
+from time import monotonic
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Generic,
+    Hashable,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    def __init__(self, ttl: float, maxsize: int = 1024) -> None:
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[K, Tuple[float, V]]" = OrderedDict()
+        self._loading: Dict[K, "asyncio.Future[V]"] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: K) -> Any:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return _MISSING
+        expires, value = entry
+        if expires <= monotonic():
+            del self._entries[key]
+            self.misses += 1
+            return _MISSING
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def get(self, key: K, default: Optional[V] = None) -> Optional[V]:
+        value = self._lookup(key)
+        return default if value is _MISSING else value
+
+    def set(self, key: K, value: V) -> None:
+        self._entries[key] = (monotonic() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: K) -> None:
+        self._entries.pop(key, None)
+        # La carga en curso ya no se guardará (ver get_or_load)
+        self._loading.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._loading.clear()
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        value = self._lookup(key)
+        if value is not _MISSING:
+            return value
+        pending = self._loading.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future: "asyncio.Future[V]" = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # sin esperas, evita el aviso de excepción no recogida
+            raise
+        else:
+            future.set_result(value)
+            if self._loading.get(key) is future:
+                self.set(key, value)
+            return value
+        finally:
+            if self._loading.get(key) is future:
+                del self._loading[key]
@@ -0,0 +1,117 @@
+"""
+Compresión negociada de respuestas (brotli o gzip).
+
+A diferencia de `GZipMiddleware` de Starlette, que comprime en el event loop:
+
+- Elige codificación según `Accept-Encoding`: brotli si el paquete `brotli`
+  está instalado y el cliente lo acepta, si no gzip.
+- Solo comprime cuerpos de al menos `COMPRESSION_MIN_SIZE` bytes con un tipo
+  de contenido comprimible (JSON, texto...).
+- Los cuerpos de `COMPRESSION_OFFLOAD_SIZE` bytes o más se comprimen en el
+  executor por defecto para no bloquear el loop con listados grandes.
+- Las respuestas en streaming (varios mensajes de cuerpo, p. ej. el Excel de
+  analytics) y las que ya traen `Content-Encoding` pasan sin tocar.
+"""
+
+import asyncio
+import gzip
+from typing import Callable, List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # dependencia opcional
+    brotli = None
+
+_COMPRESSIBLE = ("application/json", "text/", "application/javascript", "image/svg+xml")
+
+
+def _accepted(accept_encoding: str) -> List[str]:
+    """Codificaciones aceptadas por el cliente (sin las marcadas con q=0)."""
+    accepted = []
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        params = params.replace(" ", "")
+        if coding and params not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.append(coding.lower())
+    return accepted
+
+
+def _choose_encoding(accept_encoding: str) -> Optional[str]:
+    accepted = _accepted(accept_encoding)
+    if brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _compressor(encoding: str) -> Callable[[bytes], bytes]:
+    if encoding == "br":
+        quality = settings.COMPRESSION_BROTLI_QUALITY
+        return lambda body: brotli.compress(body, quality=quality)
+    level = settings.COMPRESSION_GZIP_LEVEL
+    return lambda body: gzip.compress(body, compresslevel=level, mtime=0)
+
+
+class CompressionMiddleware:
+    """Middleware ASGI de compresión con umbral de tamaño y descarga al executor."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.minimum_size = settings.COMPRESSION_MIN_SIZE
+        self.offload_size = settings.COMPRESSION_OFFLOAD_SIZE
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = _choose_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            compressible = (
+                not message.get("more_body", False)
+                and len(body) >= self.minimum_size
+                and "content-encoding" not in headers
+                and headers.get("content-type", "").startswith(_COMPRESSIBLE)
+            )
+            if not compressible:
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            compress = _compressor(encoding)
+            if len(body) >= self.offload_size:
+                body = await asyncio.get_running_loop().run_in_executor(
+                    None, compress, body
+                )
+            else:
+                body = compress(body)
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(body))
+            headers.add_vary_header("Accept-Encoding")
+            await send(start)
+            await send({"type": "http.response.body", "body": body})
+
+        await self.app(scope, receive, send_compressed)
@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from pydantic import BaseSettings
 
 
@@ -11,8 +13,78 @@ class Settings(BaseSettings):
 
     # Database Settings
     POSTGRES_DATABASE_URL: str
+    POSTGRES_REPLICA_URL: Optional[str] = None  # Réplica de solo lectura (opcional)
     DEFAULT_DATA: bool = False
 
+    # Connection pool (por proceso)
+    DB_POOL_MIN_SIZE: int = 2
+    DB_POOL_MAX_SIZE: int = 10
+    DB_REPLICA_POOL_MAX_SIZE: int = 10
+    DB_POOL_ACQUIRE_TIMEOUT: float = 5.0  # segundos esperando una conexión libre
+    DB_CONNECT_TIMEOUT: float = 10.0
+    DB_MAX_INACTIVE_CONNECTION_LIFETIME: float = 300.0
+    DB_STATEMENT_CACHE_SIZE: int = 100  # 0 si se usa PgBouncer en modo transacción
+    DB_STATEMENT_TIMEOUT_MS: int = 30000
+    DB_IDLE_IN_TRANSACTION_TIMEOUT_MS: int = 60000
+    # Conexiones que puede abrir el pod entero (0 = sin límite). Se reparte
+    # entre los workers de gunicorn: maxsize = min(DB_POOL_MAX_SIZE, budget // workers)
+    DB_CONNECTION_BUDGET: int = 0
+    WEB_CONCURRENCY: int = 1  # lo fija gunicorn.conf.py con el número de workers
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
+    LOG_LEVELS: Dict[str, str] = {}  # p. ej. {"app.infra.postgres": "DEBUG"}
+    LOG_FORMAT: str = "json"  # json | text
+
+    # Query instrumentation
+    QUERY_INSTRUMENTATION: bool = True  # Server-Timing + log por petición
+    DB_SLOW_QUERY_MS: int = 200  # 0 desactiva el registro de consultas lentas
+    DB_EXPLAIN_SLOW_QUERIES: bool = True
+
+    # Compresión de respuestas (brotli si está instalado, si no gzip)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # bytes
+    COMPRESSION_OFFLOAD_SIZE: int = 262144  # desde aquí se comprime en el executor
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+
+    # Prometheus metrics (/metrics)
+    METRICS_ENABLED: bool = True
+    METRICS_LOOP_LAG_INTERVAL: float = 0.5  # segundos; 0 desactiva la medición
+
+    # Password hashing / bulk imports
+    PASSWORD_HASH_WORKERS: int = 0  # 0 = CPUs de la cuota del contenedor
+    USER_IMPORT_BATCH_SIZE: int = 500
+    USER_IMPORT_MAX_ROWS: int = 50000
+    # Guardar tal cual las contraseñas que ya vienen como hash bcrypt (migraciones)
+    USER_IMPORT_ACCEPT_PASSWORD_HASHES: bool = False
+    PAYMENT_IMPORT_BATCH_SIZE: int = 1000
+    PAYMENT_IMPORT_MAX_ROWS: int = 200000
+
+    # Borrado lógico: purgado por lotes de las filas marcadas (app/services/purge.py)
+    SOFT_DELETE_RETENTION_DAYS: int = 30
+    PURGE_BATCH_SIZE: int = 200
+    PURGE_BATCH_PAUSE: float = 0.2  # segundos entre lotes
+    PURGE_INTERVAL: int = 0  # segundos entre purgados en segundo plano; 0 desactiva
+    PURGE_WINDOW_START_HOUR: int = 6  # ventana en horas UTC (fuera de horario de oficina)
+    PURGE_WINDOW_END_HOUR: int = 10
+
+    # Trabajos de borrado de tiendas y usuarios (app/services/deletion_job.py)
+    DELETION_JOB_BATCH_SIZE: int = 500
+    DELETION_JOB_BATCH_PAUSE: float = 0.05  # segundos entre lotes
+    DELETION_JOB_POLL_INTERVAL: float = 60  # reanudar trabajos sin terminar; 0 desactiva
+
+    # Caché de cuentas FRP por tienda (app/services/factory_reset_protection.py)
+    FRP_SNAPSHOT_TTL: float = 60.0  # segundos; acota el desfase entre workers
+    FRP_SNAPSHOT_MAX_STORES: int = 2048
+
+    # Caché de televisores por número de serie (check-in de los televisores)
+    TELEVISION_SERIAL_CACHE_TTL: float = 30.0
+    TELEVISION_SERIAL_CACHE_SIZE: int = 10000
+
+    # Resumen de tienda del panel (GET /stores/{id}/summary)
+    STORE_SUMMARY_CACHE_TTL: float = 30.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
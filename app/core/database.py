@@ -1,12 +1,80 @@
+from typing import Any, Dict, Optional
+
 from tortoise import Tortoise
+from tortoise.backends.base.config_generator import expand_db_url
 
 from app.core.config import settings
 
+MODELS = ["app.infra.postgres.models"]
 
-async def init_db():
-    await Tortoise.init(
-        db_url=settings.POSTGRES_DATABASE_URL,
-        modules={"models": ["app.infra.postgres.models"]},
+
+def _pool_max_size(configured: int) -> int:
+    """Tamaño máximo del pool de este worker dentro del presupuesto del pod."""
+    if settings.DB_CONNECTION_BUDGET <= 0:
+        return configured
+    per_worker = settings.DB_CONNECTION_BUDGET // max(1, settings.WEB_CONCURRENCY)
+    return max(1, min(configured, per_worker))
+
+
+def _connection(url: str, *, max_size: int, read_only: bool = False) -> Dict[str, Any]:
+    """Configuración de una conexión PostgreSQL con el pool instrumentado."""
+    config = expand_db_url(url)
+    if not config["engine"].startswith("tortoise.backends.asyncpg"):
+        # sqlite:// y similares (pruebas locales) se usan tal cual
+        return config
+    config["engine"] = "app.infra.postgres.client"
+    credentials = config["credentials"]
+    # Los parámetros de la URL (?minsize=...) tienen prioridad sobre los settings
+    credentials.setdefault("minsize", min(settings.DB_POOL_MIN_SIZE, max_size))
+    credentials.setdefault("maxsize", max_size)
+    credentials.setdefault("acquire_timeout", settings.DB_POOL_ACQUIRE_TIMEOUT)
+    credentials.setdefault("timeout", settings.DB_CONNECT_TIMEOUT)
+    credentials.setdefault("statement_cache_size", settings.DB_STATEMENT_CACHE_SIZE)
+    credentials.setdefault(
+        "max_inactive_connection_lifetime", settings.DB_MAX_INACTIVE_CONNECTION_LIFETIME
     )
+    server_settings = {
+        "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+        "idle_in_transaction_session_timeout": str(
+            settings.DB_IDLE_IN_TRANSACTION_TIMEOUT_MS
+        ),
+    }
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    credentials["server_settings"] = server_settings
+    return config
+
+
+def build_tortoise_config(
+    db_url: Optional[str] = None, replica_url: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Configuración única de Tortoise para la API, los scripts y las migraciones.
+
+    Si hay réplica, se añade la conexión "replica" y el `ReplicaRouter`, que le
+    envía las lecturas marcadas con `replica_reads()`.
+    """
+    db_url = db_url or settings.POSTGRES_DATABASE_URL
+    if replica_url is None:
+        replica_url = settings.POSTGRES_REPLICA_URL
+    connections = {
+        "default": _connection(db_url, max_size=_pool_max_size(settings.DB_POOL_MAX_SIZE))
+    }
+    config: Dict[str, Any] = {
+        "connections": connections,
+        "apps": {"models": {"models": MODELS, "default_connection": "default"}},
+    }
+    if replica_url:
+        connections["replica"] = _connection(
+            replica_url,
+            max_size=_pool_max_size(settings.DB_REPLICA_POOL_MAX_SIZE),
+            read_only=True,
+        )
+        config["routers"] = ["app.infra.postgres.routing.ReplicaRouter"]
+    return config
+
+
+async def init_db():
+    await Tortoise.init(config=build_tortoise_config())
     # Skip schema generation since we've already applied migrations manually
     # await Tortoise.generate_schemas()
@@ -0,0 +1,249 @@
+"""
+Instrumentación de consultas SQL por petición.
+
+La conexión asyncpg de `app.infra.postgres.client` llama a `record_query` en
+cada sentencia. Si hay un `QueryStats` activo en el contexto (lo abre
+`QueryInstrumentationMiddleware` por petición, o `track_queries()` en
+scripts y pruebas) se acumulan el número de consultas, el tiempo total en la
+base de datos, las filas devueltas y la sentencia más lenta.
+
+Al terminar la petición los datos salen en la cabecera `Server-Timing`
+(`db;desc="7 queries";dur=12.3, db-slowest;dur=4.1, total;dur=30.2`) y en un
+registro estructurado del logger `app.instrumentation`. Las sentencias que
+superan `DB_SLOW_QUERY_MS` se registran y, si `DB_EXPLAIN_SLOW_QUERIES` está
+activo, se lanza su `EXPLAIN` en segundo plano.
+"""
+
+import asyncio
+import logging
+import re
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic, perf_counter
+from typing import Any, Dict, Iterator, Optional, Sequence, Set
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+logger = logging.getLogger("app.instrumentation")
+
+_PARAM = re.compile(r"\$\d+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUE_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACES = re.compile(r"\s+")
+
+_MAX_SQL_LENGTH = 1000
+# Una misma sentencia lenta solo se explica una vez por ventana
+_EXPLAIN_COOLDOWN = 300.0
+_EXPLAIN_CACHE_SIZE = 256
+
+
+def normalize_sql(sql: str) -> str:
+    """Sustituye literales y parámetros por `?` para agrupar sentencias iguales."""
+    sql = _PARAM.sub("?", sql)
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _VALUE_LIST.sub("(...)", sql)
+    sql = _SPACES.sub(" ", sql).strip()
+    return sql[:_MAX_SQL_LENGTH]
+
+
+class QueryStats:
+    """Acumulado de las consultas de una petición (o de un bloque `track_queries`)."""
+
+    __slots__ = ("parent", "count", "duration", "rows", "slowest_sql", "slowest")
+
+    def __init__(self, parent: Optional["QueryStats"] = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.duration = 0.0
+        self.rows = 0
+        self.slowest_sql: Optional[str] = None
+        self.slowest = 0.0
+
+    def record(self, sql: str, duration: float, rows: int) -> None:
+        self.count += 1
+        self.duration += duration
+        self.rows += rows
+        if duration > self.slowest:
+            self.slowest = duration
+            self.slowest_sql = sql
+        if self.parent is not None:
+            self.parent.record(sql, duration, rows)
+
+    def server_timing(self, total: Optional[float] = None) -> str:
+        metrics = [f'db;desc="{self.count} queries";dur={self.duration * 1000:.2f}']
+        if self.count:
+            metrics.append(f"db-slowest;dur={self.slowest * 1000:.2f}")
+        if total is not None:
+            metrics.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(metrics)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "queries": self.count,
+            "db_ms": round(self.duration * 1000, 2),
+            "rows": self.rows,
+            "slowest_ms": round(self.slowest * 1000, 2),
+            "slowest_sql": (
+                normalize_sql(self.slowest_sql) if self.slowest_sql else None
+            ),
+        }
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_explaining: ContextVar[bool] = ContextVar("explaining_query", default=False)
+_explained: Dict[str, float] = {}
+_explain_tasks: Set["asyncio.Task[None]"] = set()
+
+
+def record_query(sql: str, args: Sequence[Any], duration: float, rows: int) -> None:
+    """Registra una sentencia ejecutada (lo llama la conexión instrumentada)."""
+    if _explaining.get():
+        return
+    stats = _current.get()
+    if stats is not None:
+        stats.record(sql, duration, rows)
+    if settings.DB_SLOW_QUERY_MS and duration * 1000 >= settings.DB_SLOW_QUERY_MS:
+        normalized = normalize_sql(sql)
+        logger.warning(
+            "Consulta lenta (%.1f ms): %s",
+            duration * 1000,
+            normalized,
+            extra={
+                "db": {
+                    "duration_ms": round(duration * 1000, 2),
+                    "sql": normalized,
+                    "rows": rows,
+                }
+            },
+        )
+        if settings.DB_EXPLAIN_SLOW_QUERIES:
+            _schedule_explain(sql, args, normalized)
+
+
+def _schedule_explain(sql: str, args: Sequence[Any], normalized: str) -> None:
+    if not sql.lstrip().upper().startswith(("SELECT", "WITH")):
+        return
+    now = monotonic()
+    if now - _explained.get(normalized, -_EXPLAIN_COOLDOWN) < _EXPLAIN_COOLDOWN:
+        return
+    if len(_explained) >= _EXPLAIN_CACHE_SIZE:
+        _explained.clear()
+    _explained[normalized] = now
+    try:
+        task = asyncio.get_running_loop().create_task(_explain(sql, args, normalized))
+    except RuntimeError:
+        return
+    _explain_tasks.add(task)
+    task.add_done_callback(_explain_tasks.discard)
+
+
+async def _explain(sql: str, args: Sequence[Any], normalized: str) -> None:
+    from tortoise.connection import connections
+
+    _explaining.set(True)
+    try:
+        client = connections.get("default")
+        # Fuera de la transacción de la petición, que ya puede haber terminado
+        client = getattr(client, "_parent", client)
+        rows = await client.execute_query_dict(f"EXPLAIN {sql}", list(args))
+    except Exception as e:  # el EXPLAIN es diagnóstico: nunca debe romper nada
+        logger.info("No se pudo obtener el EXPLAIN de %s: %s", normalized, e)
+        return
+    plan = "\n".join(row["QUERY PLAN"] for row in rows)
+    logger.warning(
+        "Plan de consulta lenta: %s\n%s",
+        normalized,
+        plan,
+        extra={"db": {"sql": normalized, "plan": plan}},
+    )
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Acumula las consultas ejecutadas dentro del bloque (también las anidadas)."""
+    stats = QueryStats(parent=_current.get())
+    token = _current.set(stats)
+    try:
+        yield stats
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def query_budget(limit: int) -> Iterator[QueryStats]:
+    """
+    Falla con AssertionError si el bloque ejecuta más de `limit` consultas.
+
+        async with AsyncClient(app=app, base_url="http://test") as client:
+            with query_budget(3):
+                await client.get("/api/v1/payments")
+    """
+    with track_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        raise AssertionError(
+            f"Se ejecutaron {stats.count} consultas (presupuesto: {limit}); "
+            f"la más lenta: {normalize_sql(stats.slowest_sql or '')}"
+        )
+
+
+_SERVER_TIMING_QUERIES = re.compile(r'(?:^|,)\s*db;desc="(\d+) queries"')
+
+
+def queries_from_server_timing(header: Optional[str]) -> Optional[int]:
+    """Número de consultas de una respuesta a partir de su cabecera Server-Timing."""
+    match = _SERVER_TIMING_QUERIES.search(header or "")
+    return int(match.group(1)) if match else None
+
+
+class QueryInstrumentationMiddleware:
+    """Middleware ASGI: abre un `QueryStats` por petición y publica el resultado."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = perf_counter()
+        status_code = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", stats.server_timing(perf_counter() - started)
+                )
+            await send(message)
+
+        with track_queries() as stats:
+            try:
+                await self.app(scope, receive, send_with_timing)
+            finally:
+                duration = perf_counter() - started
+                logger.info(
+                    "%s %s %s %.1f ms, %d consultas",
+                    scope["method"],
+                    scope["path"],
+                    status_code,
+                    duration * 1000,
+                    stats.count,
+                    extra={
+                        "http": {
+                            "method": scope["method"],
+                            "path": scope["path"],
+                            "status": status_code,
+                            "duration_ms": round(duration * 1000, 2),
+                        },
+                        "db": stats.as_dict(),
+                    },
+                )
@@ -0,0 +1,111 @@
+"""
+Arranque y disponibilidad del servicio.
+
+`warm_up()` se ejecuta al arrancar, después de `init_db()`. Abre los pools de
+conexiones (Tortoise los crea en la primera consulta, así que sin esto la
+primera petición de cada worker paga la conexión a PostgreSQL), precalcula los
+serializadores de respuesta y genera el esquema OpenAPI. Hasta que termina,
+`GET /api/v1/ready` responde 503 y Kubernetes no envía tráfico al pod.
+
+Si la base de datos no está disponible al arrancar, el proceso sigue en pie
+(el liveness no depende de ella) y el calentamiento se reintenta en segundo
+plano hasta que funcione.
+"""
+
+import asyncio
+import logging
+from time import perf_counter
+from typing import Optional
+
+from fastapi import FastAPI
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+from tortoise import connections
+
+from app.api.serialization import serializer_for
+
+logger = logging.getLogger(__name__)
+
+_RETRY_DELAYS = (1, 2, 5, 10, 30)
+
+_ready = False
+_warm_up_task: Optional["asyncio.Task[None]"] = None
+
+
+def is_ready() -> bool:
+    return _ready
+
+
+async def _warm_pools() -> None:
+    # Con asyncpg el pool abre sus `minsize` conexiones al crearse
+    await asyncio.gather(
+        *(connection.execute_query("SELECT 1") for connection in connections.all())
+    )
+
+
+def warm_caches(app: FastAPI) -> int:
+    """
+    Precalcula los serializadores de respuesta y el esquema OpenAPI.
+
+    No toca la base de datos: con `preload_app` gunicorn lo llama en el
+    proceso maestro y los workers heredan las cachés ya construidas.
+    """
+    warmed = 0
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or route.response_field is None:
+            continue
+        field = route.response_field
+        for candidate in (field.type_, *(sub.type_ for sub in field.sub_fields or ())):
+            if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+                serializer_for(candidate).fields
+                warmed += 1
+    app.openapi()
+    return warmed
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Calienta pools, serializadores y OpenAPI y marca el servicio como listo."""
+    global _ready
+    started = perf_counter()
+    await _warm_pools()
+    serializers = warm_caches(app)
+    _ready = True
+    logger.info(
+        "Servicio listo en %.0f ms (%d serializadores)",
+        (perf_counter() - started) * 1000,
+        serializers,
+    )
+
+
+async def _warm_up_with_retries(app: FastAPI) -> None:
+    attempt = 0
+    while True:
+        delay = _RETRY_DELAYS[min(attempt, len(_RETRY_DELAYS) - 1)]
+        await asyncio.sleep(delay)
+        try:
+            await warm_up(app)
+            return
+        except Exception:
+            attempt += 1
+            logger.warning("Calentamiento fallido (intento %d)", attempt, exc_info=True)
+
+
+async def start(app: FastAPI) -> None:
+    """Intenta calentar al arrancar; si falla, reintenta en segundo plano."""
+    global _warm_up_task
+    try:
+        await warm_up(app)
+    except Exception:
+        logger.exception("Calentamiento fallido; se reintentará en segundo plano")
+        _warm_up_task = asyncio.get_running_loop().create_task(
+            _warm_up_with_retries(app)
+        )
+
+
+def stop() -> None:
+    """Deja de anunciarse como listo mientras el proceso se detiene."""
+    global _ready, _warm_up_task
+    _ready = False
+    if _warm_up_task is not None:
+        _warm_up_task.cancel()
+        _warm_up_task = None
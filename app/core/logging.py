@@ -0,0 +1,160 @@
+"""
+Logging estructurado y no bloqueante.
+
+`setup_logging()` deja un único `QueueHandler` en el logger raíz: el hilo que
+atiende la petición solo encola el `LogRecord` (sin formatear el mensaje ni
+escribir en el stream) y un `QueueListener` en un hilo aparte lo formatea
+como JSON y lo escribe en stdout. Los mensajes se pasan con argumentos
+(`logger.debug("pagos=%d", n)`), así que un `debug` deshabilitado se descarta
+en `isEnabledFor` sin construir ninguna cadena.
+
+Cada registro lleva el `request_id` de la petición en curso, que
+`RequestIdMiddleware` toma de la cabecera `X-Request-ID` (o genera) y
+devuelve en la respuesta.
+
+Niveles: `LOG_LEVEL` para el raíz y `LOG_LEVELS` (JSON) por módulo, p. ej.
+`LOG_LEVELS='{"app.infra.postgres": "DEBUG", "tortoise": "WARNING"}'`.
+"""
+
+import logging
+import queue
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+_listener: Optional[QueueListener] = None
+
+# Atributos propios de LogRecord; el resto son campos estructurados (`extra=`)
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {
+    "message",
+    "asctime",
+    "request_id",
+}
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class RequestIdFilter(logging.Filter):
+    """Añade el request_id del contexto a cada registro."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = _request_id.get()
+        return True
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    QueueHandler que no formatea en el hilo que registra.
+
+    `QueueHandler.prepare` fusiona `msg % args` antes de encolar (pensado para
+    enviar registros a otros procesos). Aquí la cola es del mismo proceso, así
+    que se encola el registro tal cual y el formateo ocurre en el listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class JSONFormatter(logging.Formatter):
+    """Una línea JSON por registro, con los campos de `extra=` al primer nivel."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return orjson.dumps(entry, default=str).decode()
+
+
+def setup_logging() -> None:
+    """Configura el logging de la aplicación (idempotente)."""
+    global _listener
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    if settings.LOG_FORMAT == "json":
+        stream.setFormatter(JSONFormatter())
+    else:
+        stream.setFormatter(
+            logging.Formatter(
+                "%(asctime)s %(levelname)s [%(request_id)s] %(name)s: %(message)s"
+            )
+        )
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = LazyQueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel(settings.LOG_LEVEL.upper())
+    for name, level in settings.LOG_LEVELS.items():
+        logging.getLogger(name).setLevel(level.upper())
+
+    _listener = QueueListener(log_queue, stream, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Vacía la cola y detiene el hilo del listener."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+class RequestIdMiddleware:
+    """Middleware ASGI que fija el request_id de la petición y lo devuelve."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._header = REQUEST_ID_HEADER.lower().encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == self._header:
+                request_id = value.decode("latin-1")[:128]
+                break
+        if not request_id:
+            request_id = uuid4().hex
+
+        async def send_with_request_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                MutableHeaders(scope=message)[REQUEST_ID_HEADER] = request_id
+            await send(message)
+
+        token = _request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            _request_id.reset(token)
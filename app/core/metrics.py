@@ -0,0 +1,219 @@
+"""
+Métricas Prometheus del servicio.
+
+- `http_request_duration_seconds{method,route,status}`: histograma de latencia
+  por plantilla de ruta (`/api/v1/users/{user_id}`) y clase de estado (2xx…).
+  Los hijos con sus etiquetas se crean de una vez para todas las rutas en
+  la primera petición; después solo se indexan dicts y listas ya
+  construidos, sin crear diccionarios de etiquetas por petición.
+- `http_requests_in_flight`: peticiones en curso.
+- `db_pool_*`: estado de los pools de conexiones (ver `app.infra.postgres.client`).
+- `cache_*`: aciertos, fallos y tamaño de las cachés registradas con `register_cache`.
+- `event_loop_lag_seconds`: retraso del event loop medido por una tarea periódica.
+
+Las métricas son por proceso: con varios workers cada uno expone las suyas.
+"""
+
+import asyncio
+from time import perf_counter
+from typing import Any, Dict, Iterator, List, Optional
+
+from prometheus_client import REGISTRY, Gauge, Histogram
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily
+from prometheus_client.registry import Collector
+from starlette.routing import BaseRoute
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de las peticiones HTTP por ruta",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+IN_FLIGHT = Gauge("http_requests_in_flight", "Peticiones HTTP en curso")
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Retraso del event loop respecto al intervalo esperado",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+_UNMATCHED = "<unmatched>"
+_STATUS_CLASSES = ("1xx", "2xx", "3xx", "4xx", "5xx")
+_METHODS = {"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"}
+
+_caches: Dict[str, Any] = {}
+
+
+def register_cache(name: str, cache: Any) -> Any:
+    """
+    Publica las estadísticas de una caché en /metrics.
+
+    Acepta funciones con `functools.lru_cache` (usa `cache_info()`) u objetos
+    con atributos `hits` y `misses` y `len()`. Devuelve la caché para poder
+    usarse en la asignación.
+    """
+    _caches[name] = cache
+    return cache
+
+
+def _cache_stats(cache: Any) -> Optional[Dict[str, float]]:
+    if hasattr(cache, "cache_info"):
+        info = cache.cache_info()
+        return {"hits": info.hits, "misses": info.misses, "size": info.currsize}
+    if hasattr(cache, "hits") and hasattr(cache, "misses"):
+        return {"hits": cache.hits, "misses": cache.misses, "size": len(cache)}
+    return None
+
+
+class CacheCollector(Collector):
+    def collect(self) -> Iterator[Any]:
+        hits = CounterMetricFamily("cache_hits", "Aciertos de caché", labels=["cache"])
+        misses = CounterMetricFamily(
+            "cache_misses", "Fallos de caché", labels=["cache"]
+        )
+        size = GaugeMetricFamily("cache_size", "Entradas en caché", labels=["cache"])
+        for name, cache in _caches.items():
+            stats = _cache_stats(cache)
+            if stats is None:
+                continue
+            hits.add_metric([name], stats["hits"])
+            misses.add_metric([name], stats["misses"])
+            size.add_metric([name], stats["size"])
+        yield hits
+        yield misses
+        yield size
+
+
+class PoolCollector(Collector):
+    def collect(self) -> Iterator[Any]:
+        from app.infra.postgres.client import pool_stats
+
+        labels = ["connection"]
+        size = GaugeMetricFamily("db_pool_size", "Conexiones abiertas", labels=labels)
+        max_size = GaugeMetricFamily(
+            "db_pool_max_size", "Tamaño máximo del pool", labels=labels
+        )
+        in_use = GaugeMetricFamily(
+            "db_pool_in_use", "Conexiones prestadas", labels=labels
+        )
+        waiting = GaugeMetricFamily(
+            "db_pool_waiting", "Peticiones esperando una conexión", labels=labels
+        )
+        acquired = CounterMetricFamily(
+            "db_pool_acquired", "Conexiones adquiridas", labels=labels
+        )
+        timeouts = CounterMetricFamily(
+            "db_pool_acquire_timeouts",
+            "Esperas de conexión que agotaron el tiempo",
+            labels=labels,
+        )
+        wait_p95 = GaugeMetricFamily(
+            "db_pool_acquire_wait_p95_seconds",
+            "p95 de la espera para obtener conexión (últimas 1000)",
+            labels=labels,
+        )
+        for name, stats in pool_stats().items():
+            if stats is None:
+                continue
+            size.add_metric([name], stats["size"])
+            max_size.add_metric([name], stats["max_size"])
+            in_use.add_metric([name], stats["in_use"])
+            waiting.add_metric([name], stats["waiting"])
+            acquired.add_metric([name], stats["acquired"])
+            timeouts.add_metric([name], stats["timeouts"])
+            wait_p95.add_metric([name], stats["acquire_wait_ms"]["p95"] / 1000)
+        yield from (size, max_size, in_use, waiting, acquired, timeouts, wait_p95)
+
+
+REGISTRY.register(CacheCollector())
+REGISTRY.register(PoolCollector())
+
+
+class MetricsMiddleware:
+    """Middleware ASGI que mide latencia por ruta y peticiones en curso."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        # {plantilla de ruta: {método: [hijo por clase de estado]}}
+        self._children: Dict[str, Dict[str, List[Any]]] = {}
+        self._prepared = False
+
+    @staticmethod
+    def _labels(path: str, method: str) -> List[Any]:
+        return [
+            REQUEST_LATENCY.labels(method, path, status) for status in _STATUS_CLASSES
+        ]
+
+    def _prepare(self, routes: List[BaseRoute]) -> None:
+        """Crea de antemano los hijos del histograma para todas las rutas."""
+        self._prepared = True
+        for route in routes:
+            path = getattr(route, "path", None)
+            for method in getattr(route, "methods", None) or ():
+                self._children.setdefault(path, {})[method] = self._labels(path, method)
+
+    def _child(self, route: Optional[BaseRoute], method: str, status: int) -> Any:
+        path = route.path if route is not None else _UNMATCHED
+        methods = self._children.get(path)
+        if methods is None:
+            methods = self._children[path] = {}
+        children = methods.get(method)
+        if children is None:
+            # Rutas sin coincidencia o métodos no declarados (OPTIONS, 405...)
+            if method not in _METHODS:
+                method = "OTHER"
+            children = methods[method] = self._labels(path, method)
+        index = status // 100 - 1
+        return children[index if 0 <= index < len(children) else -1]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        if not self._prepared:
+            self._prepare(scope["app"].routes)
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        started = perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            IN_FLIGHT.dec()
+            self._child(scope.get("route"), scope["method"], status_code).observe(
+                perf_counter() - started
+            )
+
+
+_loop_monitor: Optional["asyncio.Task[None]"] = None
+
+
+async def _monitor_event_loop(interval: float) -> None:
+    loop = asyncio.get_running_loop()
+    while True:
+        started = loop.time()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(0.0, loop.time() - started - interval))
+
+
+def start_event_loop_monitor(interval: float) -> None:
+    global _loop_monitor
+    if _loop_monitor is None and interval > 0:
+        _loop_monitor = asyncio.get_running_loop().create_task(
+            _monitor_event_loop(interval)
+        )
+
+
+def stop_event_loop_monitor() -> None:
+    global _loop_monitor
+    if _loop_monitor is not None:
+        _loop_monitor.cancel()
+        _loop_monitor = None
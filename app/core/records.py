@@ -0,0 +1,118 @@
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional
+
+from pydantic import ValidationError
+
+SUPPORTED_FORMATS = ("csv", "ndjson", "json")
+
+_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "ndjson",
+    "application/ndjson": "ndjson",
+    "application/jsonl": "ndjson",
+    "application/json": "json",
+}
+
+
+class RecordFormatError(ValueError):
+    """El contenido no se puede interpretar en el formato indicado."""
+
+
+class Record(NamedTuple):
+    """Registro leído de un archivo; `row` es la línea (CSV/NDJSON) o la posición (JSON)."""
+
+    row: int
+    data: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+
+
+def detect_format(content_type: Optional[str], explicit: Optional[str] = None) -> str:
+    """Determina el formato a partir del parámetro explícito o del Content-Type."""
+    if explicit:
+        fmt = explicit.lower()
+        if fmt not in SUPPORTED_FORMATS:
+            raise RecordFormatError(
+                f"Formato '{explicit}' no soportado. Use uno de: {', '.join(SUPPORTED_FORMATS)}"
+            )
+        return fmt
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in _CONTENT_TYPES:
+        return _CONTENT_TYPES[media_type]
+    raise RecordFormatError(
+        f"Content-Type '{media_type or 'desconocido'}' no soportado. "
+        "Use text/csv, application/x-ndjson o application/json"
+    )
+
+
+def _clean(value: Any) -> Any:
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    return value
+
+
+def iter_records(data: bytes, fmt: str) -> Iterator[Record]:
+    """
+    Itera los registros de un archivo CSV, NDJSON o JSON (lista de objetos).
+
+    Los valores vacíos se normalizan a None. Las líneas NDJSON inválidas se
+    devuelven como registros con error en lugar de abortar toda la carga.
+    """
+    try:
+        text = data.decode("utf-8-sig")
+    except UnicodeDecodeError as e:
+        raise RecordFormatError(f"El archivo no está codificado en UTF-8: {e}")
+
+    if fmt == "csv":
+        reader = csv.DictReader(io.StringIO(text))
+        if not reader.fieldnames:
+            return
+        for values in reader:
+            # line_num apunta a la última línea leída (soporta campos multilínea)
+            yield Record(
+                reader.line_num,
+                {
+                    key.strip(): _clean(value)
+                    for key, value in values.items()
+                    if key is not None
+                },
+            )
+    elif fmt == "ndjson":
+        for line_number, line in enumerate(text.splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                item = json.loads(line)
+            except ValueError as e:
+                yield Record(line_number, None, f"JSON inválido: {e}")
+                continue
+            if not isinstance(item, dict):
+                yield Record(line_number, None, "Se esperaba un objeto JSON")
+                continue
+            yield Record(line_number, {k: _clean(v) for k, v in item.items()})
+    elif fmt == "json":
+        try:
+            items = json.loads(text)
+        except ValueError as e:
+            raise RecordFormatError(f"JSON inválido: {e}")
+        if not isinstance(items, list):
+            raise RecordFormatError("Se esperaba una lista de objetos JSON")
+        for position, item in enumerate(items, start=1):
+            if not isinstance(item, dict):
+                yield Record(position, None, "Se esperaba un objeto JSON")
+                continue
+            yield Record(position, {k: _clean(v) for k, v in item.items()})
+    else:
+        raise RecordFormatError(f"Formato '{fmt}' no soportado")
+
+
+def format_validation_error(error: ValidationError) -> List[str]:
+    """Mensajes `campo: error` de la validación de un registro."""
+    messages = []
+    for err in error.errors():
+        location = ".".join(str(part) for part in err["loc"] if part != "__root__")
+        messages.append(f"{location}: {err['msg']}" if location else err["msg"])
+    return messages
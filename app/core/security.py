@@ -0,0 +1,114 @@
+import asyncio
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, List, Optional, Sequence
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+_pwd_ctx: Optional["CryptContext"] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+# Procesos de hash sin PASSWORD_HASH_WORKERS ni cuota de cgroup
+DEFAULT_HASH_WORKERS = 4
+
+
+def get_pwd_context() -> "CryptContext":
+    """
+    Contexto bcrypt compartido.
+
+    passlib se importa en el primer uso y no al arrancar: solo lo necesitan
+    el login y el alta o cambio de contraseña.
+    """
+    global _pwd_ctx
+    if _pwd_ctx is None:
+        from passlib.context import CryptContext
+
+        _pwd_ctx = CryptContext(schemes=["bcrypt"], deprecated="auto")
+    return _pwd_ctx
+
+
+def hash_password(password: str) -> str:
+    """Hashea una contraseña con bcrypt (bloqueante)."""
+    return get_pwd_context().hash(password)
+
+
+def verify_password(password: str, hashed: str) -> bool:
+    """Comprueba una contraseña contra su hash (bloqueante)."""
+    return get_pwd_context().verify(password, hashed)
+
+
+def is_password_hash(value: str) -> bool:
+    """Indica si el valor ya es un hash reconocido por el contexto."""
+    return get_pwd_context().identify(value) is not None
+
+
+def _hash_chunk(passwords: Sequence[str]) -> List[str]:
+    # Se ejecuta en un proceso hijo, que construye su propio contexto
+    pwd_ctx = get_pwd_context()
+    return [pwd_ctx.hash(password) for password in passwords]
+
+
+def _default_workers() -> int:
+    # os.cpu_count() ve todo el nodo; en un pod con cuota, más procesos que
+    # CPUs asignadas solo compiten entre sí (y con los workers de la API)
+    from app.core.server import cgroup_cpu_limit
+
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        return max(1, math.ceil(limit))
+    return min(os.cpu_count() or 1, DEFAULT_HASH_WORKERS)
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Pool de procesos compartido para hashear contraseñas en paralelo."""
+    global _process_pool
+    if _process_pool is None:
+        workers = settings.PASSWORD_HASH_WORKERS or _default_workers()
+        _process_pool = ProcessPoolExecutor(max_workers=workers)
+    return _process_pool
+
+
+def shutdown_process_pool() -> None:
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=False)
+        _process_pool = None
+
+
+async def hash_password_async(password: str) -> str:
+    """Hashea una contraseña fuera del event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    """Comprueba una contraseña fuera del event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, verify_password, password, hashed)
+
+
+async def hash_passwords(
+    passwords: Sequence[str], *, chunk_size: int = 16
+) -> List[str]:
+    """
+    Hashea muchas contraseñas en paralelo usando el pool de procesos.
+
+    Las contraseñas se envían en bloques para amortizar el coste de IPC; el
+    resultado conserva el orden de entrada.
+    """
+    if not passwords:
+        return []
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    chunks = [
+        passwords[start : start + chunk_size]
+        for start in range(0, len(passwords), chunk_size)
+    ]
+    results = await asyncio.gather(
+        *(loop.run_in_executor(pool, _hash_chunk, chunk) for chunk in chunks)
+    )
+    return [hashed for chunk in results for hashed in chunk]
@@ -0,0 +1,65 @@
+"""
+Runtime de producción: gunicorn como gestor de procesos y workers de uvicorn.
+
+Este módulo lo importa `gunicorn.conf.py` en el proceso maestro, antes de
+cargar la aplicación, así que no debe importar `app.core.config` ni nada
+que lea la configuración de la base de datos.
+"""
+
+import math
+import os
+from typing import Optional
+
+from uvicorn.workers import UvicornWorker as _UvicornWorker
+
+
+class UvicornWorker(_UvicornWorker):
+    """Worker de uvicorn con uvloop y httptools explícitos (falla si faltan)."""
+
+    CONFIG_KWARGS = {"loop": "uvloop", "http": "httptools", "lifespan": "on"}
+
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path) as file:
+            return file.read().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit() -> Optional[float]:
+    """
+    CPUs asignadas al contenedor según la cuota de cgroup (v2 o v1).
+
+    Devuelve None si no hay cuota (`max` / -1) o no se puede leer; en ese caso
+    `os.cpu_count()` refleja el nodo entero y no el límite del pod.
+    """
+    cpu_max = _read("/sys/fs/cgroup/cpu.max")
+    if cpu_max:
+        quota, _, period = cpu_max.partition(" ")
+        if quota != "max" and period:
+            return int(quota) / int(period)
+        return None
+    quota = _read("/sys/fs/cgroup/cpu/cpu.cfs_quota_us")
+    period = _read("/sys/fs/cgroup/cpu/cpu.cfs_period_us")
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def worker_count() -> int:
+    """
+    Número de workers: `WEB_CONCURRENCY` si está definido; si no, una por CPU
+    de la cuota (redondeando hacia arriba), sin pasar de las CPUs visibles.
+
+    Los workers son asíncronos, así que más procesos que CPUs solo añaden
+    cambios de contexto y conexiones a PostgreSQL.
+    """
+    explicit = os.environ.get("WEB_CONCURRENCY")
+    if explicit:
+        return max(1, int(explicit))
+    cpus = os.cpu_count() or 1
+    limit = cgroup_cpu_limit()
+    if limit is not None:
+        cpus = min(cpus, math.ceil(limit))
+    return max(1, cpus)
@@ -0,0 +1,182 @@
+"""
+Motor de Tortoise para PostgreSQL con el pool instrumentado.
+
+Es el cliente asyncpg de Tortoise con un único cambio: el pool que crea se
+envuelve en `InstrumentedPool`, que aplica un tiempo máximo de espera al pedir
+una conexión y registra cuántas peticiones esperan y cuánto. Como tanto las
+consultas sueltas como `in_transaction()` piden conexiones con
+`pool.acquire()`, el límite y las métricas cubren los dos caminos.
+
+Las conexiones son `InstrumentedConnection`, que cronometra cada sentencia y
+la registra con `app.core.instrumentation.record_query` (conteo de consultas
+por petición, Server-Timing y consultas lentas).
+
+Se activa con `"engine": "app.infra.postgres.client"` en la configuración de
+Tortoise (ver `app.core.database.build_tortoise_config`).
+"""
+
+import asyncio
+from collections import deque
+from time import perf_counter
+from typing import Any, Deque, Dict, List, Optional
+
+import asyncpg
+from tortoise import Tortoise
+from tortoise.backends.asyncpg.client import AsyncpgDBClient
+from tortoise.connection import connections
+from tortoise.exceptions import DBConnectionError
+
+from app.core.instrumentation import record_query
+
+# Número de esperas recientes que se guardan para calcular percentiles
+_WAIT_SAMPLES = 1000
+
+
+def _status_rows(status: str) -> int:
+    # "INSERT 0 5", "UPDATE 3", "BEGIN"...
+    count = status.rsplit(" ", 1)[-1]
+    return int(count) if count.isdigit() else 0
+
+
+class InstrumentedConnection(asyncpg.Connection):
+    """Conexión asyncpg que informa de cada sentencia a la instrumentación."""
+
+    async def fetch(
+        self, query: str, *args: Any, **kwargs: Any
+    ) -> List[asyncpg.Record]:
+        started = perf_counter()
+        rows: List[asyncpg.Record] = []
+        try:
+            rows = await super().fetch(query, *args, **kwargs)
+            return rows
+        finally:
+            record_query(query, args, perf_counter() - started, len(rows))
+
+    async def fetchrow(
+        self, query: str, *args: Any, **kwargs: Any
+    ) -> Optional[asyncpg.Record]:
+        started = perf_counter()
+        row = None
+        try:
+            row = await super().fetchrow(query, *args, **kwargs)
+            return row
+        finally:
+            record_query(query, args, perf_counter() - started, int(row is not None))
+
+    async def fetchval(self, query: str, *args: Any, **kwargs: Any) -> Any:
+        started = perf_counter()
+        try:
+            return await super().fetchval(query, *args, **kwargs)
+        finally:
+            record_query(query, args, perf_counter() - started, 1)
+
+    async def execute(self, query: str, *args: Any, **kwargs: Any) -> str:
+        started = perf_counter()
+        status = ""
+        try:
+            status = await super().execute(query, *args, **kwargs)
+            return status
+        finally:
+            record_query(
+                query, args, perf_counter() - started, _status_rows(status or "")
+            )
+
+    async def executemany(self, command: str, args: Any, **kwargs: Any) -> None:
+        started = perf_counter()
+        try:
+            return await super().executemany(command, args, **kwargs)
+        finally:
+            record_query(command, (), perf_counter() - started, 0)
+
+
+class InstrumentedPool:
+    """Envoltorio de `asyncpg.Pool` con timeout de adquisición y métricas."""
+
+    def __init__(
+        self, pool: asyncpg.Pool, *, name: str, acquire_timeout: Optional[float]
+    ) -> None:
+        self._pool = pool
+        self.name = name
+        self.acquire_timeout = acquire_timeout
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.max_wait_ms = 0.0
+        self._waits: Deque[float] = deque(maxlen=_WAIT_SAMPLES)
+
+    def __getattr__(self, name: str) -> Any:
+        # release, close, terminate, expire_connections, get_size...
+        return getattr(self._pool, name)
+
+    async def acquire(self) -> asyncpg.Connection:
+        self.waiting += 1
+        started = perf_counter()
+        try:
+            connection = await self._pool.acquire(timeout=self.acquire_timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise DBConnectionError(
+                f"Pool '{self.name}' agotado: sin conexión libre tras {self.acquire_timeout}s"
+            )
+        finally:
+            self.waiting -= 1
+        wait_ms = (perf_counter() - started) * 1000
+        self._waits.append(wait_ms)
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+        self.acquired += 1
+        return connection
+
+    def stats(self) -> Dict[str, Any]:
+        size = self._pool.get_size()
+        waits = sorted(self._waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))], 3)
+
+        return {
+            "min_size": self._pool.get_min_size(),
+            "max_size": self._pool.get_max_size(),
+            "size": size,
+            "in_use": size - self._pool.get_idle_size(),
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "acquire_wait_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(self.max_wait_ms, 3),
+            },
+        }
+
+
+class InstrumentedAsyncpgDBClient(AsyncpgDBClient):
+    connection_class = InstrumentedConnection
+
+    def __init__(self, acquire_timeout: Optional[float] = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.acquire_timeout = acquire_timeout
+
+    async def create_pool(self, **kwargs: Any) -> InstrumentedPool:  # type: ignore[override]
+        pool = await super().create_pool(**kwargs)
+        return InstrumentedPool(
+            pool, name=self.connection_name, acquire_timeout=self.acquire_timeout
+        )
+
+
+client_class = InstrumentedAsyncpgDBClient
+
+
+def pool_stats() -> Dict[str, Optional[Dict[str, Any]]]:
+    """Métricas de los pools por conexión (None si el pool aún no se ha creado)."""
+    if not Tortoise._inited:
+        return {}
+    result: Dict[str, Optional[Dict[str, Any]]] = {}
+    for connection in connections.all():
+        pool = getattr(connection, "_pool", None)
+        result[connection.connection_name] = (
+            pool.stats() if isinstance(pool, InstrumentedPool) else None
+        )
+    return result
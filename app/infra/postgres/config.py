@@ -7,18 +7,12 @@ from tortoise import Tortoise
 from tortoise.contrib.fastapi import register_tortoise
 
 from app.config import settings
+from app.core.database import build_tortoise_config
 
 log = getLogger(__name__)
 
-TORTOISE_ORM = {
-    "connections": {"default": settings.POSTGRES_DATABASE_URL},
-    "apps": {
-        "models": {
-            "models": ["app.infra.postgres.models"],
-            "default_connection": "default",
-        },
-    },
-}
+# Misma configuración (pool, timeouts, réplica) que usa la API
+TORTOISE_ORM = build_tortoise_config(settings.POSTGRES_DATABASE_URL)
 
 
 def init_db(app: FastAPI) -> None:
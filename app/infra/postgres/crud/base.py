@@ -1,9 +1,91 @@
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar, Union
+import logging
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Sequence, Tuple, Type, TypeVar, Union
 
+from fastapi import HTTPException
+from tortoise import timezone
+from tortoise.expressions import Q
+from tortoise.fields.relational import CASCADE
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+from tortoise.transactions import in_transaction
+
+from app.infra.postgres.projection import Projection
 from app.schemas.general import CreateSchemaType, ModelType, UpdateSchemaType
 
 IdType = TypeVar("IdType")
 
+logger = logging.getLogger(__name__)
+
+# Por modelo, calculados al primer uso: las relaciones inversas no existen
+# hasta que Tortoise inicializa los modelos
+_cascades: Dict[Type[Model], List[Tuple[Type[Model], str]]] = {}
+_parents: Dict[Type[Model], List[Tuple[str, Type[Model]]]] = {}
+
+
+def _soft_delete_cascade(model: Type[Model]) -> List[Tuple[Type[Model], str]]:
+    """
+    Relaciones inversas con `on_delete=CASCADE` hacia modelos con borrado
+    lógico, como (modelo hijo, columna FK).
+
+    Se marcan junto con el padre para que ninguna fila viva apunte a un
+    padre oculto (las precargas pasan por el manager y devolverían None).
+    """
+    if model not in _cascades:
+        meta = model._meta
+        cascade = []
+        for name in sorted(meta.backward_fk_fields | meta.backward_o2o_fields):
+            backward = meta.fields_map[name]
+            child = backward.related_model
+            if "deleted_at" not in child._meta.fields_map:
+                continue
+            forward = next(
+                child._meta.fields_map[fk]
+                for fk in child._meta.fk_fields | child._meta.o2o_fields
+                if child._meta.fields_map[fk].source_field == backward.relation_field
+            )
+            if forward.on_delete == CASCADE:
+                cascade.append((child, backward.relation_field))
+        _cascades[model] = cascade
+    return _cascades[model]
+
+
+def _soft_delete_parents(model: Type[Model]) -> List[Tuple[str, Type[Model]]]:
+    """Claves foráneas hacia modelos con borrado lógico, como (relación, modelo padre)."""
+    if model not in _parents:
+        meta = model._meta
+        _parents[model] = [
+            (name, meta.fields_map[name].related_model)
+            for name in sorted(meta.fk_fields | meta.o2o_fields)
+            if "deleted_at" in meta.fields_map[name].related_model._meta.fields_map
+        ]
+    return _parents[model]
+
+
+async def _mark_children(
+    model: Type[Model], ids: List[Any], current: Optional[datetime], new: Optional[datetime]
+) -> None:
+    """
+    Pasa `deleted_at` de `current` a `new` en los hijos en cascada de `ids`,
+    y en los hijos de estos (p. ej. usuario -> planes -> pagos).
+
+    Al restaurar (`new` None) se omiten los hijos con otro padre aún borrado
+    (el plan de un cliente restaurado cuyo vendedor sigue borrado).
+    """
+    for child, column in _soft_delete_cascade(model):
+        pk = child._meta.pk_attr
+        marked = {"deleted_at__isnull": True} if current is None else {"deleted_at": current}
+        query = child.all_objects.filter(**{f"{column}__in": ids}, **marked)
+        if new is None:
+            for name, _ in _soft_delete_parents(child):
+                query = query.filter(
+                    Q(**{f"{name}_id__isnull": True}) | Q(**{f"{name}__deleted_at__isnull": True})
+                )
+        child_ids = await query.values_list(pk, flat=True)
+        if child_ids:
+            await child.all_objects.filter(**{f"{pk}__in": child_ids}).update(deleted_at=new)
+            await _mark_children(child, child_ids, current, new)
+
 
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):  # type: ignore
     def __init__(self, *, model: Type[ModelType]) -> None:
@@ -14,6 +96,8 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):  # type:
             for field_name, field in model._meta.fields_map.items()
             if field.pk
         )
+        # Borrado lógico: los modelos con `deleted_at` usan SoftDeleteManager
+        self.soft_delete = "deleted_at" in model._meta.fields_map
 
     async def get(self, *, id: Any) -> Optional[ModelType]:
         """
@@ -45,7 +129,53 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):  # type:
 
         return await query.offset(skip).limit(limit).all()
 
-    async def create(self, *, obj_in: CreateSchemaType) -> ModelType:
+    async def get_all_projected(
+        self,
+        projection: Projection,
+        *,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        payload: Optional[Dict[str, Any]] = None,
+        q_filter: Optional[Q] = None,
+        order_by: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Como get_all, pero devuelve diccionarios con solo los campos de la proyección.
+
+        `q_filter` debe recorrer solo claves foráneas (no relaciones inversas)
+        para no duplicar filas.
+        """
+        query = self.model.filter(**(payload or {}))
+        if q_filter is not None:
+            query = query.filter(q_filter)
+
+        if order_by:
+            query = query.order_by(*order_by)
+        elif hasattr(self.model, "created_at"):
+            query = query.order_by("-created_at")
+        elif hasattr(self.model, "initial_date"):
+            query = query.order_by("-initial_date")
+
+        if skip:
+            query = query.offset(skip)
+        if limit is not None:
+            query = query.limit(limit)
+        return await projection.fetch(query)
+
+    async def get_projected(self, projection: Projection, *, id: Any) -> Optional[Dict[str, Any]]:
+        """Como get, pero devuelve un diccionario con solo los campos de la proyección."""
+        return await projection.fetch_one(self.model.filter(**{self.pk_field: id}))
+
+    async def create(
+        self, *, obj_in: CreateSchemaType, expand: Sequence[str] = ()
+    ) -> ModelType:
+        """
+        Inserta un registro y devuelve la instancia sin volver a leerla.
+
+        La instancia ya contiene todas las columnas (defaults y auto_now se
+        resuelven en Python), así que solo se cargan las relaciones indicadas
+        en `expand` (p. ej. `("applied_by__role",)`).
+        """
         # Manejar tanto objetos Pydantic como diccionarios
         if hasattr(obj_in, 'dict'):
             obj_in_data = obj_in.dict()
@@ -55,25 +185,27 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):  # type:
         
         # Create a new record in the database
         model = await self.model.create(**obj_in_data)
-        
-        # Recargar el modelo con sus relaciones utilizando la clave primaria dinámica
-        pk = self.pk_field
-        model = await self.model.get(**{pk: getattr(model, pk)}).prefetch_related(*self.model._meta.fetch_fields)
+        if expand:
+            await model.fetch_related(*expand)
         return model
 
     async def update(self, *, id: Any, obj_in: Union[UpdateSchemaType, Dict[str, Any]]) -> ModelType:
-        import logging
-        logger = logging.getLogger(__name__)
-        
         pk = self.pk_field
-        logger.info(f"Actualizando modelo {self.model.__name__} con pk={pk}, id={id}")
-        
+
         # Obtenemos solo los campos que se han establecido explícitamente
         update_data = (
             obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_none=True)
         )
-        
-        logger.info(f"Datos de actualización: {update_data}")
+
+        if logger.isEnabledFor(logging.DEBUG):
+            # Solo los nombres de los campos: los valores pueden incluir contraseñas
+            logger.debug(
+                "Actualizando %s %s=%s campos=%s",
+                self.model.__name__,
+                pk,
+                id,
+                list(update_data),
+            )
 
         if not update_data:
             logger.warning("No hay datos para actualizar, retornando objeto original")
@@ -84,7 +216,7 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):  # type:
             # Primero obtenemos el objeto existente para verificar que existe
             obj = await self.model.get_or_none(**{pk: id})
             if not obj:
-                logger.warning(f"No se encontró el objeto con {pk}={id}")
+                logger.warning("No se encontró %s con %s=%s", self.model.__name__, pk, id)
                 return None
                 
             # Manejo especial para claves foráneas para asegurar la actualización correcta
@@ -105,20 +237,102 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):  # type:
             
             # Guardamos el objeto. Tortoise se encargará de las relaciones.
             await obj.save()
-            logger.info(f"Objeto con {pk}={id} actualizado con los campos: {list(update_data.keys())}")
 
             # Devolvemos el objeto actualizado con sus relaciones
             await obj.fetch_related(*self.model._meta.fetch_fields)
             return obj
         except Exception as e:
-            logger.error(f"Error al actualizar: {str(e)}")
+            logger.error("Error al actualizar %s %s=%s: %s", self.model.__name__, pk, id, e)
             raise
 
-    async def delete(self, *, id: Any) -> bool:
+    async def patch(self, *, id: Any, values: Dict[str, Any]) -> Optional[ModelType]:
+        """
+        Actualización parcial en un solo viaje a la base de datos.
+
+        Emite `UPDATE ... SET <columnas cambiadas> ... RETURNING *` y construye la
+        instancia desde la fila devuelta. Las claves foráneas se validan con la
+        propia restricción (IntegrityError), sin consultas previas. Las
+        relaciones no se cargan; usar `fetch_related` si se necesitan.
+        """
+        meta = self.model._meta
+        pk_column = meta.fields_db_projection[self.pk_field]
+        assignments = []
+        params: List[Any] = []
+        for field, value in values.items():
+            field_object = meta.fields_map[field]
+            params.append(field_object.to_db_value(value, self.model))
+            assignments.append(f'"{meta.fields_db_projection[field]}" = ${len(params)}')
+        if not assignments:
+            return await self.get(id=id)
+
+        updated_at = meta.fields_map.get("updated_at")
+        if getattr(updated_at, "auto_now", False) and "updated_at" not in values:
+            params.append(updated_at.to_db_value(timezone.now(), None))
+            assignments.append(f'"updated_at" = ${len(params)}')
+
+        params.append(id)
+        query = (
+            f'UPDATE "{meta.db_table}" SET {", ".join(assignments)} '
+            f'WHERE "{pk_column}" = ${len(params)}'
+            + (' AND "deleted_at" IS NULL' if self.soft_delete else "")
+            + " RETURNING *"
+        )
+        rows = await self.model._meta.db.execute_query_dict(query, params)
+        if not rows:
+            return None
+        return self.model._init_from_db(**rows[0])
+
+    async def delete(self, *, id: Any, hard: bool = False) -> bool:
+        """
+        Borra un registro.
+
+        En modelos con `deleted_at` es un borrado lógico (también de los hijos
+        en cascada, y de los hijos de estos, con la misma marca de tiempo); el
+        DELETE real lo hace el purgado por lotes (`app.services.purge`).
+        `hard=True` borra ya.
+        """
         pk = self.pk_field
-        deleted_count = await self.model.filter(**{pk: id}).delete()
+        if hard or not self.soft_delete:
+            deleted_count = await QuerySet(self.model).filter(**{pk: id}).delete()
+            return deleted_count > 0
+
+        async with in_transaction(self.model._meta.default_connection):
+            now = timezone.now()
+            deleted_count = await self.model.filter(**{pk: id}).update(deleted_at=now)
+            if deleted_count:
+                await _mark_children(self.model, [id], None, now)
         return deleted_count > 0
 
+    async def restore(self, *, id: Any) -> Optional[ModelType]:
+        """
+        Deshace un borrado lógico, junto con los hijos borrados en la misma
+        operación. Devuelve None si el registro no existe o no está borrado.
+
+        Responde 409 si alguno de sus padres sigue borrado (p. ej. el usuario
+        de un plan): hay que restaurar antes el padre.
+        """
+        pk = self.pk_field
+        async with in_transaction(self.model._meta.default_connection):
+            row = await (
+                self.model.all_objects.filter(**{pk: id}, deleted_at__isnull=False)
+                .select_for_update()
+                .first()
+            )
+            if row is None:
+                return None
+            for name, parent in _soft_delete_parents(self.model):
+                parent_id = getattr(row, self.model._meta.fields_map[name].source_field)
+                if parent_id is not None and await parent.all_objects.filter(
+                    pk=parent_id, deleted_at__isnull=False
+                ).exists():
+                    raise HTTPException(
+                        status_code=409,
+                        detail=f"{parent.__name__} {parent_id} is deleted; restore it first",
+                    )
+            await self.model.all_objects.filter(**{pk: id}).update(deleted_at=None)
+            await _mark_children(self.model, [id], row.deleted_at, None)
+        return await self.get(id=id)
+
     async def count(self, *, payload: Dict[str, Any] = {}) -> int:
         count = await self.model.filter(**payload).all().count()
         return count
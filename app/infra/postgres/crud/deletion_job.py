@@ -0,0 +1,34 @@
+from typing import Optional
+from uuid import UUID
+
+from app.infra.postgres.crud.base import CRUDBase
+from app.infra.postgres.models.deletion_job import (
+    DeletionEntity,
+    DeletionJob,
+    DeletionJobState,
+)
+from app.schemas.deletion_job import DeletionJobCreate
+
+
+class CRUDDeletionJob(CRUDBase[DeletionJob, DeletionJobCreate, DeletionJobCreate]):
+    async def get_open(
+        self, *, entity: DeletionEntity, entity_id: UUID
+    ) -> Optional[DeletionJob]:
+        """Trabajo sin terminar (pendiente, en curso o fallido) del registro."""
+        return await (
+            self.model.filter(entity=entity, entity_id=entity_id)
+            .exclude(state=DeletionJobState.COMPLETED)
+            .first()
+        )
+
+    async def get_latest(
+        self, *, entity: DeletionEntity, entity_id: UUID
+    ) -> Optional[DeletionJob]:
+        return await (
+            self.model.filter(entity=entity, entity_id=entity_id)
+            .order_by("-created_at")
+            .first()
+        )
+
+
+crud_deletion_job = CRUDDeletionJob(model=DeletionJob)
@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
@@ -6,6 +7,8 @@ from app.infra.postgres.crud.base import CRUDBase
 from app.infra.postgres.models.payment import Payment
 from app.schemas.payment import PaymentCreate, PaymentUpdate
 
+logger = logging.getLogger(__name__)
+
 # Si tienes un PaymentUpdate, impórtalo aquí. Si no, puedes crear uno vacío o manejar solo PaymentCreate.
 try:
     from app.schemas.payment import PaymentUpdate
@@ -24,7 +27,12 @@ class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
             data["date"] = d.isoformat()
 
         model = await self.model.create(**data)
-        return await self.get_by_id(_id=model.payment_id)
+        # Una sola lectura con JOIN con lo que necesita PaymentResponse
+        return (
+            await self.model.filter(payment_id=model.payment_id)
+            .select_related("plan__user", "plan__vendor", "plan__device", "plan__television")
+            .first()
+        )
 
     async def get_all(
         self,
@@ -34,12 +42,14 @@ class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
         payload: Optional[dict] = None,
         plan_id: Optional[UUID] = None,
     ) -> List[Payment]:
-        import logging
-
-        logger = logging.getLogger(__name__)
-        logger.info(
-            f"CRUDPayment.get_all llamado con skip={skip}, limit={limit}, payload={payload}, plan_id={plan_id}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "CRUDPayment.get_all skip=%d limit=%d filtros=%s plan_id=%s",
+                skip,
+                limit,
+                sorted(payload or ()),
+                plan_id,
+            )
 
         query = self.model.all()
 
@@ -86,7 +96,7 @@ class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
                 pass
             return results
         except Exception as e:
-            logger.error(f"Error al hacer prefetch_related: {str(e)}")
+            logger.error("Error al hacer prefetch_related: %s", e)
             return await query
 
     async def get_by_id(self, *, _id: UUID) -> Optional[Payment]:
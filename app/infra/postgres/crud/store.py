@@ -27,9 +27,11 @@ class CRUDStore(CRUDBase[Store, StoreCreate, StoreUpdate]):
 
         return StoreDB.parse_obj(store_dict)
 
-    async def get_all_with_country(self, *, skip: int = 0, limit: int = 100, payload: Dict[str, Any] = {}, admin_id: Optional[UUID] = None) -> List[StoreDB]:
+    async def get_all_with_country(self, *, skip: int = 0, limit: int = 100, payload: Dict[str, Any] = {}, admin_id: Optional[UUID] = None) -> List[Store]:
         """
-        Retrieve all stores with country information.
+        Retrieve all stores with country, admin and contacts prefetched.
+
+        Devuelve instancias ORM; el router las serializa directamente.
         """
         query = Store.filter(**payload).prefetch_related(
             'admin', 
@@ -40,15 +42,7 @@ class CRUDStore(CRUDBase[Store, StoreCreate, StoreUpdate]):
         if admin_id:
             query = query.filter(admin_id=admin_id)
         
-        stores = await query
-        
-        # Convertir contacts de ReverseRelation a lista para cada store
-        for store in stores:
-            if store.contacts:
-                contacts_list = await store.contacts.all()
-                store.__dict__['contacts'] = contacts_list
-        
-        return [StoreDB.from_orm(store) for store in stores]
+        return await query
 
 
 crud_store = CRUDStore(model=Store)
@@ -1,12 +1,23 @@
-from typing import Any, Dict, List, Optional
+import logging
+from typing import Any, Dict, List, Optional, Sequence
 
 from tortoise.expressions import Q
 
 from app.infra.postgres.crud.base import CRUDBase
-from app.infra.postgres.models import Store, User
+from app.infra.postgres.models import Store, StoreContact, User
 from app.schemas.user import UserCreate, UserUpdate
 from uuid import UUID
 
+logger = logging.getLogger(__name__)
+
+# Relaciones que se pueden rehidratar en la respuesta de un update (?expand=)
+USER_EXPANSIONS = {
+    "role": "role",
+    "city": "city__region__country",
+    "store": "store__contacts__account_type",
+}
+
+
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Obtiene un usuario por ID con todas sus relaciones cargadas."""
@@ -16,17 +27,15 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
             'store__contacts__account_type'
         ).first()
 
-        if user and user.store:
-            # Obtener la lista de contacts
-            contacts_list = await user.store.contacts.all()
-
-            print(f"Store found: {user.store.nombre}")
-            print(f"Number of contacts: {len(contacts_list)}")
-
-            # SOLUCIÓN: Reemplazar el ReverseRelation con la lista real
-            # Accedemos directamente al __dict__ del objeto
-            user.store.__dict__['contacts'] = contacts_list
-            print(f"After replacement - Type: {type(user.store.__dict__['contacts'])}")
+        # Los contactos ya vienen del prefetch (store__contacts__account_type);
+        # StoreOut convierte el ReverseRelation en lista
+        if user and user.store and logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Usuario %s: tienda %s con %d contactos",
+                user_id,
+                user.store.id,
+                len(user.store.contacts.related_objects),
+            )
 
         return user
 
@@ -74,11 +83,24 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
 
     async def create(self, *, obj_in: UserCreate) -> User:
         """
-        Crea un nuevo usuario y devuelve la instancia con las relaciones precargadas.
+        Crea un nuevo usuario y devuelve la instancia con las relaciones de UserOut.
+
+        Tras el INSERT se hace una sola lectura con JOIN (rol, ciudad/región/país
+        y tienda) y, si hay tienda, otra para sus contactos.
         """
         created_user = await super().create(obj_in=obj_in)
-        # Re-obtenemos el usuario para cargar las relaciones
-        return await self.get(id=created_user.pk)
+        user = (
+            await self.model.filter(user_id=created_user.user_id)
+            .select_related("role", "city__region__country", "store")
+            .first()
+        )
+        if user and user.store:
+            contacts = await StoreContact.filter(store_id=user.store.id).select_related(
+                "account_type"
+            )
+            # Marca la relación inversa como cargada, igual que prefetch_related
+            user.store.contacts._set_result_for_query(contacts)
+        return user
 
     async def update(self, *, id: Any, obj_in: UserUpdate) -> Optional[User]:
         """
@@ -108,6 +130,27 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         # Devolvemos el objeto con todas las relaciones cargadas
         return await self.get_by_id(user_id=id)
         
+    async def update_partial(
+        self, *, id: UUID, obj_in: UserUpdate, expand: Sequence[str] = ()
+    ) -> Optional[User]:
+        """
+        Actualiza solo los campos enviados con un único UPDATE ... RETURNING.
+
+        Las claves foráneas (city_id, role_id, store_id) las valida la base de
+        datos. Las relaciones se cargan solo si se piden en `expand`.
+        """
+        fields_map = self.model._meta.fields_map
+        values = {
+            field: value
+            for field, value in obj_in.dict(exclude_unset=True).items()
+            # Un null explícito en una columna NOT NULL se ignora
+            if value is not None or fields_map[field].null
+        }
+        user = await self.patch(id=id, values=values)
+        if user and expand:
+            await user.fetch_related(*(USER_EXPANSIONS[name] for name in expand))
+        return user
+
     async def get_by_dni(self, *, dni: str) -> Optional[User]:
         """
         Obtiene un usuario por su DNI, con las relaciones 'role', 'city', 'city__region', 'city__region__country' y 'store' precargadas.
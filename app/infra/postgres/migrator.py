@@ -0,0 +1,362 @@
+"""
+Ejecutor de migraciones de `db/migrations`.
+
+Aplica en orden los archivos `.sql` y `.py` que aún no figuran en la tabla
+`schema_migrations` y registra cada uno con su checksum:
+
+- Versión = nombre del archivo sin extensión; orden por el prefijo numérico
+  (`0005_...` < `20250723_...`) y después por nombre.
+- Cada migración va en una transacción junto con su registro. Con la
+  directiva `-- migrate: no-transaction` (o `TRANSACTION = False` en Python)
+  las sentencias se ejecutan una a una en autocommit, como exige
+  `CREATE INDEX CONCURRENTLY`; deben ser idempotentes (IF NOT EXISTS...)
+  porque si algo falla se vuelven a ejecutar todas.
+- Índices: `CREATE INDEX CONCURRENTLY` no bloquea las escrituras en la
+  tabla. Si se interrumpe deja un índice INVALID que IF NOT EXISTS da por
+  creado: bórrelo (`DROP INDEX CONCURRENTLY ...`) y vuelva a ejecutar.
+- `lock_timeout`: un ALTER que espera el bloqueo ACCESS EXCLUSIVE de
+  `payment` o `user` detrás de una transacción larga deja en cola todas las
+  consultas a la tabla. Con lock_timeout se rinde pronto y se reintenta con
+  una espera creciente, en lugar de parar la API.
+- Un archivo ya aplicado cuyo checksum cambia detiene la ejecución.
+- Un advisory lock impide dos ejecuciones a la vez (varios pods o CI).
+
+Las migraciones de datos en Python exponen `async def upgrade(conn)` con una
+conexión asyncpg y usan `backfill` para actualizar tablas grandes por lotes.
+De los archivos con anotaciones de goose solo se aplica la sección `Up`.
+"""
+
+import asyncio
+import hashlib
+import importlib.util
+import logging
+import os
+import re
+from time import perf_counter
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.abspath(
+    os.path.join(os.path.dirname(__file__), "..", "..", "..", "db", "migrations")
+)
+
+# Clave del advisory lock que serializa las ejecuciones
+MIGRATION_LOCK_KEY = 7_310_043
+
+NO_TRANSACTION_DIRECTIVES = ("-- migrate: no-transaction", "-- +goose NO TRANSACTION")
+
+_GOOSE_UP = "-- +goose Up"
+_GOOSE_DOWN = "-- +goose Down"
+_DOLLAR_TAG = re.compile(r"\$[A-Za-z_][A-Za-z0-9_]*\$|\$\$")
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    version     VARCHAR(200) PRIMARY KEY,
+    checksum    CHAR(64)     NOT NULL,
+    applied_at  TIMESTAMPTZ  NOT NULL DEFAULT now(),
+    duration_ms INTEGER      NOT NULL DEFAULT 0,
+    baseline    BOOLEAN      NOT NULL DEFAULT false
+)
+"""
+
+T = TypeVar("T")
+
+
+class MigrationError(Exception):
+    pass
+
+
+class Migration(NamedTuple):
+    version: str
+    path: str
+    checksum: str
+
+    @property
+    def is_python(self) -> bool:
+        return self.path.endswith(".py")
+
+
+def _sort_key(version: str):
+    prefix = version.split("_", 1)[0]
+    return (int(prefix) if prefix.isdigit() else 0, version)
+
+
+def discover(directory: str = MIGRATIONS_DIR) -> List[Migration]:
+    """Migraciones del directorio en orden de aplicación."""
+    migrations = []
+    for name in os.listdir(directory):
+        version, extension = os.path.splitext(name)
+        if extension not in (".sql", ".py") or name.startswith("__"):
+            continue
+        path = os.path.join(directory, name)
+        with open(path, "rb") as file:
+            checksum = hashlib.sha256(file.read()).hexdigest()
+        migrations.append(Migration(version, path, checksum))
+    migrations.sort(key=lambda migration: _sort_key(migration.version))
+    return migrations
+
+
+def _up_section(sql: str) -> str:
+    if _GOOSE_UP not in sql:
+        return sql
+    return sql.split(_GOOSE_UP, 1)[1].split(_GOOSE_DOWN, 1)[0]
+
+
+def _is_blank(statement: str) -> bool:
+    return all(
+        not line.strip() or line.strip().startswith("--")
+        for line in statement.splitlines()
+    )
+
+
+def split_statements(sql: str) -> List[str]:
+    """Separa un script SQL en sentencias respetando comillas, $$ y comentarios."""
+    statements = []
+    start = i = 0
+    quote: Optional[str] = None  # ' o la etiqueta $tag$ abierta
+    while i < len(sql):
+        if quote:
+            end = sql.find(quote, i)
+            i = len(sql) if end == -1 else end + len(quote)
+            quote = None
+            continue
+        char = sql[i]
+        if char == "'":
+            quote = "'"
+        elif sql.startswith("--", i):
+            end = sql.find("\n", i)
+            i = len(sql) if end == -1 else end
+            continue
+        elif sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            i = len(sql) if end == -1 else end + 2
+            continue
+        elif char == "$":
+            match = _DOLLAR_TAG.match(sql, i)
+            if match:
+                quote = match.group(0)
+                i = match.end()
+                continue
+        elif char == ";":
+            statements.append(sql[start:i])
+            start = i + 1
+        i += 1
+    statements.append(sql[start:])
+    return [statement.strip() for statement in statements if not _is_blank(statement)]
+
+
+async def with_lock_retry(
+    operation: Callable[[], Awaitable[T]], *, retries: int = 5, delay: float = 1.0
+) -> T:
+    """Reintenta `operation` si agota `lock_timeout`, con espera exponencial."""
+    attempt = 0
+    while True:
+        try:
+            return await operation()
+        except asyncpg.LockNotAvailableError:
+            if attempt == retries:
+                raise
+            wait = delay * 2**attempt
+            attempt += 1
+            logger.warning(
+                "lock_timeout agotado; reintento %s/%s en %.1f s",
+                attempt,
+                retries,
+                wait,
+            )
+            await asyncio.sleep(wait)
+
+
+async def backfill(
+    conn: asyncpg.Connection,
+    *,
+    table: str,
+    pk: str,
+    set: str,
+    where: str,
+    args: Sequence[Any] = (),
+    batch_size: int = 1000,
+    pause: float = 0.05,
+) -> int:
+    """
+    UPDATE por lotes de `batch_size` filas. En una migración con
+    `TRANSACTION = False` cada lote confirma por separado y bloquea pocas
+    filas durante poco tiempo.
+
+    `set` y `where` pueden usar `$1..$n` de `args`. `where` tiene que dejar de
+    cumplirse tras el UPDATE (p. ej. `col IS NULL`), o el bucle no termina.
+    Devuelve las filas actualizadas.
+    """
+    limit = f"${len(args) + 1}"
+    query = (
+        f'UPDATE "{table}" SET {set} WHERE "{pk}" IN ('
+        f'SELECT "{pk}" FROM "{table}" WHERE ({where}) LIMIT {limit} FOR UPDATE SKIP LOCKED)'
+    )
+    total = 0
+    while True:
+        status = await with_lock_retry(lambda: conn.execute(query, *args, batch_size))
+        updated = int(status.rsplit(" ", 1)[-1])
+        total += updated
+        if not updated:
+            return total
+        logger.info("Backfill %s: %s filas", table, total)
+        await asyncio.sleep(pause)
+
+
+def _load_python(migration: Migration):
+    spec = importlib.util.spec_from_file_location(
+        f"migration_{migration.version}", migration.path
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "upgrade"):
+        raise MigrationError(f"{migration.version}: falta la función upgrade(conn)")
+    return module
+
+
+async def _record(
+    conn: asyncpg.Connection,
+    migration: Migration,
+    duration_ms: int,
+    baseline: bool = False,
+) -> None:
+    await conn.execute(
+        "INSERT INTO schema_migrations (version, checksum, duration_ms, baseline) VALUES ($1, $2, $3, $4)",
+        migration.version,
+        migration.checksum,
+        duration_ms,
+        baseline,
+    )
+
+
+async def _apply(conn: asyncpg.Connection, migration: Migration, retries: int) -> None:
+    started = perf_counter()
+    if migration.is_python:
+        module = _load_python(migration)
+        transactional = getattr(module, "TRANSACTION", True)
+        statements: List[str] = []
+    else:
+        with open(migration.path, encoding="utf-8") as file:
+            sql = file.read()
+        transactional = not any(
+            directive in sql for directive in NO_TRANSACTION_DIRECTIVES
+        )
+        sql = _up_section(sql)
+        statements = [sql] if transactional else split_statements(sql)
+
+    if transactional:
+
+        async def run() -> None:
+            async with conn.transaction():
+                if migration.is_python:
+                    await module.upgrade(conn)
+                else:
+                    await conn.execute(statements[0])
+                await _record(conn, migration, int((perf_counter() - started) * 1000))
+
+        await with_lock_retry(run, retries=retries)
+        return
+
+    if migration.is_python:
+        await module.upgrade(conn)
+    else:
+        for statement in statements:
+            await with_lock_retry(lambda: conn.execute(statement), retries=retries)
+    await _record(conn, migration, int((perf_counter() - started) * 1000))
+
+
+async def applied(conn: asyncpg.Connection) -> Dict[str, str]:
+    """{versión: checksum} de las migraciones registradas."""
+    await conn.execute(CREATE_TABLE)
+    rows = await conn.fetch("SELECT version, checksum FROM schema_migrations")
+    return {row["version"]: row["checksum"] for row in rows}
+
+
+def pending(
+    migrations: List[Migration], done: Dict[str, str], target: Optional[str] = None
+) -> List[Migration]:
+    """Migraciones sin aplicar hasta `target` (incluida); valida los checksums."""
+    changed = [
+        m.version
+        for m in migrations
+        if m.version in done and done[m.version] != m.checksum
+    ]
+    if changed:
+        raise MigrationError(
+            f"Migraciones modificadas después de aplicarse: {', '.join(changed)}"
+        )
+    if target is not None and target not in {m.version for m in migrations}:
+        raise MigrationError(f"Versión desconocida: {target}")
+    result = []
+    for migration in migrations:
+        if migration.version not in done:
+            result.append(migration)
+        if migration.version == target:
+            break
+    return result
+
+
+async def _locked(conn: asyncpg.Connection) -> None:
+    if not await conn.fetchval("SELECT pg_try_advisory_lock($1)", MIGRATION_LOCK_KEY):
+        raise MigrationError("Hay otra ejecución de migraciones en curso")
+
+
+async def migrate(
+    conn: asyncpg.Connection,
+    migrations: List[Migration],
+    *,
+    target: Optional[str] = None,
+    lock_timeout: str = "5s",
+    retries: int = 5,
+    on_applied: Optional[Callable[[Migration, float], None]] = None,
+) -> List[Migration]:
+    """Aplica las migraciones pendientes y devuelve las aplicadas."""
+    await _locked(conn)
+    try:
+        await conn.execute(f"SET lock_timeout = '{lock_timeout}'")
+        await conn.execute("SET statement_timeout = 0")
+        todo = pending(migrations, await applied(conn), target)
+        for migration in todo:
+            started = perf_counter()
+            try:
+                await _apply(conn, migration, retries)
+            except Exception as e:
+                raise MigrationError(f"{migration.version}: {e}") from e
+            if on_applied:
+                on_applied(migration, perf_counter() - started)
+        return todo
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+
+async def baseline(
+    conn: asyncpg.Connection, migrations: List[Migration], target: Optional[str] = None
+) -> List[Migration]:
+    """
+    Registra como aplicadas, sin ejecutarlas, las migraciones hasta `target`
+    (todas si es None): para bases creadas con `db/create.sql` o que ya tenían
+    los cambios aplicados a mano.
+    """
+    await _locked(conn)
+    try:
+        done = await applied(conn)
+        todo = pending(migrations, done, target)
+        async with conn.transaction():
+            for migration in todo:
+                await _record(conn, migration, 0, baseline=True)
+        return todo
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
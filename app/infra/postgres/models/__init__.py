@@ -1,9 +1,11 @@
 from app.infra.postgres.models.account_type import AccountType
+from app.infra.postgres.models.asset import Asset
 from app.infra.postgres.models.action import Action
 from app.infra.postgres.models.authentication import Authentication
 from app.infra.postgres.models.city import City
 from app.infra.postgres.models.configuration import Configuration
 from app.infra.postgres.models.country import Country
+from app.infra.postgres.models.deletion_job import DeletionJob
 from app.infra.postgres.models.device import Device
 from app.infra.postgres.models.enrolment import Enrolment
 from app.infra.postgres.models.factory_reset_protection import FactoryResetProtection
@@ -14,6 +16,7 @@ from app.infra.postgres.models.role import Role
 from app.infra.postgres.models.sim import Sim
 from app.infra.postgres.models.store import Store
 from app.infra.postgres.models.store_contact import StoreContact
+from app.infra.postgres.models.store_token import StoreTokenLedger, StoreTokenShard
 from app.infra.postgres.models.television import Television
 from app.infra.postgres.models.user import User
 
@@ -22,6 +25,7 @@ __all__ = [
     "City",
     "Configuration",
     "Country",
+    "DeletionJob",
     "Device",
     "Enrolment",
     "Location",
@@ -37,4 +41,7 @@ __all__ = [
     "Television",
     "AccountType",
     "StoreContact",
+    "StoreTokenLedger",
+    "StoreTokenShard",
+    "Asset",
 ]
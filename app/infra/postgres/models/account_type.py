@@ -1,6 +1,6 @@
 from tortoise import fields
 from enum import Enum
-from app.infra.postgres.models.base import TimestampedModel
+from app.infra.postgres.models.base import SoftDeleteManager, TimestampedModel
 
 # Define the Enum for the category. This must be consistent with the DB migration.
 class AccountCategoryEnum(str, Enum):
@@ -38,6 +38,7 @@ class AccountType(TimestampedModel):
 
     class Meta:
         table = "account_types"
+        manager = SoftDeleteManager()
 
     def __str__(self):
         return self.name
\ No newline at end of file
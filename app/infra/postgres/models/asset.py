@@ -0,0 +1,50 @@
+from enum import Enum
+
+from tortoise import fields
+from tortoise.exceptions import OperationalError
+from tortoise.manager import Manager
+from tortoise.models import Model
+
+from app.infra.postgres.models.base import SoftDeleteManager
+
+
+class AssetKind(str, Enum):
+    DEVICE = "device"
+    TELEVISION = "television"
+
+
+class Asset(Model):
+    """
+    Fila del inventario unificado: un dispositivo o un televisor con su tienda,
+    cliente, vendedor, estado y última ubicación.
+
+    Solo lectura: la tabla la mantienen triggers de la base de datos a partir
+    de device, television, enrolment, user y location
+    (db/migrations/20261019_13_asset.sql).
+    """
+
+    asset_id = fields.UUIDField(pk=True)  # device_id o television_id
+    kind = fields.CharEnumField(AssetKind, max_length=10)
+    enrolment_id = fields.UUIDField()
+    store_id = fields.UUIDField(null=True)  # tienda del vendedor (o del cliente)
+    customer_id = fields.UUIDField(null=True)
+    vendor_id = fields.UUIDField(null=True)
+    state = fields.CharField(max_length=20)
+    last_seen_at = fields.DatetimeField(null=True)
+    created_at = fields.DatetimeField()
+    deleted_at = fields.DatetimeField(null=True)
+
+    all_objects = Manager()
+
+    class Meta:
+        table = "asset"
+        manager = SoftDeleteManager()
+
+    async def save(self, *args, **kwargs) -> None:
+        raise OperationalError("asset es de solo lectura: la mantienen los triggers")
+
+    async def delete(self, *args, **kwargs) -> None:
+        raise OperationalError("asset es de solo lectura: la mantienen los triggers")
+
+    def __str__(self):
+        return f"{self.kind}:{self.asset_id}"
@@ -1,10 +1,29 @@
 from tortoise import fields
+from tortoise.manager import Manager
 from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+
+class SoftDeleteManager(Manager):
+    """
+    Manager por defecto de los modelos con borrado lógico.
+
+    `Model.filter/all/get/...` y las precargas de relaciones solo ven filas con
+    `deleted_at IS NULL`; `Model.all_objects` consulta la tabla completa.
+    """
+
+    def get_queryset(self) -> QuerySet:
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
 
 class TimestampedModel(Model):
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
     deleted_at = fields.DatetimeField(null=True)
 
+    # El manager de `Meta` no se hereda: cada subclase declara
+    # `manager = SoftDeleteManager()` en su propia `Meta`
+    all_objects = Manager()
+
     class Meta:
         abstract = True
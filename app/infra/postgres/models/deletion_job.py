@@ -0,0 +1,38 @@
+from enum import Enum
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class DeletionEntity(str, Enum):
+    STORE = "store"
+    USER = "user"
+
+
+class DeletionJobState(str, Enum):
+    PENDING = "Pending"
+    RUNNING = "Running"
+    COMPLETED = "Completed"
+    FAILED = "Failed"
+
+
+class DeletionJob(Model):
+    """Borrado por lotes de una tienda o un usuario y sus dependientes."""
+
+    job_id = fields.UUIDField(pk=True)
+    entity = fields.CharEnumField(DeletionEntity, max_length=10)
+    entity_id = fields.UUIDField()
+    state = fields.CharEnumField(
+        DeletionJobState, max_length=10, default=DeletionJobState.PENDING
+    )
+    step = fields.CharField(max_length=40, null=True)
+    progress = fields.JSONField(default=dict)  # filas procesadas por paso
+    processed = fields.BigIntField(default=0)
+    error = fields.TextField(null=True)
+    created_at = fields.DatetimeField(auto_now_add=True)
+    updated_at = fields.DatetimeField(auto_now=True)
+    started_at = fields.DatetimeField(null=True)
+    finished_at = fields.DatetimeField(null=True)
+
+    class Meta:
+        table = "deletion_job"
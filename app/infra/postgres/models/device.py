@@ -1,8 +1,11 @@
 from enum import Enum
 
 from tortoise import fields
+from tortoise.manager import Manager
 from tortoise.models import Model
 
+from app.infra.postgres.models.base import SoftDeleteManager
+
 
 class DeviceState(str, Enum):
     ACTIVE = "Active"
@@ -22,9 +25,13 @@ class Device(Model):
     state = fields.CharEnumField(DeviceState, default=DeviceState.ACTIVE)
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
+    deleted_at = fields.DatetimeField(null=True)
+
+    all_objects = Manager()
 
     class Meta:
         table = "device"
+        manager = SoftDeleteManager()
 
     def __str__(self):
         return self.name
@@ -1,6 +1,9 @@
 from tortoise import fields
+from tortoise.manager import Manager
 from tortoise.models import Model
 
+from app.infra.postgres.models.base import SoftDeleteManager
+
 
 class Enrolment(Model):
     enrolment_id = fields.UUIDField(pk=True)
@@ -8,9 +11,13 @@ class Enrolment(Model):
     vendor = fields.ForeignKeyField("models.User", related_name="vendor_enrolments")
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
+    deleted_at = fields.DatetimeField(null=True)
+
+    all_objects = Manager()
 
     class Meta:
         table = "enrolment"
+        manager = SoftDeleteManager()
 
     def __str__(self):
         return f"Enrolment {self.enrolment_id}"
@@ -1,9 +1,12 @@
 from enum import Enum
 
 from tortoise import fields
+from tortoise.manager import Manager
 from tortoise.models import Model
 from tortoise.fields import ReverseRelation
 
+from app.infra.postgres.models.base import SoftDeleteManager
+
 class PaymentState(str, Enum):
     PENDING = "Pending"
     APPROVED = "Approved"
@@ -40,9 +43,14 @@ class Plan(Model):
     period = fields.IntField(null=True, description="Periodo en días")
     value = fields.DecimalField(max_digits=10, decimal_places=2)
     contract = fields.CharField(max_length=80)
+    updated_at = fields.DatetimeField(auto_now=True)
+    deleted_at = fields.DatetimeField(null=True)
+
+    all_objects = Manager()
 
     class Meta:
         table = "plan"
+        manager = SoftDeleteManager()
 
 
 class Payment(Model):
@@ -70,6 +78,13 @@ class Payment(Model):
     state = fields.CharEnumField(PaymentState)
     date = fields.DatetimeField()
     reference = fields.CharField(max_length=80)
+    updated_at = fields.DatetimeField(auto_now=True)
+    deleted_at = fields.DatetimeField(null=True)
+
+    all_objects = Manager()
 
     class Meta:
         table = "payment"
+        manager = SoftDeleteManager()
+        # Idempotencia de la ingesta: la referencia de la pasarela es única por plan
+        unique_together = (("plan", "reference"),)
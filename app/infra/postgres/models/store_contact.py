@@ -1,6 +1,6 @@
 import uuid
 from tortoise import fields
-from app.infra.postgres.models.base import TimestampedModel
+from app.infra.postgres.models.base import SoftDeleteManager, TimestampedModel
 
 class StoreContact(TimestampedModel):
     id = fields.UUIDField(pk=True, default=uuid.uuid4)
@@ -11,6 +11,7 @@ class StoreContact(TimestampedModel):
 
     class Meta:
         table = "store_contact"
+        manager = SoftDeleteManager()
 
     def __str__(self):
         return f"{self.store} - {self.account_type}"
\ No newline at end of file
@@ -0,0 +1,53 @@
+from enum import Enum
+
+from tortoise import fields
+from tortoise.models import Model
+
+
+class TokenReason(str, Enum):
+    OPENING = "opening"  # saldo inicial de la tienda
+    CONSUME = "consume"
+    CREDIT = "credit"
+    ADJUSTMENT = "adjustment"  # saldo fijado a mano (PATCH /stores/{id})
+    RESHARD = "reshard"  # reparto entre contadores; no cambia el saldo
+
+
+class StoreTokenLedger(Model):
+    """
+    Movimiento de tokens de una tienda. Solo se insertan filas (un trigger
+    impide modificarlas): la suma de `delta` es el saldo de la tienda.
+    """
+
+    entry_id = fields.UUIDField(pk=True)
+    store = fields.ForeignKeyField(
+        "models.Store", related_name="token_ledger", on_delete=fields.CASCADE
+    )
+    delta = fields.IntField()
+    reason = fields.CharEnumField(TokenReason, max_length=20)
+    reference = fields.CharField(max_length=80, null=True)  # p. ej. el enrolment
+    shard = fields.SmallIntField(
+        null=True
+    )  # contador afectado si la tienda está repartida
+    balance_after = fields.IntField(null=True)  # saldo del contador afectado
+    created_at = fields.DatetimeField(auto_now_add=True)
+
+    class Meta:
+        table = "store_token_ledger"
+
+
+class StoreTokenShard(Model):
+    """
+    Contador parcial de tokens de una tienda muy concurrida. Con contadores,
+    el saldo es `store.tokens_disponibles` más la suma de los contadores.
+    """
+
+    id = fields.IntField(pk=True)
+    store = fields.ForeignKeyField(
+        "models.Store", related_name="token_shards", on_delete=fields.CASCADE
+    )
+    shard = fields.SmallIntField()
+    tokens = fields.IntField(default=0)
+
+    class Meta:
+        table = "store_token_shard"
+        unique_together = (("store", "shard"),)
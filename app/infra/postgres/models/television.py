@@ -1,8 +1,11 @@
 from enum import Enum
 
 from tortoise import fields
+from tortoise.manager import Manager
 from tortoise.models import Model
 
+from app.infra.postgres.models.base import SoftDeleteManager
+
 
 class TelevisionState(str, Enum):
     ACTIVE = "Active"
@@ -21,9 +24,13 @@ class Television(Model):
     state = fields.CharEnumField(TelevisionState, default=TelevisionState.ACTIVE)
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
+    deleted_at = fields.DatetimeField(null=True)
+
+    all_objects = Manager()
 
     class Meta:
         table = "television"
+        manager = SoftDeleteManager()
 
     def __str__(self):
         return self.name
@@ -1,8 +1,11 @@
 from enum import Enum
 
 from tortoise import fields
+from tortoise.manager import Manager
 from tortoise.models import Model
 
+from app.infra.postgres.models.base import SoftDeleteManager
+
 
 class UserState(str, Enum):
     ACTIVE = "Active"
@@ -32,9 +35,13 @@ class User(Model):
     state = fields.CharEnumField(UserState, default=UserState.ACTIVE)
     created_at = fields.DatetimeField(auto_now_add=True)
     updated_at = fields.DatetimeField(auto_now=True)
+    deleted_at = fields.DatetimeField(null=True)
+
+    all_objects = Manager()
 
     class Meta:
         table = "user"
+        manager = SoftDeleteManager()
 
     def __str__(self):
         return f"{self.first_name} {self.last_name}"
@@ -0,0 +1,89 @@
+"""
+Paginación por cursor (keyset) para listados ordenados por fecha de alta.
+
+Con `offset` la base de datos recorre y descarta todas las filas anteriores,
+y un alta entre dos páginas desplaza los resultados. El cursor guarda la
+última fila devuelta, `(created_at, id)`, y la página siguiente empieza justo
+detrás:
+
+    WHERE (created_at, id) < (:created_at, :id) ORDER BY created_at DESC, id DESC
+
+La condición se emite como comparación de filas (`RowBefore`) y no como
+`created_at < x OR (created_at = x AND id < y)`: solo la primera es un límite
+del índice `(created_at DESC, id DESC)` y cada página empieza en el cursor.
+
+Para el cliente el cursor es una cadena opaca (`encode_cursor`); la parte
+HTTP (parámetros y cabecera) está en `app.api.pagination`.
+"""
+
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple, Type
+from uuid import UUID
+
+from pypika import Table
+from pypika.terms import Tuple as Row
+from tortoise.expressions import Q
+from tortoise.models import Model
+from tortoise.query_utils import QueryModifier
+from tortoise.queryset import QuerySet
+
+Cursor = Tuple[datetime, UUID]
+
+
+class CursorError(ValueError):
+    pass
+
+
+def encode_cursor(created_at: datetime, id: Any) -> str:
+    raw = f"{created_at.isoformat()}|{id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Cursor:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except ValueError:
+        raise CursorError("Cursor no válido")
+
+
+class RowBefore(Q):
+    """Filtro `(field, pk) < (valor, valor)` para `QuerySet.filter`."""
+
+    def __init__(self, field: str, pk: str, cursor: Cursor) -> None:
+        super().__init__()
+        self.row = (field, pk)
+        self.cursor = cursor
+
+    def resolve(self, model: Type[Model], table: Table) -> QueryModifier:
+        meta = model._meta
+        columns = Row(*(table[meta.fields_db_projection[name]] for name in self.row))
+        # Mismo codificador que los filtros de Tortoise
+        to_db = meta.db.executor_class._field_to_db
+        values = Row(
+            *(
+                to_db(meta.fields_map[name], value, model)
+                for name, value in zip(self.row, self.cursor)
+            )
+        )
+        return QueryModifier(where_criterion=columns < values)
+
+
+async def paginate(
+    query: QuerySet,
+    pk: str,
+    *,
+    after: Optional[Cursor],
+    limit: int,
+    field: str = "created_at",
+) -> List[Any]:
+    """
+    Página de `query` en orden (`field` DESC, `pk` DESC) a partir de `after`.
+    Trae una fila de más para saber si hay otra página (ver
+    `app.api.pagination.with_next_cursor`).
+    """
+    if after is not None:
+        query = query.filter(RowBefore(field, pk, after))
+    return await query.order_by(f"-{field}", f"-{pk}").limit(limit + 1)
@@ -0,0 +1,250 @@
+"""
+Proyecciones dispersas (`?fields=` / `?expand=`) para los endpoints pesados.
+
+Una `ResponseShape` une un esquema de respuesta de Pydantic con su modelo de
+Tortoise: los campos escalares del esquema que existen como columnas son
+seleccionables y los campos anidados son relaciones expandibles. A partir de
+ella, `ResponseShape.project(fields, expand)` construye una `Projection` que
+carga filas planas con `QuerySet.values()` (las FK se resuelven con JOIN en la
+misma consulta) y las relaciones inversas con una consulta extra por relación.
+
+Ejemplo: `?fields=payment_id,value,date&expand=plan.user` selecciona solo
+esas tres columnas del pago y las columnas del usuario del plan.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Type
+
+from pydantic import BaseModel
+from pydantic.fields import ModelField
+from tortoise.fields.relational import BackwardFKRelation, ForeignKeyFieldInstance
+from tortoise.models import Model
+from tortoise.queryset import QuerySet
+
+
+class ProjectionError(ValueError):
+    """`fields` o `expand` hacen referencia a algo que la respuesta no expone."""
+
+
+def _nested_schema(field: ModelField) -> Optional[Type[BaseModel]]:
+    """Devuelve el esquema anidado de un campo (también dentro de Optional/List/Union)."""
+    candidates = [field.type_, *(sub.type_ for sub in field.sub_fields or ())]
+    for candidate in candidates:
+        if isinstance(candidate, type) and issubclass(candidate, BaseModel):
+            return candidate
+    return None
+
+
+def _split(value: Optional[str]) -> List[str]:
+    if not value:
+        return []
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class _Node:
+    """Nodo del árbol de proyección: un modelo, sus columnas y sus relaciones."""
+
+    def __init__(
+        self,
+        shape: "ResponseShape",
+        model: Type[Model],
+        schema: Type[BaseModel],
+        *,
+        many: bool = False,
+        relation_field: Optional[str] = None,
+    ) -> None:
+        self.shape = shape
+        self.model = model
+        self.schema = schema
+        self.many = many
+        self.relation_field = relation_field
+        self.pk = model._meta.pk_attr
+        self.fields: List[str] = []
+        self.children: Dict[str, "_Node"] = {}
+
+    # --- construcción -----------------------------------------------------
+
+    def selectable(self) -> List[str]:
+        columns = self.model._meta.fields_db_projection
+        return [
+            name
+            for name, field in self.schema.__fields__.items()
+            if name in columns
+            and name not in self.shape.exclude
+            and _nested_schema(field) is None
+        ]
+
+    def child(self, name: str, path: str) -> "_Node":
+        if name in self.children:
+            return self.children[name]
+        schema_field = self.schema.__fields__.get(name)
+        nested = _nested_schema(schema_field) if schema_field else None
+        relation = self.model._meta.fields_map.get(name)
+        if nested is None or not isinstance(
+            relation, (ForeignKeyFieldInstance, BackwardFKRelation)
+        ):
+            raise ProjectionError(f"No se puede expandir '{path}'")
+        if isinstance(relation, BackwardFKRelation):
+            node = _Node(
+                self.shape,
+                relation.related_model,
+                nested,
+                many=True,
+                relation_field=relation.relation_field,
+            )
+        else:
+            node = _Node(self.shape, relation.related_model, nested)
+        self.children[name] = node
+        return node
+
+    def add_field(self, name: str, path: str) -> None:
+        if name not in self.selectable():
+            raise ProjectionError(f"Campo desconocido '{path}'")
+        if name not in self.fields:
+            self.fields.append(name)
+
+    def complete(self) -> None:
+        """Los nodos sin campos explícitos devuelven todas sus columnas."""
+        if not self.fields:
+            self.fields = self.selectable()
+        for node in self.children.values():
+            node.complete()
+
+    # --- carga -------------------------------------------------------------
+
+    def columns(self, prefix: str = "") -> List[str]:
+        """Columnas para `values()`: las propias y las de las FK expandidas."""
+        names = [self.pk, *self.fields]
+        if self.relation_field and not prefix:
+            names.append(self.relation_field)
+        result = [prefix + name for name in dict.fromkeys(names)]
+        for name, node in self.children.items():
+            if not node.many:
+                result.extend(node.columns(f"{prefix}{name}__"))
+        return result
+
+    def nest(self, row: Dict[str, Any], prefix: str = "") -> Optional[Dict[str, Any]]:
+        """Convierte una fila plana de `values()` en diccionarios anidados."""
+        if prefix and row.get(prefix + self.pk) is None:
+            # LEFT JOIN sin fila relacionada: la relación es nula
+            return None
+        item = {name: row[prefix + name] for name in self.fields}
+        for name, node in self.children.items():
+            if not node.many:
+                item[name] = node.nest(row, f"{prefix}{name}__")
+        return item
+
+    def converters(self, columns: List[str]) -> List[Tuple[str, Callable[[Any], Any]]]:
+        """Conversores a Python por columna que respetan los NULL de los LEFT JOIN."""
+        result = []
+        for column in columns:
+            model = self.model
+            *relations, name = column.split("__")
+            for relation in relations:
+                model = model._meta.fields_map[relation].related_model
+            if any(name == field for _, field, _ in model._meta.db_native_fields):
+                continue
+            to_python = model._meta.fields_map[name].to_python_value
+            result.append((column, to_python))
+        return result
+
+    async def load(self, queryset: QuerySet) -> List[Dict[str, Any]]:
+        columns = self.columns()
+        # `values()` valida las columnas NOT NULL de las relaciones aunque el
+        # LEFT JOIN no encuentre fila, así que se ejecuta el SQL y se convierte aquí
+        sql = queryset.values(*columns).sql()
+        raw = await queryset._choose_db().execute_query_dict(sql)
+        converters = self.converters(columns)
+        for row in raw:
+            for column, to_python in converters:
+                value = row[column]
+                if value is not None:
+                    row[column] = to_python(value)
+        items = [self.nest(row) for row in raw]
+        await self.load_many(raw, items)
+        if self.relation_field:
+            for row, item in zip(raw, items):
+                item["__parent"] = row[self.relation_field]
+        return items
+
+    async def load_many(
+        self,
+        raw: List[Dict[str, Any]],
+        items: List[Optional[Dict[str, Any]]],
+        prefix: str = "",
+    ) -> None:
+        """Carga las relaciones inversas con una consulta por relación, agrupando por FK."""
+        for name, node in self.children.items():
+            if not node.many:
+                await node.load_many(
+                    raw,
+                    [item[name] if item else None for item in items],
+                    f"{prefix}{name}__",
+                )
+                continue
+            parents = {}
+            for row, item in zip(raw, items):
+                if item is not None:
+                    parents.setdefault(row[prefix + self.pk], []).append(item)
+            for group in parents.values():
+                for item in group:
+                    item[name] = []
+            if not parents:
+                continue
+            children = await node.load(
+                node.model.filter(**{f"{node.relation_field}__in": list(parents)})
+            )
+            for child in children:
+                for item in parents.get(child.pop("__parent"), ()):
+                    item[name].append(child)
+
+
+class Projection:
+    """Selección validada de campos y relaciones para una consulta concreta."""
+
+    def __init__(self, root: _Node) -> None:
+        self.root = root
+
+    async def fetch(self, queryset: QuerySet) -> List[Dict[str, Any]]:
+        """Ejecuta la consulta (con sus filtros, orden y paginación) proyectada."""
+        return await self.root.load(queryset)
+
+    async def fetch_one(self, queryset: QuerySet) -> Optional[Dict[str, Any]]:
+        rows = await self.fetch(queryset.limit(1))
+        return rows[0] if rows else None
+
+
+class ResponseShape:
+    """Forma de respuesta de un endpoint: esquema de salida + modelo de origen."""
+
+    def __init__(
+        self,
+        schema: Type[BaseModel],
+        model: Type[Model],
+        *,
+        exclude: Iterable[str] = ("password",),
+    ) -> None:
+        self.schema = schema
+        self.model = model
+        self.exclude: Set[str] = set(exclude)
+
+    def project(self, fields: Optional[str], expand: Optional[str]) -> Projection:
+        """
+        Construye la proyección a partir de los parámetros de la petición.
+
+        `fields` admite rutas con punto (`plan.value`), que expanden
+        implícitamente la relación. Las relaciones expandidas sin campos
+        explícitos devuelven todas sus columnas.
+        """
+        root = _Node(self, self.model, self.schema)
+        for path in _split(expand):
+            node = root
+            for name in path.split("."):
+                node = node.child(name, path)
+        for path in _split(fields):
+            *relations, name = path.split(".")
+            node = root
+            for relation in relations:
+                node = node.child(relation, path)
+            node.add_field(name, path)
+        root.complete()
+        return Projection(root)
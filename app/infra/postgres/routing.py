@@ -0,0 +1,84 @@
+"""
+Enrutado de lecturas a la réplica de PostgreSQL.
+
+Las lecturas solo van a la conexión "replica" cuando el código lo pide
+explícitamente con `replica_reads()` (como contexto o decorador) y la réplica
+está configurada. Las escrituras y todo lo que ocurre dentro de una
+transacción siguen en la conexión principal, así que un endpoint que lee lo
+que acaba de escribir no ve datos desfasados.
+
+    @router.get("/")
+    @replica_reads
+    async def get_all_devices(...):
+        ...
+"""
+
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Optional, Type, TypeVar
+
+from tortoise.backends.base.client import BaseDBAsyncClient, BaseTransactionWrapper
+from tortoise.connection import connections
+from tortoise.models import Model
+from tortoise.router import router
+
+REPLICA_CONNECTION = "replica"
+
+_use_replica: ContextVar[bool] = ContextVar("use_replica", default=False)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+class ReplicaRouter:
+    """Router de Tortoise: lecturas marcadas → réplica, el resto → principal."""
+
+    def db_for_read(self, model: Type[Model]) -> Optional[str]:
+        if not _use_replica.get():
+            return None
+        if isinstance(
+            connections.get(model._meta.default_connection), BaseTransactionWrapper
+        ):
+            return None
+        return REPLICA_CONNECTION
+
+    def db_for_write(self, model: Type[Model]) -> Optional[str]:
+        return None
+
+
+class _ReplicaReads:
+    """Contexto/decorador que envía las lecturas de Tortoise a la réplica."""
+
+    def __enter__(self) -> None:
+        self._token = _use_replica.set(True)
+
+    def __exit__(self, *exc: Any) -> None:
+        _use_replica.reset(self._token)
+
+    def __call__(self, func: F) -> F:
+        @wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with _ReplicaReads():
+                return await func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+
+def replica_reads(func: Optional[F] = None) -> Any:
+    """
+    Marca un bloque o una corrutina como de solo lectura apta para la réplica.
+
+    Uso: `with replica_reads(): ...` o `@replica_reads` sobre una función async.
+    Sin réplica configurada no tiene efecto.
+    """
+    reads = _ReplicaReads()
+    if func is not None:
+        return reads(func)
+    return reads
+
+
+def read_connection(model: Type[Model]) -> BaseDBAsyncClient:
+    """
+    Conexión de lectura de `model` para SQL directo: la réplica dentro de
+    `replica_reads()` (si está configurada), si no la principal.
+    """
+    return router.db_for_read(model) or connections.get(model._meta.default_connection)
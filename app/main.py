@@ -1,9 +1,25 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from tortoise.exceptions import DBConnectionError
 
 from app.api.api import api_router
+from app.api.pagination import NEXT_CURSOR_HEADER
+from app.api.routers import metrics_router
+from app.core import lifecycle
+from app.core.compression import CompressionMiddleware
 from app.core.config import settings
 from app.core.database import init_db
+from app.core.instrumentation import QueryInstrumentationMiddleware
+from app.core.logging import RequestIdMiddleware, setup_logging, shutdown_logging
+from app.core.metrics import (
+    MetricsMiddleware,
+    start_event_loop_monitor,
+    stop_event_loop_monitor,
+)
+from app.core.security import shutdown_process_pool
+from app.services.deletion_job import start_deletion_worker, stop_deletion_worker
+from app.services.purge import start_purge_job, stop_purge_job
 
 app = FastAPI(
     title=settings.WEP_APP_TITLE,
@@ -17,11 +33,49 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", NEXT_CURSOR_HEADER],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
+if settings.QUERY_INSTRUMENTATION:
+    app.add_middleware(QueryInstrumentationMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    app.include_router(metrics_router)
+
+# El más externo: el request_id debe existir antes de cualquier otro registro
+app.add_middleware(RequestIdMiddleware)
+
 app.include_router(api_router, prefix="/api/v1")
 
 
+@app.exception_handler(DBConnectionError)
+async def db_connection_error_handler(request: Request, exc: DBConnectionError):
+    # Pool agotado o base de datos inaccesible: el cliente puede reintentar
+    return JSONResponse(
+        status_code=503, content={"detail": str(exc)}, headers={"Retry-After": "1"}
+    )
+
+
 @app.on_event("startup")
 async def startup_event():
+    setup_logging()
     await init_db()
+    if settings.METRICS_ENABLED:
+        start_event_loop_monitor(settings.METRICS_LOOP_LAG_INTERVAL)
+    start_purge_job(settings.PURGE_INTERVAL)
+    start_deletion_worker(settings.DELETION_JOB_POLL_INTERVAL)
+    await lifecycle.start(app)
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    lifecycle.stop()
+    stop_purge_job()
+    stop_deletion_worker()
+    stop_event_loop_monitor()
+    shutdown_process_pool()
+    shutdown_logging()
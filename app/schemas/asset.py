@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+from app.infra.postgres.models.asset import AssetKind
+
+
+class AssetResponse(BaseModel):
+    asset_id: UUID
+    kind: AssetKind
+    enrolment_id: UUID
+    store_id: Optional[UUID] = None
+    customer_id: Optional[UUID] = None
+    vendor_id: Optional[UUID] = None
+    state: str
+    last_seen_at: Optional[datetime] = None
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Dict, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.infra.postgres.models.deletion_job import DeletionEntity, DeletionJobState
+
+
+class DeletionJobCreate(BaseModel):
+    entity: DeletionEntity = Field(..., description="Tipo de registro a borrar")
+    entity_id: UUID = Field(..., description="ID de la tienda o del usuario")
+
+
+class DeletionJobOut(BaseModel):
+    job_id: UUID
+    entity: DeletionEntity
+    entity_id: UUID
+    state: DeletionJobState
+    step: Optional[str] = Field(None, description="Paso en curso")
+    progress: Dict[str, int] = Field(
+        default_factory=dict, description="Filas procesadas por paso"
+    )
+    processed: int
+    error: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        orm_mode = True
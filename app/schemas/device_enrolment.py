@@ -0,0 +1,58 @@
+from datetime import date
+from decimal import Decimal
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.schemas.configuration import ConfigurationDB
+from app.schemas.device import DeviceBase, DeviceDB
+from app.schemas.enrolment import EnrolmentDB
+from app.schemas.payment import PlanDB
+from app.schemas.sim import Sim
+from app.schemas.store_token import TokenLedgerEntry
+
+
+class EnrolmentSim(BaseModel):
+    icc_id: str = Field(..., max_length=30, description="ICC ID of the SIM card")
+    slot_index: str = Field(
+        ..., max_length=10, description="Slot index where the SIM is inserted"
+    )
+    operator: str = Field(..., max_length=50, description="Mobile network operator")
+    number: str = Field(..., max_length=20, description="Phone number of the SIM card")
+    state: str = Field(
+        "Active", max_length=20, description="Current state of the SIM card"
+    )
+
+
+class EnrolmentPlan(BaseModel):
+    initial_date: date
+    value: Decimal
+    quotas: int
+    period: Optional[int] = None
+    contract: str
+
+
+class DeviceEnrolmentCreate(BaseModel):
+    user_id: UUID = Field(..., description="Cliente")
+    vendor_id: UUID = Field(..., description="Vendedor")
+    device: DeviceBase
+    sims: List[EnrolmentSim] = Field(default_factory=list, max_items=4)
+    plan: Optional[EnrolmentPlan] = None
+    store_id: Optional[UUID] = Field(
+        None, description="Tienda que paga los tokens. Por defecto la del vendedor"
+    )
+    tokens: int = Field(1, ge=0, description="Tokens a consumir (0 = ninguno)")
+
+
+class DeviceEnrolmentResponse(BaseModel):
+    enrolment: EnrolmentDB
+    device: DeviceDB
+    sims: List[Sim] = Field(default_factory=list)
+    plan: Optional[PlanDB] = None
+    token_entries: List[TokenLedgerEntry] = Field(
+        default_factory=list, description="Movimientos de tokens registrados"
+    )
+    configurations: List[ConfigurationDB] = Field(
+        default_factory=list, description="Configuración de la tienda"
+    )
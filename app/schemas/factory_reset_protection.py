@@ -1,5 +1,5 @@
 from enum import Enum
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel
@@ -36,3 +36,20 @@ class FactoryResetProtectionInDB(FactoryResetProtectionBase):
 
 class FactoryResetProtectionResponse(FactoryResetProtectionInDB):
     pass
+
+
+class FactoryResetProtectionSnapshotItem(BaseModel):
+    account_id: str
+    email: str
+    state: FactoryResetProtectionState
+
+
+class FactoryResetProtectionSnapshot(BaseModel):
+    store_id: UUID
+    version: str
+    accounts: List[FactoryResetProtectionSnapshotItem]
+
+
+class FactoryResetProtectionMembership(BaseModel):
+    account_id: Optional[bool] = None
+    email: Optional[bool] = None
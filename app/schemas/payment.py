@@ -150,3 +150,11 @@ class PaymentResponse(BaseModel):
 
     class Config:
         orm_mode = True
+
+
+class PaymentListItem(PaymentDB):
+    """Forma de GET /payments: columnas del pago con dispositivo, televisor y plan."""
+
+    device: Optional[DeviceDB] = None
+    television: Optional[TelevisionDB] = None
+    plan: Optional[PlanInPaymentResponse] = None
@@ -0,0 +1,21 @@
+from typing import List, Optional
+
+from pydantic import BaseModel
+
+
+class PaymentImportRowError(BaseModel):
+    row: int
+    reference: Optional[str] = None
+    errors: List[str]
+
+
+class PaymentImportReport(BaseModel):
+    total: int
+    created: int
+    duplicates: (
+        int  # ya registrados (mismo plan y referencia) o repetidos en el archivo
+    )
+    failed: int
+    duration_ms: float
+    payments_per_second: float
+    errors: List[PaymentImportRowError] = []
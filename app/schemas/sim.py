@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
@@ -56,3 +56,13 @@ class Sim(SimInDBBase):
 
 class SimInDB(SimInDBBase):
     pass
+
+
+class SimBulkUpsert(BaseModel):
+    sims: List[SimCreate] = Field(..., min_items=1, max_items=500)
+
+
+class SimBulkResult(BaseModel):
+    created: int
+    updated: int
+    sims: List[Sim]
@@ -3,7 +3,7 @@ from typing import List, Optional
 from uuid import UUID
 
 from app.schemas.store_contact import StoreContactDB
-from pydantic import BaseModel, validator
+from pydantic import BaseModel, Field, validator
 from app.schemas.country import CountryDB
 from app.schemas.user import UserDB
 from typing import List 
@@ -21,14 +21,14 @@ class StoreBase(BaseModel):
 
 
 class StoreCreate(StoreBase):
-    pass
+    tokens_disponibles: int = Field(0, ge=0)
 
 
 class StoreUpdate(BaseModel):
     nombre: Optional[str] = None
     country_id: Optional[UUID] = None
     admin_id: Optional[UUID] = None
-    tokens_disponibles: Optional[int] = None
+    tokens_disponibles: Optional[int] = Field(None, ge=0)
     plan: Optional[str] = None
     back_link: Optional[str] = None
     db_link: Optional[str] = None
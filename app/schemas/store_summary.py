@@ -0,0 +1,35 @@
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+
+class AssetCounts(BaseModel):
+    total: int = 0
+    by_state: Dict[str, int] = {}
+
+
+class PaymentTotals(BaseModel):
+    count: int = 0
+    value: Decimal = Decimal("0")
+
+
+class StoreSummary(BaseModel):
+    store_id: UUID
+    devices: AssetCounts
+    televisions: AssetCounts
+    customers: int
+    vendors: int
+    users_by_role: Dict[str, int]
+    active_plans: int = Field(..., description="Planes vivos con cuotas pendientes")
+    overdue_plans: int = Field(
+        ..., description="Planes con menos cuotas aprobadas de las vencidas"
+    )
+    payments_today: PaymentTotals = Field(..., description="Pagos aprobados hoy (UTC)")
+    payments_month: PaymentTotals = Field(
+        ..., description="Pagos aprobados este mes (UTC)"
+    )
+    tokens: int = Field(..., description="Tokens disponibles")
+    generated_at: datetime
@@ -0,0 +1,49 @@
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from app.infra.postgres.models.store_token import TokenReason
+
+
+class TokenAmount(BaseModel):
+    amount: int = Field(..., gt=0, description="Número de tokens")
+    reference: Optional[str] = Field(
+        None,
+        max_length=80,
+        description="Referencia del movimiento (p. ej. ID del enrolamiento)",
+    )
+
+
+class TokenShardConfig(BaseModel):
+    shards: int = Field(
+        ...,
+        ge=0,
+        le=64,
+        description="Contadores entre los que repartir el saldo (0 = uno solo)",
+    )
+
+
+class TokenBalance(BaseModel):
+    store_id: UUID
+    balance: int
+    shards: int = Field(
+        0, description="Contadores repartidos (0 = solo store.tokens_disponibles)"
+    )
+
+
+class TokenLedgerEntry(BaseModel):
+    entry_id: UUID
+    store_id: UUID
+    delta: int
+    reason: TokenReason
+    reference: Optional[str] = None
+    shard: Optional[int] = None
+    balance_after: Optional[int] = Field(
+        None, description="Saldo del contador afectado"
+    )
+    created_at: datetime
+
+    class Config:
+        orm_mode = True
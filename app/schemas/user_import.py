@@ -0,0 +1,56 @@
+from typing import List, Optional
+from uuid import UUID
+
+from pydantic import BaseModel, EmailStr, Field, root_validator
+
+from app.infra.postgres.models.user import UserState
+
+
+class UserImportRow(BaseModel):
+    """Fila de una carga masiva: la ciudad y el rol pueden venir por nombre o por ID."""
+
+    city_id: Optional[UUID] = None
+    city: Optional[str] = None
+    role_id: Optional[UUID] = None
+    role: Optional[str] = None
+    store_id: Optional[UUID] = None
+    dni: str = Field(..., max_length=16)
+    first_name: str = Field(..., max_length=40)
+    middle_name: Optional[str] = Field(None, max_length=40)
+    last_name: str = Field(..., max_length=40)
+    second_last_name: Optional[str] = Field(None, max_length=40)
+    email: EmailStr
+    prefix: str = Field(
+        ...,
+        max_length=4,
+        min_length=1,
+        description="Prefijo telefónico (máximo 4 caracteres)",
+    )
+    phone: str = Field(..., max_length=15)
+    address: str = Field(..., max_length=255)
+    username: str = Field(..., max_length=50)
+    password: str
+    state: UserState = UserState.ACTIVE
+
+    @root_validator(skip_on_failure=True)
+    def check_references(cls, values):
+        if not values.get("city_id") and not values.get("city"):
+            raise ValueError("Se requiere 'city' o 'city_id'")
+        if not values.get("role_id") and not values.get("role"):
+            raise ValueError("Se requiere 'role' o 'role_id'")
+        return values
+
+
+class UserImportRowError(BaseModel):
+    row: int
+    username: Optional[str] = None
+    errors: List[str]
+
+
+class UserImportReport(BaseModel):
+    total: int
+    created: int
+    failed: int
+    duration_ms: float
+    users_per_minute: float
+    errors: List[UserImportRowError] = []
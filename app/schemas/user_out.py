@@ -1,3 +1,4 @@
+import logging
 from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
@@ -7,6 +8,8 @@ from tortoise.fields.relational import ReverseRelation
 
 from app.schemas.store_contact import StoreContactDB
 
+logger = logging.getLogger(__name__)
+
 
 class CountryOut(BaseModel):
     country_id: UUID
@@ -58,8 +61,6 @@ class StoreOut(BaseModel):
     @validator('contacts', pre=True, always=True)
     def resolve_contacts(cls, v):
         """Convierte ReverseRelation a lista."""
-        print(f"DEBUG contacts validator - Type: {type(v)}, Value: {v}")
-        
         # Si es None, retornar lista vacía
         if v is None:
             return []
@@ -68,27 +69,22 @@ class StoreOut(BaseModel):
         if isinstance(v, ReverseRelation):
             # Acceder al QuerySet interno
             if hasattr(v, 'related_objects'):
-                result = list(v.related_objects)
-                print(f"DEBUG: Found {len(result)} items in related_objects")
-                return result
+                return list(v.related_objects)
             
             # Otra opción: intentar iterar directamente
             try:
                 # El ReverseRelation puede ser iterable si fue precargado
-                result = list(v)
-                print(f"DEBUG: Converted to list with {len(result)} items")
-                return result
+                return list(v)
             except Exception as e:
-                print(f"DEBUG: Could not iterate ReverseRelation: {e}")
+                logger.debug("No se pudo iterar ReverseRelation: %s", e)
                 return []
         
         # Si ya es una lista, retornarla
         if isinstance(v, list):
-            print(f"DEBUG: Already a list with {len(v)} items")
             return v
         
         # Fallback
-        print(f"DEBUG: Unexpected type {type(v)}, returning empty list")
+        logger.debug("Tipo inesperado en contacts: %s", type(v).__name__)
         return []
 
     class Config:
@@ -117,4 +113,33 @@ class UserOut(BaseModel):
 
     class Config:
         orm_mode = True
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+
+class UserUpdateOut(BaseModel):
+    """Respuesta de PATCH /users/{id}: las relaciones solo vienen con ?expand=."""
+
+    user_id: UUID
+    city_id: UUID
+    store_id: Optional[UUID]
+    role_id: UUID
+    dni: str
+    first_name: str
+    middle_name: Optional[str]
+    last_name: str
+    second_last_name: Optional[str]
+    email: EmailStr
+    prefix: str
+    phone: str
+    address: str
+    username: str
+    state: str
+    created_at: datetime
+    updated_at: datetime
+    role: Optional[RoleOut] = None
+    city: Optional[CityOut] = None
+    store: Optional[StoreOut] = None
+
+    class Config:
+        orm_mode = True
+        from_attributes = True
@@ -3,19 +3,17 @@ from io import BytesIO
 from typing import List, Optional
 from uuid import UUID
 
-from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
-
 from app.infra.postgres.models.device import Device
 from app.infra.postgres.models.payment import Payment
 from app.infra.postgres.models.role import Role
 from app.infra.postgres.models.user import User
+from app.infra.postgres.routing import replica_reads
 from app.schemas.analytics import AnalyticsResponse, DailyAnalytics
 
 
 class AnalyticsService:
     @staticmethod
+    @replica_reads
     async def get_analytics_by_date_range(
         start_date: date, end_date: date = None, store_id: Optional[UUID] = None
     ) -> AnalyticsResponse:
@@ -126,12 +124,18 @@ class AnalyticsService:
         )
 
     @staticmethod
+    @replica_reads
     async def generate_analytics_excel(
         start_date: date, end_date: date = None, store_id: Optional[UUID] = None
     ) -> BytesIO:
         """
         Generate Excel file with detailed analytics data for a date range.
         """
+        # openpyxl solo hace falta para esta exportación: no se importa al arrancar
+        from openpyxl import Workbook
+        from openpyxl.styles import Alignment, Font, PatternFill
+        from openpyxl.utils import get_column_letter
+
         if end_date is None:
             end_date = date.today()
 
@@ -0,0 +1,49 @@
+from typing import List, Optional
+from uuid import UUID
+
+from tortoise.expressions import Subquery
+
+from app.infra.postgres.models.asset import Asset, AssetKind
+from app.infra.postgres.pagination import Cursor, paginate
+
+
+class AssetService:
+    """Inventario unificado de dispositivos y televisores (tabla `asset`)."""
+
+    def ids_in_store(self, store_id: UUID, kind: AssetKind) -> Subquery:
+        """
+        IDs de los dispositivos o televisores de la tienda, para filtrar
+        `device_id__in` / `television_id__in`. Es la regla de tienda de todos
+        los listados y conteos: la del vendedor, o la del cliente si no hay
+        vendedor con tienda (`asset.store_id`).
+        """
+        return Subquery(Asset.filter(store_id=store_id, kind=kind).values("asset_id"))
+
+    async def list_page(
+        self,
+        *,
+        store_id: Optional[UUID] = None,
+        customer_id: Optional[UUID] = None,
+        vendor_id: Optional[UUID] = None,
+        kind: Optional[AssetKind] = None,
+        state: Optional[str] = None,
+        after: Optional[Cursor] = None,
+        limit: int = 100,
+    ) -> List[Asset]:
+        filters = {
+            key: value
+            for key, value in (
+                ("store_id", store_id),
+                ("customer_id", customer_id),
+                ("vendor_id", vendor_id),
+                ("kind", kind),
+                ("state", state),
+            )
+            if value is not None
+        }
+        return await paginate(
+            Asset.filter(**filters), "asset_id", after=after, limit=limit
+        )
+
+
+asset_service = AssetService()
@@ -2,8 +2,10 @@ from typing import Any, Dict, Generic, List, Optional, TypeVar
 
 from fastapi import HTTPException
 from tortoise.exceptions import IntegrityError
+from tortoise.expressions import Q
 
 from app.infra.postgres.crud.base import CRUDBase
+from app.infra.postgres.projection import Projection
 
 ModelType = TypeVar("ModelType")
 CreateSchemaType = TypeVar("CreateSchemaType")
@@ -54,6 +56,23 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     async def get(self, id: Any) -> Optional[ModelType]:
         return await self.crud.get(id=id)
 
+    async def get_all_projected(
+        self,
+        projection: Projection,
+        *,
+        skip: int = 0,
+        limit: Optional[int] = 100,
+        payload: Optional[Dict[str, Any]] = None,
+        q_filter: Optional[Q] = None,
+        order_by: Optional[List[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        return await self.crud.get_all_projected(
+            projection, skip=skip, limit=limit, payload=payload, q_filter=q_filter, order_by=order_by
+        )
+
+    async def get_projected(self, projection: Projection, *, id: Any) -> Optional[Dict[str, Any]]:
+        return await self.crud.get_projected(projection, id=id)
+
     async def create(self, *, obj_in: CreateSchemaType) -> ModelType:
         try:
             return await self.crud.create(obj_in=obj_in)
@@ -106,3 +125,6 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
 
     async def delete(self, *, id: Any) -> bool:
         return await self.crud.delete(id=id)
+
+    async def restore(self, *, id: Any) -> Optional[ModelType]:
+        return await self.crud.restore(id=id)
@@ -0,0 +1,312 @@
+"""
+Borrado asíncrono de tiendas y usuarios con todos sus dependientes.
+
+Borrar un usuario arrastra planes, pagos, enrolamientos, dispositivos y sus
+ubicaciones y acciones; en un cliente grande es una transacción larga que
+bloquea filas y llena el WAL. Aquí el borrado es un trabajo (`deletion_job`)
+que recorre una lista fija de pasos, de los dependientes más lejanos al
+registro principal, en lotes de `DELETION_JOB_BATCH_SIZE` filas:
+
+- Cada lote y la actualización del progreso van en la misma transacción
+  corta: el progreso siempre coincide con lo confirmado.
+- Cada paso selecciona "lo que queda" (`WHERE ... LIMIT n`), así que repetir
+  un paso o el trabajo entero es inocuo: si el proceso cae, el trabajo se
+  reanuda donde quedó.
+- Un advisory lock de sesión por trabajo evita que dos workers o pods lo
+  ejecuten a la vez. Al arrancar, y cada `DELETION_JOB_POLL_INTERVAL`
+  segundos, cada worker reanuda los trabajos sin terminar que nadie tiene.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Dict, List, NamedTuple, Optional, Set, Tuple
+from uuid import UUID
+
+import asyncpg
+from tortoise import connections
+from tortoise.exceptions import IntegrityError
+
+from app.core.config import settings
+from app.infra.postgres.crud.deletion_job import crud_deletion_job
+from app.infra.postgres.models import Store, User
+from app.infra.postgres.models.deletion_job import (
+    DeletionEntity,
+    DeletionJob,
+    DeletionJobState,
+)
+from app.services.base import BaseService
+
+logger = logging.getLogger(__name__)
+
+# Primera clave del advisory lock (la segunda es el hash del job_id)
+DELETION_JOB_LOCK_CLASS = 7_310_040
+
+
+class Step(NamedTuple):
+    name: str
+    table: str
+    pk: str
+    where: str  # $1 es el ID del registro principal
+    set: Optional[str] = None  # UPDATE ... SET en lugar de DELETE
+
+    def sql(self) -> str:
+        batch = f'SELECT "{self.pk}" FROM "{self.table}" WHERE ({self.where}) LIMIT $2'
+        if self.set:
+            return (
+                f'UPDATE "{self.table}" SET {self.set} WHERE "{self.pk}" IN ({batch})'
+            )
+        return f'DELETE FROM "{self.table}" WHERE "{self.pk}" IN ({batch})'
+
+
+_ENROLMENTS = (
+    "(SELECT enrolment_id FROM enrolment WHERE user_id = $1 OR vendor_id = $1)"
+)
+_DEVICES = f"(SELECT device_id FROM device WHERE enrolment_id IN {_ENROLMENTS})"
+_TELEVISIONS = (
+    f"(SELECT television_id FROM television WHERE enrolment_id IN {_ENROLMENTS})"
+)
+_PLANS = (
+    "(SELECT plan_id FROM plan WHERE user_id = $1 OR vendor_id = $1 "
+    f"OR device_id IN {_DEVICES} OR television_id IN {_TELEVISIONS})"
+)
+
+STEPS: Dict[DeletionEntity, Tuple[Step, ...]] = {
+    # Los usuarios de la tienda se conservan sin tienda (como DELETE /stores/{id})
+    DeletionEntity.STORE: (
+        Step("users", "user", "user_id", "store_id = $1", set="store_id = NULL"),
+        Step("configurations", "configuration", "configuration_id", "store_id = $1"),
+        Step(
+            "factory_reset_protections",
+            "factoryResetProtection",
+            "factory_reset_protection_id",
+            "store_id = $1",
+        ),
+        Step("store_contacts", "store_contact", "id", "store_id = $1"),
+        Step("token_ledger", "store_token_ledger", "entry_id", "store_id = $1"),
+        Step("token_shards", "store_token_shard", "id", "store_id = $1"),
+        Step("store", "store", "id", "id = $1"),
+    ),
+    DeletionEntity.USER: (
+        Step(
+            "payments",
+            "payment",
+            "payment_id",
+            f"plan_id IN {_PLANS} OR device_id IN {_DEVICES} OR television_id IN {_TELEVISIONS}",
+        ),
+        Step(
+            "plans",
+            "plan",
+            "plan_id",
+            f"user_id = $1 OR vendor_id = $1 OR device_id IN {_DEVICES} "
+            f"OR television_id IN {_TELEVISIONS}",
+        ),
+        # location.television_id y action.television_id solo existen donde se
+        # aplicó db/add_television_id_to_plan.sql (no en create.sql) y tienen
+        # ON DELETE CASCADE: esas filas caen con el paso "televisions"
+        Step("locations", "location", "location_id", f"device_id IN {_DEVICES}"),
+        Step(
+            "actions",
+            "action",
+            "action_id",
+            f"applied_by_id = $1 OR device_id IN {_DEVICES}",
+        ),
+        Step("sims", "sim", "sim_id", f"device_id IN {_DEVICES}"),
+        Step("device_groups", "device_group", "id", f"device_id IN {_DEVICES}"),
+        Step("devices", "device", "device_id", f"enrolment_id IN {_ENROLMENTS}"),
+        Step(
+            "televisions",
+            "television",
+            "television_id",
+            f"enrolment_id IN {_ENROLMENTS}",
+        ),
+        Step(
+            "enrolments", "enrolment", "enrolment_id", "user_id = $1 OR vendor_id = $1"
+        ),
+        Step("admin_stores", "store", "id", "admin_id = $1", set="admin_id = NULL"),
+        Step("user", "user", "user_id", "user_id = $1"),
+    ),
+}
+
+_running: Set[UUID] = set()
+_tasks: Set["asyncio.Task[None]"] = set()
+_poller: Optional["asyncio.Task[None]"] = None
+
+
+def _affected(status: str) -> int:
+    # "DELETE 42" / "UPDATE 42"
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def _run_steps(connection: asyncpg.Connection, job: asyncpg.Record) -> None:
+    job_id = job["job_id"]
+    progress = (
+        json.loads(job["progress"])
+        if isinstance(job["progress"], str)
+        else dict(job["progress"])
+    )
+    batch_size = settings.DELETION_JOB_BATCH_SIZE
+    update_progress = (
+        "UPDATE deletion_job SET step = $2, progress = $3::jsonb, processed = processed + $4, "
+        "updated_at = now() WHERE job_id = $1"
+    )
+    for step in STEPS[DeletionEntity(job["entity"])]:
+        query = step.sql()
+        while True:
+            async with connection.transaction():
+                affected = _affected(
+                    await connection.execute(query, job["entity_id"], batch_size)
+                )
+                progress[step.name] = progress.get(step.name, 0) + affected
+                await connection.execute(
+                    update_progress, job_id, step.name, json.dumps(progress), affected
+                )
+            if affected < batch_size:
+                break
+            await asyncio.sleep(settings.DELETION_JOB_BATCH_PAUSE)
+
+
+async def run_job(job_id: UUID) -> None:
+    """Ejecuta (o reanuda) un trabajo si ningún otro proceso lo tiene."""
+    if job_id in _running:
+        return
+    _running.add(job_id)
+    try:
+        async with connections.get("default").acquire_connection() as connection:
+            locked = await connection.fetchval(
+                "SELECT pg_try_advisory_lock($1, hashtext($2))",
+                DELETION_JOB_LOCK_CLASS,
+                str(job_id),
+            )
+            if not locked:
+                return
+            try:
+                job = await connection.fetchrow(
+                    "UPDATE deletion_job SET state = $2, error = NULL, "
+                    "started_at = coalesce(started_at, now()), updated_at = now() "
+                    "WHERE job_id = $1 AND state <> $3 RETURNING *",
+                    job_id,
+                    DeletionJobState.RUNNING.value,
+                    DeletionJobState.COMPLETED.value,
+                )
+                if job is None:
+                    return
+                logger.info(
+                    "Trabajo de borrado %s (%s %s) en curso",
+                    job_id,
+                    job["entity"],
+                    job["entity_id"],
+                )
+                try:
+                    await _run_steps(connection, job)
+                except Exception as e:
+                    logger.exception("Trabajo de borrado %s fallido", job_id)
+                    await connection.execute(
+                        "UPDATE deletion_job SET state = $2, error = $3, updated_at = now() WHERE job_id = $1",
+                        job_id,
+                        DeletionJobState.FAILED.value,
+                        str(e)[:1000],
+                    )
+                    return
+                await connection.execute(
+                    "UPDATE deletion_job SET state = $2, step = NULL, finished_at = now(), "
+                    "updated_at = now() WHERE job_id = $1",
+                    job_id,
+                    DeletionJobState.COMPLETED.value,
+                )
+                logger.info("Trabajo de borrado %s completado", job_id)
+            finally:
+                await connection.execute(
+                    "SELECT pg_advisory_unlock($1, hashtext($2))",
+                    DELETION_JOB_LOCK_CLASS,
+                    str(job_id),
+                )
+    finally:
+        _running.discard(job_id)
+
+
+def schedule(job_id: UUID) -> None:
+    """Lanza el trabajo en segundo plano en este worker."""
+    task = asyncio.get_running_loop().create_task(run_job(job_id))
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+async def resume_unfinished() -> List[UUID]:
+    """Lanza los trabajos pendientes o en curso (p. ej. tras un reinicio)."""
+    ids = await DeletionJob.filter(
+        state__in=(DeletionJobState.PENDING, DeletionJobState.RUNNING)
+    ).values_list("job_id", flat=True)
+    for job_id in ids:
+        if job_id not in _running:
+            schedule(job_id)
+    return ids
+
+
+async def _poll(interval: float) -> None:
+    while True:
+        try:
+            await resume_unfinished()
+        except Exception:
+            logger.warning(
+                "No se pudieron reanudar los trabajos de borrado", exc_info=True
+            )
+        await asyncio.sleep(interval)
+
+
+def start_deletion_worker(interval: float) -> None:
+    global _poller
+    if _poller is None and interval > 0:
+        _poller = asyncio.get_running_loop().create_task(_poll(interval))
+
+
+def stop_deletion_worker() -> None:
+    """Cancela los trabajos en curso; el lote abierto se revierte y otro worker lo reanuda."""
+    global _poller
+    if _poller is not None:
+        _poller.cancel()
+        _poller = None
+    for task in list(_tasks):
+        task.cancel()
+
+
+class DeletionJobService(BaseService):
+    async def _entity_exists(self, entity: DeletionEntity, entity_id: UUID) -> bool:
+        if entity == DeletionEntity.STORE:
+            return await Store.exists(id=entity_id)
+        # También usuarios con borrado lógico
+        return await User.all_objects.filter(user_id=entity_id).exists()
+
+    async def enqueue(
+        self, *, entity: DeletionEntity, entity_id: UUID
+    ) -> Optional[Tuple[DeletionJob, bool]]:
+        """
+        Crea el trabajo de borrado del registro, o devuelve el existente.
+
+        Devuelve (trabajo, abierto). Un trabajo sin terminar se devuelve tal
+        cual y se relanza (si había fallado, continúa donde quedó). Si el
+        registro ya no existe se devuelve su último trabajo completado, o None.
+        """
+        job = await crud_deletion_job.get_open(entity=entity, entity_id=entity_id)
+        if job is None:
+            if not await self._entity_exists(entity, entity_id):
+                latest = await crud_deletion_job.get_latest(
+                    entity=entity, entity_id=entity_id
+                )
+                return (latest, False) if latest else None
+            try:
+                job = await DeletionJob.create(entity=entity, entity_id=entity_id)
+            except IntegrityError:
+                # Otra petición lo creó a la vez (índice único de trabajos abiertos)
+                job = await crud_deletion_job.get_open(
+                    entity=entity, entity_id=entity_id
+                )
+        elif job.state == DeletionJobState.FAILED:
+            job.state = DeletionJobState.PENDING
+            await job.save(update_fields=["state", "updated_at"])
+        # Si otro worker ya lo está ejecutando, run_job no hace nada
+        schedule(job.job_id)
+        return job, True
+
+
+deletion_job_service = DeletionJobService(crud_deletion_job)
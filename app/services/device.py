@@ -1,9 +1,11 @@
 from typing import Any, Dict, Optional
+from uuid import UUID
 
 from fastapi import HTTPException, status
 from tortoise.exceptions import IntegrityError
 
 from app.infra.postgres.crud.device import crud_device
+from app.infra.postgres.models.asset import Asset, AssetKind
 from app.infra.postgres.models.device import Device
 from app.schemas.device import DeviceCreate, DeviceUpdate
 from app.services.base import BaseService
@@ -27,13 +29,19 @@ class DeviceService(BaseService[Device, DeviceCreate, DeviceUpdate]):
                 detail=f"Database integrity error: {e}",
             )
 
-    async def count(self) -> int:
+    async def count(self, store_id: Optional[UUID] = None) -> int:
         """
         Count the total number of devices in the system.
 
+        With store_id, counts the store's devices from the asset table
+        (idx_asset_store_created_live) instead of joining enrolments, with the
+        same store rule as the list (AssetService.ids_in_store).
+
         Returns:
             int: The total count of devices
         """
+        if store_id is not None:
+            return await Asset.filter(store_id=store_id, kind=AssetKind.DEVICE).count()
         return await self.crud.count(payload={})
 
     async def get_by_imei(self, imei: str) -> Optional[Device]:
@@ -1,9 +1,110 @@
+from typing import List, Optional
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
 from app.infra.postgres.crud.enrolment import crud_enrolment
+from app.infra.postgres.models import Configuration, Device, Enrolment, Plan, Sim, Store, User
+from app.schemas.device_enrolment import DeviceEnrolmentCreate, DeviceEnrolmentResponse
 from app.services.base import BaseService
+from app.services.store_token import store_token_service
 
 
 class EnrolmentService(BaseService):
-    pass
+    async def _token_store(self, obj_in: DeviceEnrolmentCreate) -> Optional[UUID]:
+        if obj_in.store_id is not None:
+            return obj_in.store_id
+        vendor = await User.filter(user_id=obj_in.vendor_id).values("store_id")
+        if not vendor:
+            # Igual que un vendor_id inexistente en el INSERT (clave foránea)
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Cliente o vendedor no válido"
+            )
+        return vendor[0]["store_id"]
+
+    async def enrol_device(self, *, obj_in: DeviceEnrolmentCreate) -> DeviceEnrolmentResponse:
+        """
+        Enrolamiento completo en una sola transacción: enrolment, dispositivo,
+        SIMs (un único INSERT), plan y consumo de tokens de la tienda. Si algo
+        falla no queda ningún registro a medias.
+        """
+        store_id = await self._token_store(obj_in)
+        if obj_in.tokens and store_id is None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="El vendedor no tiene tienda asignada para descontar tokens",
+            )
+
+        try:
+            async with in_transaction() as conn:
+                enrolment = await Enrolment.create(
+                    user_id=obj_in.user_id, vendor_id=obj_in.vendor_id, using_db=conn
+                )
+                device = await Device.create(
+                    enrolment_id=enrolment.enrolment_id, **obj_in.device.dict(), using_db=conn
+                )
+                sims: List[Sim] = [
+                    Sim(device_id=device.device_id, **sim.dict()) for sim in obj_in.sims
+                ]
+                if sims:
+                    # Model.bulk_create no acepta using_db en tortoise 0.19
+                    await Sim.all().using_db(conn).bulk_create(sims)
+                plan = None
+                if obj_in.plan is not None:
+                    plan = await Plan.create(
+                        user_id=obj_in.user_id,
+                        vendor_id=obj_in.vendor_id,
+                        device_id=device.device_id,
+                        **obj_in.plan.dict(),
+                        using_db=conn,
+                    )
+                entries = []
+                if obj_in.tokens:
+                    # Lo último: el bloqueo de la fila de la tienda dura solo hasta el commit
+                    entries = await store_token_service.consume(
+                        store_id, obj_in.tokens, reference=str(enrolment.enrolment_id)
+                    )
+                    if entries is None:
+                        if not await Store.exists(id=store_id):
+                            raise HTTPException(
+                                status_code=status.HTTP_404_NOT_FOUND, detail="Store not found"
+                            )
+                        raise HTTPException(
+                            status_code=status.HTTP_409_CONFLICT, detail="Tokens insuficientes"
+                        )
+        except IntegrityError as e:
+            error_message = str(e).lower()
+            if "device_imei_key" in error_message:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A device with this IMEI already exists.",
+                )
+            if "sim_icc_id_key" in error_message:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="A SIM with this ICC ID already exists.",
+                )
+            if "foreign key" in error_message:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Cliente o vendedor no válido",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Database integrity error: {e}",
+            )
+
+        configurations = await Configuration.filter(store_id=store_id) if store_id else []
+        return DeviceEnrolmentResponse(
+            enrolment=enrolment,
+            device=device,
+            sims=sims,
+            plan=plan,
+            token_entries=entries,
+            configurations=configurations,
+        )
 
 
 enrolment_service = EnrolmentService(crud=crud_enrolment)
@@ -1,18 +1,135 @@
-from typing import Optional
+from hashlib import blake2b
+from typing import Any, Dict, FrozenSet, List, NamedTuple, Optional
 from uuid import UUID
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_cache
 from app.infra.postgres.crud.factory_reset_protection import (
     crud_factory_reset_protection,
 )
-from app.infra.postgres.models.factory_reset_protection import FactoryResetProtection
+from app.infra.postgres.models.factory_reset_protection import (
+    FactoryResetProtection,
+    FactoryResetProtectionState,
+)
 from app.services.base import BaseService
 
+_COLUMNS = ("factory_reset_protection_id", "account_id", "name", "email", "state", "store_id")
+
+
+class StoreAccounts(NamedTuple):
+    """Cuentas FRP de una tienda tal como se guardan en caché."""
+
+    version: str
+    rows: List[Dict[str, Any]]
+    by_account: Dict[str, Dict[str, Any]]
+    active_accounts: FrozenSet[str]
+    active_emails: FrozenSet[str]  # en minúsculas
+
+
+def _snapshot(rows: List[Dict[str, Any]]) -> StoreAccounts:
+    digest = blake2b(digest_size=16)
+    for row in rows:
+        row["state"] = FactoryResetProtectionState(row["state"])
+        digest.update(
+            repr(
+                (str(row["factory_reset_protection_id"]), row["account_id"], row["name"], row["email"], row["state"].value)
+            ).encode()
+        )
+    active = [row for row in rows if row["state"] == FactoryResetProtectionState.ACTIVE]
+    return StoreAccounts(
+        version=digest.hexdigest(),
+        rows=rows,
+        by_account={row["account_id"]: row for row in rows},
+        active_accounts=frozenset(row["account_id"] for row in active),
+        active_emails=frozenset(row["email"].lower() for row in active),
+    )
+
 
 class FactoryResetProtectionService(BaseService):
+    """
+    Los dispositivos consultan sus cuentas FRP en cada arranque tras un reset.
+    Las cuentas de cada tienda se cargan de una vez y se guardan en memoria
+    (`FRP_SNAPSHOT_TTL`); las escrituras por este servicio invalidan la tienda.
+    """
+
+    def __init__(self, crud):
+        super().__init__(crud)
+        self._stores: TTLCache[UUID, StoreAccounts] = register_cache(
+            "frp_store_accounts",
+            TTLCache(ttl=settings.FRP_SNAPSHOT_TTL, maxsize=settings.FRP_SNAPSHOT_MAX_STORES),
+        )
+
+    async def _load(self, store_id: UUID) -> StoreAccounts:
+        # Siempre de la principal: tras invalidar, la réplica podría ir atrasada
+        rows = await (
+            FactoryResetProtection.filter(store_id=store_id)
+            .order_by("account_id")
+            .values(*_COLUMNS)
+        )
+        return _snapshot(rows)
+
+    async def store_accounts(self, store_id: UUID) -> StoreAccounts:
+        return await self._stores.get_or_load(store_id, lambda: self._load(store_id))
+
+    async def _store_of(self, id: Any) -> Optional[UUID]:
+        return await (
+            FactoryResetProtection.filter(pk=id).first().values_list("store_id", flat=True)
+        )
+
+    def _invalidate(self, store_id: Optional[UUID]) -> None:
+        if store_id is not None:
+            self._stores.invalidate(store_id)
+
+    async def list_accounts(
+        self,
+        *,
+        state: Optional[FactoryResetProtectionState] = None,
+        store_id: Optional[UUID] = None,
+    ) -> List[Any]:
+        if store_id is not None:
+            accounts = await self.store_accounts(store_id)
+            return [row for row in accounts.rows if state is None or row["state"] == state]
+        return await self.crud.get_all(payload={"state": state} if state else {})
+
     async def get_factory_reset_by_account_id(
-        self, id: UUID, store_id: Optional[UUID] = None
-    ) -> Optional[FactoryResetProtection]:
-        return await self.crud.get_by_account_id(account_id=id, store_id=store_id)
+        self, id: str, store_id: Optional[UUID] = None
+    ) -> Optional[Any]:
+        if store_id is not None:
+            accounts = await self.store_accounts(store_id)
+            return accounts.by_account.get(id)
+        return await self.crud.get_by_account_id(account_id=id)
+
+    async def membership(
+        self, store_id: UUID, *, account_id: Optional[str] = None, email: Optional[str] = None
+    ) -> Dict[str, Optional[bool]]:
+        """¿Tiene la tienda una cuenta activa con ese account_id / email?"""
+        accounts = await self.store_accounts(store_id)
+        return {
+            "account_id": None if account_id is None else account_id in accounts.active_accounts,
+            "email": None if email is None else email.lower() in accounts.active_emails,
+        }
+
+    async def create(self, *, obj_in: Any) -> FactoryResetProtection:
+        created = await super().create(obj_in=obj_in)
+        self._invalidate(created.store_id)
+        return created
+
+    async def update(self, *, id: Any, obj_in: Any) -> Optional[FactoryResetProtection]:
+        # Si la cuenta cambia de tienda, la anterior también queda desactualizada
+        store_id = await self._store_of(id)
+        updated = await super().update(id=id, obj_in=obj_in)
+        if updated:
+            self._invalidate(store_id)
+            self._invalidate(updated.store_id)
+        return updated
+
+    async def delete(self, *, id: Any) -> bool:
+        store_id = await self._store_of(id)
+        deleted = await super().delete(id=id)
+        if deleted:
+            self._invalidate(store_id)
+        return deleted
 
 
 # Instancia global a usar en routers
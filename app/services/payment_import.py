@@ -0,0 +1,198 @@
+from datetime import timezone
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from tortoise import Tortoise
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.core.records import RecordFormatError, format_validation_error, iter_records
+from app.schemas.payment import PaymentCreate
+from app.schemas.payment_import import PaymentImportReport, PaymentImportRowError
+
+_PAYMENT_COLUMNS = (
+    "payment_id",
+    "plan_id",
+    "device_id",
+    "television_id",
+    "value",
+    "method",
+    "state",
+    "date",
+    "reference",
+)
+
+
+@lru_cache(maxsize=16)
+def _insert_sql(rows: int) -> str:
+    width = len(_PAYMENT_COLUMNS)
+    values = ", ".join(
+        "(" + ", ".join(f"${row * width + col + 1}" for col in range(width)) + ")"
+        for row in range(rows)
+    )
+    columns = ", ".join(_PAYMENT_COLUMNS)
+    # Sin columna de conflicto: cubre uq_payment_plan_reference (y la PK)
+    return (
+        f"INSERT INTO payment ({columns}) VALUES {values} "
+        "ON CONFLICT DO NOTHING RETURNING payment_id"
+    )
+
+
+register_cache("payment_import_sql", _insert_sql)
+
+
+class PaymentImportService:
+    """
+    Ingesta masiva e idempotente de pagos desde archivos de liquidación.
+
+    Un pago se identifica por (plan_id, reference): reenviar el mismo archivo,
+    o un webhook que se reintenta, no crea duplicados.
+    """
+
+    async def import_payments(
+        self,
+        data: bytes,
+        *,
+        fmt: str,
+        batch_size: Optional[int] = None,
+    ) -> PaymentImportReport:
+        started = perf_counter()
+        batch_size = batch_size or settings.PAYMENT_IMPORT_BATCH_SIZE
+        errors: Dict[int, PaymentImportRowError] = {}
+
+        def fail(row: int, reference: Optional[str], *messages: str) -> None:
+            entry = errors.setdefault(
+                row, PaymentImportRowError(row=row, reference=reference, errors=[])
+            )
+            entry.errors.extend(messages)
+
+        # 1. Parseo y validación de filas
+        parsed: List[Tuple[int, PaymentCreate]] = []
+        total = 0
+        for record in iter_records(data, fmt):
+            total += 1
+            if total > settings.PAYMENT_IMPORT_MAX_ROWS:
+                raise RecordFormatError(
+                    f"La carga supera el máximo de {settings.PAYMENT_IMPORT_MAX_ROWS} filas"
+                )
+            if record.error:
+                fail(record.row, None, record.error)
+                continue
+            try:
+                payment = PaymentCreate(**record.data)
+            except ValidationError as e:
+                fail(
+                    record.row,
+                    record.data.get("reference"),
+                    *format_validation_error(e),
+                )
+                continue
+            if payment.date.tzinfo is None:
+                payment.date = payment.date.replace(tzinfo=timezone.utc)
+            parsed.append((record.row, payment))
+
+        # 2. Repetidos dentro del mismo archivo: cuentan como duplicados
+        seen: Set[Tuple[UUID, str]] = set()
+        unique_rows: List[Tuple[int, PaymentCreate]] = []
+        duplicates = 0
+        for line, payment in parsed:
+            key = (payment.plan_id, payment.reference)
+            if key in seen:
+                duplicates += 1
+                continue
+            seen.add(key)
+            unique_rows.append((line, payment))
+
+        # 3. Planes: una consulta. El dispositivo o televisor sale del plan
+        # si la fila no lo indica
+        plans = await self._plans({payment.plan_id for _, payment in unique_rows})
+        ready: List[Tuple[int, PaymentCreate]] = []
+        for line, payment in unique_rows:
+            plan = plans.get(payment.plan_id)
+            if plan is None:
+                fail(line, payment.reference, f"Plan {payment.plan_id} no encontrado")
+                continue
+            if payment.device_id is None and payment.television_id is None:
+                payment.device_id, payment.television_id = plan
+            elif payment.device_id is not None and payment.television_id is not None:
+                fail(
+                    line,
+                    payment.reference,
+                    "Indique device_id o television_id, no ambos",
+                )
+                continue
+            ready.append((line, payment))
+
+        # 4. Inserción por lotes, una transacción por lote
+        created = 0
+        for start in range(0, len(ready), batch_size):
+            batch = ready[start : start + batch_size]
+            inserted = await self._insert_batch(batch, fail)
+            if inserted is not None:
+                created += inserted
+                duplicates += len(batch) - inserted
+
+        duration = perf_counter() - started
+        return PaymentImportReport(
+            total=total,
+            created=created,
+            duplicates=duplicates,
+            failed=len(errors),
+            duration_ms=round(duration * 1000, 2),
+            payments_per_second=round(created / duration, 1) if duration else 0.0,
+            errors=[errors[row] for row in sorted(errors)],
+        )
+
+    async def _plans(
+        self, ids: Set[UUID]
+    ) -> Dict[UUID, Tuple[Optional[UUID], Optional[UUID]]]:
+        """{plan_id: (device_id, television_id)} de los planes vivos indicados."""
+        if not ids:
+            return {}
+        conn = Tortoise.get_connection("default")
+        rows = await conn.execute_query_dict(
+            "SELECT plan_id, device_id, television_id FROM plan "
+            "WHERE plan_id = ANY($1::uuid[]) AND deleted_at IS NULL",
+            [list(ids)],
+        )
+        return {
+            item["plan_id"]: (item["device_id"], item["television_id"]) for item in rows
+        }
+
+    async def _insert_batch(
+        self, batch: List[Tuple[int, PaymentCreate]], fail
+    ) -> Optional[int]:
+        """Inserta el lote; devuelve las filas nuevas, o None si el lote se rechaza."""
+        params = []
+        for _, payment in batch:
+            params.extend(
+                (
+                    uuid4(),
+                    payment.plan_id,
+                    payment.device_id,
+                    payment.television_id,
+                    payment.value,
+                    payment.method,
+                    payment.state.value,
+                    payment.date,
+                    payment.reference,
+                )
+            )
+        try:
+            async with in_transaction() as conn:
+                _, inserted = await conn.execute_query(_insert_sql(len(batch)), params)
+        except IntegrityError as e:
+            for line, payment in batch:
+                fail(
+                    line, payment.reference, f"Lote rechazado por la base de datos: {e}"
+                )
+            return None
+        return len(inserted)
+
+
+payment_import_service = PaymentImportService()
@@ -0,0 +1,274 @@
+"""
+Purgado de registros con borrado lógico.
+
+`DELETE` en la API solo marca `deleted_at` (ver `CRUDBase.delete`). Este
+módulo borra de verdad las filas marcadas hace más de
+`SOFT_DELETE_RETENTION_DAYS` días, en lotes pequeños y en autocommit: cada
+lote bloquea pocas filas durante poco tiempo, en lugar de un DELETE en cascada
+que bloquee `payment`, `location` o `action` durante minutos.
+
+- Orden: primero los hijos (pagos y planes), después sus padres, para no chocar con
+  las claves foráneas `ON DELETE RESTRICT`.
+- Los hijos voluminosos con `ON DELETE CASCADE` (ubicaciones y acciones de un
+  dispositivo o televisor) se vacían antes por lotes.
+- Si una fila sigue referenciada (p. ej. un usuario que aplicó acciones), se
+  omite y se registra; el resto del lote se borra.
+- `pg_try_advisory_lock` garantiza una sola ejecución a la vez entre todos los
+  workers y pods.
+
+Se ejecuta en segundo plano dentro de la ventana horaria configurada
+(`start_purge_job`, al arrancar la aplicación si `PURGE_INTERVAL` > 0) o a
+mano con `scripts/purge_deleted.py`.
+"""
+
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Type
+
+import asyncpg
+from tortoise import connections, timezone
+from tortoise.models import Model
+
+from app.core.config import settings
+from app.infra.postgres.models import (
+    AccountType,
+    Action,
+    Device,
+    Enrolment,
+    Location,
+    Payment,
+    Plan,
+    StoreContact,
+    Television,
+    User,
+)
+
+logger = logging.getLogger(__name__)
+
+# Clave del advisory lock de PostgreSQL que serializa los purgados
+PURGE_LOCK_KEY = 7_310_039
+
+_purge_task: Optional["asyncio.Task[None]"] = None
+
+
+class PurgeTarget(NamedTuple):
+    model: Type[Model]
+    # (modelo hijo, columna FK): hijos ON DELETE CASCADE que se vacían antes
+    heavy_children: Tuple[Tuple[Type[Model], str], ...] = ()
+
+
+PURGE_ORDER: Tuple[PurgeTarget, ...] = (
+    PurgeTarget(Payment),
+    PurgeTarget(Plan),
+    PurgeTarget(
+        Device, heavy_children=((Location, "device_id"), (Action, "device_id"))
+    ),
+    PurgeTarget(
+        Television,
+        heavy_children=((Location, "television_id"), (Action, "television_id")),
+    ),
+    PurgeTarget(Enrolment),
+    PurgeTarget(StoreContact),
+    PurgeTarget(AccountType),
+    PurgeTarget(User),
+)
+
+
+def _table(model: Type[Model]) -> Tuple[str, str]:
+    meta = model._meta
+    return meta.db_table, meta.fields_db_projection[meta.pk_attr]
+
+
+def _deleted_rows(status: str) -> int:
+    # "DELETE 42"
+    return int(status.rsplit(" ", 1)[-1])
+
+
+async def _delete_children(
+    connection: asyncpg.Connection,
+    target: PurgeTarget,
+    cutoff: datetime,
+    batch_size: int,
+    pause: float,
+) -> int:
+    table, pk = _table(target.model)
+    total = 0
+    for child, column in target.heavy_children:
+        child_table, child_pk = _table(child)
+        query = (
+            f'DELETE FROM "{child_table}" WHERE "{child_pk}" IN ('
+            f'SELECT c."{child_pk}" FROM "{child_table}" c '
+            f'JOIN "{table}" p ON p."{pk}" = c."{column}" '
+            f"WHERE p.deleted_at < $1 LIMIT $2)"
+        )
+        while True:
+            deleted = _deleted_rows(await connection.execute(query, cutoff, batch_size))
+            total += deleted
+            if deleted < batch_size:
+                break
+            await asyncio.sleep(pause)
+    return total
+
+
+async def _delete_one_by_one(
+    connection: asyncpg.Connection,
+    table: str,
+    pk: str,
+    ids: List[Any],
+    skipped: List[Any],
+) -> int:
+    deleted = 0
+    for id_ in ids:
+        try:
+            deleted += _deleted_rows(
+                await connection.execute(
+                    f'DELETE FROM "{table}" WHERE "{pk}" = $1', id_
+                )
+            )
+        except asyncpg.ForeignKeyViolationError as e:
+            skipped.append(id_)
+            logger.warning(
+                "Purgado: %s %s sigue referenciado (%s)", table, id_, e.constraint_name
+            )
+    return deleted
+
+
+async def _purge_target(
+    connection: asyncpg.Connection,
+    target: PurgeTarget,
+    cutoff: datetime,
+    batch_size: int,
+    pause: float,
+) -> Dict[str, int]:
+    table, pk = _table(target.model)
+    children = await _delete_children(connection, target, cutoff, batch_size, pause)
+
+    skipped: List[Any] = []
+    candidates = (
+        f'SELECT "{pk}" FROM "{table}" '
+        f'WHERE deleted_at < $1 AND "{pk}" <> ALL($3) '
+        f"ORDER BY deleted_at LIMIT $2"
+    )
+    query = (
+        f'DELETE FROM "{table}" WHERE "{pk}" IN ({candidates} FOR UPDATE SKIP LOCKED)'
+    )
+    deleted = 0
+    while True:
+        try:
+            batch = _deleted_rows(
+                await connection.execute(query, cutoff, batch_size, skipped)
+            )
+            done = batch < batch_size
+        except asyncpg.ForeignKeyViolationError:
+            # Algún registro del lote sigue referenciado: se borra fila a fila
+            ids = [
+                row[0]
+                for row in await connection.fetch(
+                    candidates, cutoff, batch_size, skipped
+                )
+            ]
+            batch = await _delete_one_by_one(connection, table, pk, ids, skipped)
+            done = len(ids) < batch_size
+        deleted += batch
+        if done:
+            break
+        await asyncio.sleep(pause)
+    return {"deleted": deleted, "children": children, "skipped": len(skipped)}
+
+
+def _retention(retention_days: Optional[int]) -> int:
+    return (
+        settings.SOFT_DELETE_RETENTION_DAYS
+        if retention_days is None
+        else retention_days
+    )
+
+
+async def pending(*, retention_days: Optional[int] = None) -> Dict[str, int]:
+    """Filas pendientes de purgar por tabla (para `--dry-run`)."""
+    cutoff = timezone.now() - timedelta(days=_retention(retention_days))
+    connection = connections.get("default")
+    counts = {}
+    for target in PURGE_ORDER:
+        table, _ = _table(target.model)
+        rows = await connection.execute_query_dict(
+            f'SELECT count(*) AS n FROM "{table}" WHERE deleted_at < $1', [cutoff]
+        )
+        counts[table] = rows[0]["n"]
+    return counts
+
+
+async def purge_deleted(
+    *,
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None,
+    pause: Optional[float] = None,
+) -> Optional[Dict[str, Dict[str, int]]]:
+    """
+    Borra las filas marcadas hace más de `retention_days` días.
+
+    Devuelve el resumen por tabla, o None si otro proceso ya está purgando.
+    """
+    cutoff = timezone.now() - timedelta(days=_retention(retention_days))
+    batch_size = batch_size or settings.PURGE_BATCH_SIZE
+    pause = settings.PURGE_BATCH_PAUSE if pause is None else pause
+
+    # El advisory lock es de sesión: todo el purgado usa la misma conexión,
+    # sin transacción para que cada lote confirme y libere sus bloqueos
+    async with connections.get("default").acquire_connection() as connection:
+        if not await connection.fetchval(
+            "SELECT pg_try_advisory_lock($1)", PURGE_LOCK_KEY
+        ):
+            logger.info("Purgado en curso en otro proceso; se omite")
+            return None
+        try:
+            summary = {}
+            for target in PURGE_ORDER:
+                table, _ = _table(target.model)
+                summary[table] = await _purge_target(
+                    connection, target, cutoff, batch_size, pause
+                )
+                if any(summary[table].values()):
+                    logger.info("Purgado %s: %s", table, summary[table])
+            return summary
+        finally:
+            await connection.execute("SELECT pg_advisory_unlock($1)", PURGE_LOCK_KEY)
+
+
+def in_window(now: Optional[datetime] = None) -> bool:
+    """¿Está la hora UTC actual dentro de la ventana de purgado?"""
+    hour = (now or datetime.utcnow()).hour
+    start, end = settings.PURGE_WINDOW_START_HOUR, settings.PURGE_WINDOW_END_HOUR
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end  # ventana que cruza la medianoche
+
+
+async def _run_periodically(interval: int) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        if not in_window():
+            continue
+        try:
+            await purge_deleted()
+        except Exception:
+            logger.exception(
+                "Purgado fallido; se reintentará en el siguiente intervalo"
+            )
+
+
+def start_purge_job(interval: int) -> None:
+    """Purga cada `interval` segundos dentro de la ventana horaria (0 desactiva)."""
+    global _purge_task
+    if _purge_task is None and interval > 0:
+        _purge_task = asyncio.get_running_loop().create_task(
+            _run_periodically(interval)
+        )
+
+
+def stop_purge_job() -> None:
+    global _purge_task
+    if _purge_task is not None:
+        _purge_task.cancel()
+        _purge_task = None
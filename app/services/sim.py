@@ -2,11 +2,30 @@ from typing import Any, Dict, List, Optional, Union
 from uuid import UUID
 
 from fastapi import HTTPException, status
+from tortoise import connections
 from tortoise.exceptions import IntegrityError
 
 from app.infra.postgres.crud.sim import sim as crud_sim
 from app.infra.postgres.models.sim import Sim
-from app.schemas.sim import SimCreate, SimUpdate
+from app.schemas.sim import SimBulkResult, SimCreate, SimUpdate
+
+# Alta o actualización por icc_id en una sentencia. `xmax = 0` solo se cumple
+# en las filas recién insertadas: las actualizadas llevan el xmax del UPDATE.
+_UPSERT = """
+INSERT INTO sim (sim_id, device_id, icc_id, slot_index, operator, number, state)
+SELECT gen_random_uuid(), * FROM unnest(
+    $1::uuid[], $2::text[], $3::text[], $4::text[], $5::text[], $6::text[]
+)
+ON CONFLICT (icc_id) DO UPDATE SET
+    device_id = EXCLUDED.device_id,
+    slot_index = EXCLUDED.slot_index,
+    operator = EXCLUDED.operator,
+    number = EXCLUDED.number,
+    state = EXCLUDED.state,
+    updated_at = now()
+RETURNING sim_id, device_id, icc_id, slot_index, operator, number, state,
+          created_at, updated_at, (xmax = 0) AS inserted
+"""
 
 
 class SimService:
@@ -14,8 +33,8 @@ class SimService:
         return await crud_sim.get(id=id)
 
     async def get_by_number(self, *, number: str) -> Optional[Sim]:
-        sims = await crud_sim.get_all(payload={"number": number}, limit=1)
-        return sims[0] if sims else None
+        # idx_sim_number; el número no es único, se devuelve la más antigua
+        return await Sim.filter(number=number).order_by("created_at").first()
 
     async def get_by_device_id(
         self, *, device_id: UUID, skip: int = 0, limit: int = 100
@@ -24,9 +43,12 @@ class SimService:
             payload={"device_id": device_id}, skip=skip, limit=limit
         )
 
+    async def get_by_device_ids(self, *, device_ids: List[UUID]) -> List[Sim]:
+        """SIMs de varios dispositivos en una consulta (idx_sim_device)."""
+        return await Sim.filter(device_id__in=device_ids).order_by("device_id", "slot_index")
+
     async def get_by_icc_id(self, *, icc_id: str) -> Optional[Sim]:
-        sims = await crud_sim.get_all(payload={"icc_id": icc_id}, limit=1)
-        return sims[0] if sims else None
+        return await Sim.get_or_none(icc_id=icc_id)
 
     async def get_all(self, *, skip: int = 0, limit: int = 100) -> List[Sim]:
         return await crud_sim.get_all(skip=skip, limit=limit)
@@ -53,6 +75,30 @@ class SimService:
                 detail=f"Error creating SIM card: {e}",
             )
 
+    async def upsert_many(self, *, sims: List[SimCreate]) -> SimBulkResult:
+        """
+        Registra o actualiza un lote de SIMs por icc_id. Si un icc_id se repite
+        en el lote gana la última aparición (una sentencia ON CONFLICT no puede
+        tocar la misma fila dos veces).
+        """
+        unique = list({sim.icc_id: sim for sim in sims}.values())
+        columns = ("device_id", "icc_id", "slot_index", "operator", "number", "state")
+        params = [[getattr(sim, column) for sim in unique] for column in columns]
+        try:
+            rows = await connections.get("default").execute_query_dict(_UPSERT, params)
+        except IntegrityError as e:
+            if "foreign key" in str(e).lower():
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Associated device does not exist",
+                )
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error saving SIM cards: {e}",
+            )
+        created = sum(1 for row in rows if row.pop("inserted"))
+        return SimBulkResult(created=created, updated=len(rows) - created, sims=rows)
+
     async def update(
         self, *, id: UUID, obj_in: Union[SimUpdate, Dict[str, Any]]
     ) -> bool:
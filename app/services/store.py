@@ -2,9 +2,12 @@ from typing import Any, Dict, List, Optional
 from uuid import UUID
 
 from app.infra.postgres.crud.store import crud_store
+from app.infra.postgres.models.store import Store
 from app.infra.postgres.models.user import User
+from app.infra.postgres.projection import Projection
 from app.schemas.store import StoreDB, StoreCreate, StoreUpdate
 from app.services.base import BaseService
+from app.services.store_token import store_token_service
 
 
 class StoreService(BaseService):
@@ -12,13 +15,27 @@ class StoreService(BaseService):
         """
         Retrieve a single store by its ID with country information.
         """
-        return await self.crud.get_with_country(id=id)
+        store = await self.crud.get_with_country(id=id)
+        await store_token_service.with_balances([store])
+        return store
     
-    async def get_all_with_country(self, *, skip: int = 0, limit: int = 100, payload: Dict[str, Any] = {}) -> List[StoreDB]:
+    async def get_all_with_country(self, *, skip: int = 0, limit: int = 100, payload: Dict[str, Any] = {}) -> List[Store]:
         """
         Retrieve all stores with country information.
         """
-        return await self.crud.get_all_with_country(skip=skip, limit=limit, payload=payload)
+        stores = await self.crud.get_all_with_country(skip=skip, limit=limit, payload=payload)
+        await store_token_service.with_balances(stores)
+        return stores
+
+    async def get_all_projected(self, projection: Projection, **kwargs: Any) -> List[Dict[str, Any]]:
+        rows = await super().get_all_projected(projection, **kwargs)
+        await store_token_service.with_balances(rows)
+        return rows
+
+    async def get_projected(self, projection: Projection, *, id: Any) -> Optional[Dict[str, Any]]:
+        row = await super().get_projected(projection, id=id)
+        await store_token_service.with_balances([row])
+        return row
 
     async def create(self, *, obj_in: StoreCreate, admin_id: Optional[UUID] = None) -> StoreDB:
         """Crea una nueva tienda y carga sus relaciones.
@@ -40,10 +57,11 @@ class StoreService(BaseService):
             obj_in = obj_in.copy(update={"admin_id": admin_id})
 
         # Crear la tienda (el CRUD aceptará el modelo Pydantic directamente)
-        store = await self.crud.create(obj_in=obj_in)
+        store = await self.crud.create(obj_in=obj_in, expand=("admin__role", "country"))
 
         # Convertir el modelo Tortoise a Pydantic antes de retornar
         if store:
+            await store_token_service.record_opening(store.id, store.tokens_disponibles)
             return StoreDB.from_orm(store)
         return None
 
@@ -69,13 +87,24 @@ class StoreService(BaseService):
         if admin_id:
             store_data['admin_id'] = admin_id
         
-        # Actualizar la tienda (el método update en CRUDBase ahora devuelve el objeto actualizado)
-        updated_store = await self.crud.update(id=id, obj_in=store_data)
-        
+        # Los tokens no se guardan con el resto: el saldo pasa por el libro de
+        # tokens, y un save() completo pisaría los consumos concurrentes
+        tokens = store_data.pop("tokens_disponibles", None)
+        if store_data:
+            updated_store = await self.crud.patch(id=id, values=store_data)
+        else:
+            updated_store = await self.crud.get(id=id)
+        if not updated_store:
+            return None
+
+        if tokens is not None:
+            await store_token_service.set_balance(id, tokens)
+            await updated_store.refresh_from_db(fields=["tokens_disponibles"])
+        await store_token_service.with_balances([updated_store])
+
         # Convertir el modelo Tortoise a Pydantic
-        if updated_store:
-            return StoreDB.from_orm(updated_store)
-        return None
+        await updated_store.fetch_related(*Store._meta.fetch_fields)
+        return StoreDB.from_orm(updated_store)
 
     async def delete(self, *, id: UUID) -> bool:
         """Delete a store after disassociating all users from it.
@@ -71,7 +71,10 @@ class StoreContactService(BaseService):
         except ValidationError as e:
             raise HTTPException(status_code=422, detail=f"Invalid contact_details: {e.message}")
 
-        return await self.crud.create(obj_in=obj_in)
+        contact = await self.crud.create(obj_in=obj_in)
+        # El tipo de cuenta ya está cargado: se asigna sin otra consulta
+        contact.account_type = account_type
+        return contact
 
 
 store_contact_service = StoreContactService(crud=crud_store_contact)
\ No newline at end of file
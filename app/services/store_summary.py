@@ -0,0 +1,152 @@
+"""
+Resumen de una tienda para el panel de inicio del back office.
+
+Sustituye a las cinco peticiones que hacía el panel (`/devices/count`,
+`/televisions/count`, `/users`, `/payments`, `/analytics/date-range`) por
+tres consultas agrupadas que se lanzan a la vez en la réplica:
+
+- dispositivos y televisores por estado, de `asset` (idx_asset_store_created_live);
+- clientes y vendedores, de `user` por rol (idx_user_store_role_live);
+- planes activos y vencidos y pagos aprobados de hoy y del mes, en una
+  pasada por los planes de los activos de la tienda.
+
+Los tokens salen del saldo de la tienda en la principal. El resultado se
+guarda `STORE_SUMMARY_CACHE_TTL` segundos por tienda y no se invalida: es
+un panel, no un saldo contable.
+
+Un plan pertenece a la tienda de su dispositivo o televisor en `asset`
+(la del vendedor). Está vencido si tiene `period` y menos cuotas aprobadas
+que las vencidas hasta hoy, contando la primera en `initial_date`.
+"""
+
+import asyncio
+from datetime import datetime, time, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.infra.postgres.models.asset import Asset, AssetKind
+from app.infra.postgres.models.payment import PaymentState, Plan
+from app.infra.postgres.models.user import User
+from app.infra.postgres.routing import read_connection, replica_reads
+from app.schemas.store_summary import AssetCounts, PaymentTotals, StoreSummary
+from app.services.store_token import store_token_service
+
+CUSTOMER_ROLE = "Cliente"
+VENDOR_ROLE = "Vendedor"
+
+_ASSETS = """
+SELECT kind, state, count(*) AS n FROM asset
+WHERE store_id = $1 AND deleted_at IS NULL
+GROUP BY kind, state
+"""
+
+_USERS = """
+SELECT r.name AS role, count(*) AS n FROM "user" u
+JOIN role r ON r.role_id = u.role_id
+WHERE u.store_id = $1 AND u.deleted_at IS NULL
+GROUP BY r.name
+"""
+
+# $2 = hoy (date), $3 = inicio del día, $4 = inicio del mes
+_PLANS = f"""
+WITH store_plans AS (
+    SELECT p.plan_id, p.initial_date, p.quotas, p.period
+    FROM asset a JOIN plan p ON p.device_id = a.asset_id
+    WHERE a.store_id = $1 AND a.kind = '{AssetKind.DEVICE.value}'
+      AND a.deleted_at IS NULL AND p.deleted_at IS NULL
+    UNION ALL
+    SELECT p.plan_id, p.initial_date, p.quotas, p.period
+    FROM asset a JOIN plan p ON p.television_id = a.asset_id
+    WHERE a.store_id = $1 AND a.kind = '{AssetKind.TELEVISION.value}'
+      AND a.deleted_at IS NULL AND p.deleted_at IS NULL
+), per_plan AS (
+    SELECT sp.initial_date, sp.quotas, sp.period,
+           count(pay.payment_id) AS paid,
+           count(pay.payment_id) FILTER (WHERE pay.date >= $3::timestamptz) AS today_count,
+           coalesce(sum(pay.value) FILTER (WHERE pay.date >= $3::timestamptz), 0) AS today_value,
+           count(pay.payment_id) FILTER (WHERE pay.date >= $4::timestamptz) AS month_count,
+           coalesce(sum(pay.value) FILTER (WHERE pay.date >= $4::timestamptz), 0) AS month_value
+    FROM store_plans sp
+    LEFT JOIN payment pay
+      ON pay.plan_id = sp.plan_id AND pay.state = '{PaymentState.APPROVED.value}'
+      AND pay.deleted_at IS NULL
+    GROUP BY sp.plan_id, sp.initial_date, sp.quotas, sp.period
+)
+SELECT count(*) FILTER (WHERE paid < quotas) AS active_plans,
+       count(*) FILTER (
+           WHERE paid < quotas AND period > 0 AND initial_date <= $2::date
+             AND paid < least(quotas, ($2::date - initial_date) / period + 1)
+       ) AS overdue_plans,
+       coalesce(sum(today_count), 0)::bigint AS today_count,
+       coalesce(sum(today_value), 0) AS today_value,
+       coalesce(sum(month_count), 0)::bigint AS month_count,
+       coalesce(sum(month_value), 0) AS month_value
+FROM per_plan
+"""
+
+
+def _asset_counts(rows: List[Dict[str, Any]], kind: AssetKind) -> AssetCounts:
+    by_state = {row["state"]: row["n"] for row in rows if row["kind"] == kind.value}
+    return AssetCounts(total=sum(by_state.values()), by_state=by_state)
+
+
+class StoreSummaryService:
+    def __init__(self) -> None:
+        self._summaries: TTLCache[UUID, Optional[StoreSummary]] = register_cache(
+            "store_summary", TTLCache(ttl=settings.STORE_SUMMARY_CACHE_TTL)
+        )
+
+    async def summary(self, store_id: UUID) -> Optional[StoreSummary]:
+        """Resumen de la tienda, o None si no existe."""
+        summary = await self._summaries.get_or_load(
+            store_id, lambda: self._load(store_id)
+        )
+        if summary is None:
+            self._summaries.invalidate(store_id)
+        return summary
+
+    @replica_reads
+    async def _load(self, store_id: UUID) -> Optional[StoreSummary]:
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        day_start = datetime.combine(today, time.min, tzinfo=timezone.utc)
+        month_start = day_start.replace(day=1)
+
+        balance, assets, users, plans = await asyncio.gather(
+            store_token_service.balance(store_id),
+            read_connection(Asset).execute_query_dict(_ASSETS, [store_id]),
+            read_connection(User).execute_query_dict(_USERS, [store_id]),
+            read_connection(Plan).execute_query_dict(
+                _PLANS, [store_id, today, day_start, month_start]
+            ),
+        )
+        if balance is None:
+            return None
+
+        roles = {row["role"]: row["n"] for row in users}
+        totals = plans[0]
+        return StoreSummary(
+            store_id=store_id,
+            devices=_asset_counts(assets, AssetKind.DEVICE),
+            televisions=_asset_counts(assets, AssetKind.TELEVISION),
+            customers=roles.get(CUSTOMER_ROLE, 0),
+            vendors=roles.get(VENDOR_ROLE, 0),
+            users_by_role=roles,
+            active_plans=totals["active_plans"],
+            overdue_plans=totals["overdue_plans"],
+            payments_today=PaymentTotals(
+                count=totals["today_count"], value=Decimal(totals["today_value"])
+            ),
+            payments_month=PaymentTotals(
+                count=totals["month_count"], value=Decimal(totals["month_value"])
+            ),
+            tokens=balance["balance"],
+            generated_at=now,
+        )
+
+
+store_summary_service = StoreSummaryService()
@@ -0,0 +1,343 @@
+"""
+Saldo de tokens de las tiendas.
+
+`store.tokens_disponibles` se modificaba leyendo la tienda, cambiando el
+valor en Python y guardando (`CRUDBase.update`): dos enrolamientos
+simultáneos de la misma tienda perdían una de las actualizaciones. Aquí cada
+movimiento es una única sentencia:
+
+- Consumo: `UPDATE ... SET tokens = tokens - n WHERE tokens >= n RETURNING`,
+  encadenado con el INSERT en `store_token_ledger` (una CTE, un viaje). Si no
+  hay saldo no se actualiza nada.
+- El libro (`store_token_ledger`) solo admite inserciones; la suma de `delta`
+  es el saldo.
+- Tiendas muy concurridas: el saldo se puede repartir entre N contadores
+  (`store_token_shard`). Cada consumo toma un contador con saldo al azar con
+  `FOR UPDATE SKIP LOCKED`, así que los enrolamientos simultáneos no esperan
+  al mismo bloqueo de fila. Si todos los que bastan están ocupados se
+  reintenta; solo si ningún contador basta por sí solo se bloquean la tienda
+  y todos sus contadores y se descuenta de varios.
+- Bloqueos: siempre la tienda antes que los contadores, y la tienda con
+  `FOR NO KEY UPDATE`. Un `FOR UPDATE` sobre la tienda choca con el
+  `KEY SHARE` que toma la FK de cada INSERT en el libro: el consumo de un
+  contador (que ya lo tiene bloqueado) esperaría a la tienda mientras el
+  bloqueo general espera a ese contador, y Postgres aborta uno por deadlock.
+- Con contadores, `store.tokens_disponibles` solo guarda lo abonado mientras
+  todos estaban bloqueados. Las respuestas muestran el total
+  (`with_balances`).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from app.infra.postgres.models.store_token import StoreTokenLedger, TokenReason
+
+_LEDGER_COLUMNS = "store_id, delta, reason, reference, shard, balance_after"
+
+_CONSUME_STORE = f"""
+WITH counter AS (
+    UPDATE store SET tokens_disponibles = tokens_disponibles - $2
+    WHERE id = $1 AND tokens_disponibles >= $2
+    RETURNING id, tokens_disponibles
+)
+INSERT INTO store_token_ledger ({_LEDGER_COLUMNS})
+SELECT id, -$2, '{TokenReason.CONSUME.value}', $3, NULL, tokens_disponibles FROM counter
+RETURNING *
+"""
+
+_CONSUME_SHARD = f"""
+WITH picked AS (
+    SELECT id FROM store_token_shard
+    WHERE store_id = $1 AND tokens >= $2
+    ORDER BY random() LIMIT 1
+    FOR UPDATE SKIP LOCKED
+), counter AS (
+    UPDATE store_token_shard t SET tokens = t.tokens - $2
+    FROM picked WHERE t.id = picked.id
+    RETURNING t.store_id, t.shard, t.tokens
+)
+INSERT INTO store_token_ledger ({_LEDGER_COLUMNS})
+SELECT store_id, -$2, '{TokenReason.CONSUME.value}', $3, shard, tokens FROM counter
+RETURNING *
+"""
+
+# ¿Algún contador (bloqueado o no) basta por sí solo?
+_SHARD_FITS = (
+    "SELECT EXISTS (SELECT 1 FROM store_token_shard "
+    "WHERE store_id = $1 AND tokens >= $2) AS fits"
+)
+
+# Intentos de _CONSUME_SHARD mientras los contadores que bastan estén ocupados
+_SHARD_ATTEMPTS = 3
+
+# El contador con menos saldo que no esté bloqueado
+_CREDIT_SHARD = f"""
+WITH picked AS (
+    SELECT id FROM store_token_shard
+    WHERE store_id = $1
+    ORDER BY tokens LIMIT 1
+    FOR UPDATE SKIP LOCKED
+), counter AS (
+    UPDATE store_token_shard t SET tokens = t.tokens + $2
+    FROM picked WHERE t.id = picked.id
+    RETURNING t.store_id, t.shard, t.tokens
+)
+INSERT INTO store_token_ledger ({_LEDGER_COLUMNS})
+SELECT store_id, $2, '{TokenReason.CREDIT.value}', $3, shard, tokens FROM counter
+RETURNING *
+"""
+
+_CREDIT_STORE = f"""
+WITH counter AS (
+    UPDATE store SET tokens_disponibles = tokens_disponibles + $2
+    WHERE id = $1
+    RETURNING id, tokens_disponibles
+)
+INSERT INTO store_token_ledger ({_LEDGER_COLUMNS})
+SELECT id, $2, '{TokenReason.CREDIT.value}', $3, NULL, tokens_disponibles FROM counter
+RETURNING *
+"""
+
+_INSERT_ENTRY = (
+    f"INSERT INTO store_token_ledger ({_LEDGER_COLUMNS}) "
+    "VALUES ($1, $2, $3, $4, $5, $6) RETURNING *"
+)
+
+# Compatible con el KEY SHARE de la FK del libro (ver arriba)
+_LOCK_STORE = "SELECT tokens_disponibles FROM store WHERE id = $1 FOR NO KEY UPDATE"
+
+
+def _split(total: int, shards: int) -> List[int]:
+    base, extra = divmod(total, shards)
+    return [base + (1 if shard < extra else 0) for shard in range(shards)]
+
+
+class StoreTokenService:
+    async def balance(self, store_id: UUID) -> Optional[Dict[str, Any]]:
+        rows = await connections.get("default").execute_query_dict(
+            "SELECT s.id AS store_id, s.tokens_disponibles + coalesce(sum(t.tokens), 0) AS balance, "
+            "count(t.id) AS shards FROM store s "
+            "LEFT JOIN store_token_shard t ON t.store_id = s.id "
+            "WHERE s.id = $1 GROUP BY s.id",
+            [store_id],
+        )
+        return rows[0] if rows else None
+
+    async def with_balances(self, stores: Iterable[Any]) -> None:
+        """
+        Suma los contadores al `tokens_disponibles` de cada tienda (instancias
+        de Store, esquemas o diccionarios con `id`) para que la respuesta
+        muestre el saldo total. Una consulta para todas. Las instancias así
+        modificadas son solo para responder: no se guardan con save().
+        """
+        by_id: Dict[UUID, List[Any]] = {}
+        seen = set()
+        for store in stores:
+            if store is None or id(store) in seen:
+                continue
+            seen.add(id(store))
+            if isinstance(store, dict):
+                if "id" in store and "tokens_disponibles" in store:
+                    by_id.setdefault(store["id"], []).append(store)
+            else:
+                by_id.setdefault(store.id, []).append(store)
+        if not by_id:
+            return
+        rows = await connections.get("default").execute_query_dict(
+            "SELECT store_id, sum(tokens)::int AS tokens FROM store_token_shard "
+            "WHERE store_id = ANY($1::uuid[]) GROUP BY store_id",
+            [list(by_id)],
+        )
+        for row in rows:
+            # asyncpg devuelve su propio tipo UUID
+            for store in by_id.get(UUID(str(row["store_id"])), ()):
+                if isinstance(store, dict):
+                    store["tokens_disponibles"] += row["tokens"]
+                else:
+                    store.tokens_disponibles += row["tokens"]
+
+    async def consume(
+        self, store_id: UUID, amount: int, *, reference: Optional[str] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Descuenta `amount` tokens. Devuelve los movimientos registrados (uno,
+        salvo que se descuente de varios contadores) o None si no hay saldo o
+        la tienda no existe.
+        """
+        conn = connections.get("default")
+        rows = await conn.execute_query_dict(
+            _CONSUME_STORE, [store_id, amount, reference]
+        )
+        if rows:
+            return rows
+        for _ in range(_SHARD_ATTEMPTS):
+            rows = await conn.execute_query_dict(
+                _CONSUME_SHARD, [store_id, amount, reference]
+            )
+            if rows:
+                return rows
+            # SKIP LOCKED no distingue "sin saldo" de "ocupados": solo se
+            # reintenta si algún contador bastaría
+            fits = await conn.execute_query_dict(_SHARD_FITS, [store_id, amount])
+            if not fits[0]["fits"]:
+                break
+        return await self._consume_from_all_shards(store_id, amount, reference)
+
+    async def _consume_from_all_shards(
+        self, store_id: UUID, amount: int, reference: Optional[str]
+    ) -> Optional[List[Dict[str, Any]]]:
+        # Ni la tienda ni un contador libre bastan por sí solos: se bloquean
+        # todos (la tienda primero, como en _redistribute)
+        async with in_transaction() as conn:
+            stores = await conn.execute_query_dict(_LOCK_STORE, [store_id])
+            if not stores:
+                return None
+            shards = await conn.execute_query_dict(
+                "SELECT id, shard, tokens FROM store_token_shard "
+                "WHERE store_id = $1 ORDER BY shard FOR UPDATE",
+                [store_id],
+            )
+            counters = [
+                {"id": None, "shard": None, "tokens": stores[0]["tokens_disponibles"]}
+            ]
+            counters.extend(shards)
+            if sum(counter["tokens"] for counter in counters) < amount:
+                return None
+            entries = []
+            remaining = amount
+            for counter in counters:
+                take = min(counter["tokens"], remaining)
+                if not take:
+                    continue
+                if counter["id"] is None:
+                    await conn.execute_query(
+                        "UPDATE store SET tokens_disponibles = tokens_disponibles - $2 "
+                        "WHERE id = $1",
+                        [store_id, take],
+                    )
+                else:
+                    await conn.execute_query(
+                        "UPDATE store_token_shard SET tokens = tokens - $2 WHERE id = $1",
+                        [counter["id"], take],
+                    )
+                entries.extend(
+                    await conn.execute_query_dict(
+                        _INSERT_ENTRY,
+                        [
+                            store_id,
+                            -take,
+                            TokenReason.CONSUME.value,
+                            reference,
+                            counter["shard"],
+                            counter["tokens"] - take,
+                        ],
+                    )
+                )
+                remaining -= take
+                if not remaining:
+                    break
+            return entries
+
+    async def credit(
+        self, store_id: UUID, amount: int, *, reference: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """Suma `amount` tokens. Devuelve el movimiento, o None si la tienda no existe."""
+        conn = connections.get("default")
+        for query in (_CREDIT_SHARD, _CREDIT_STORE):
+            rows = await conn.execute_query_dict(query, [store_id, amount, reference])
+            if rows:
+                return rows[0]
+        return None
+
+    async def set_balance(
+        self,
+        store_id: UUID,
+        balance: int,
+        *,
+        reason: TokenReason = TokenReason.ADJUSTMENT,
+    ) -> Optional[Dict[str, Any]]:
+        """Fija el saldo total y registra la diferencia. None si la tienda no existe."""
+        return await self._redistribute(store_id, balance=balance, reason=reason)
+
+    async def configure_shards(
+        self, store_id: UUID, shards: int
+    ) -> Optional[Dict[str, Any]]:
+        """Reparte el saldo entre `shards` contadores (0 lo devuelve a la tienda)."""
+        return await self._redistribute(
+            store_id, shards=shards, reason=TokenReason.RESHARD
+        )
+
+    async def _redistribute(
+        self,
+        store_id: UUID,
+        *,
+        reason: TokenReason,
+        balance: Optional[int] = None,
+        shards: Optional[int] = None,
+    ) -> Optional[Dict[str, Any]]:
+        async with in_transaction() as conn:
+            rows = await conn.execute_query_dict(_LOCK_STORE, [store_id])
+            if not rows:
+                return None
+            current = await conn.execute_query_dict(
+                "SELECT tokens FROM store_token_shard WHERE store_id = $1 ORDER BY shard FOR UPDATE",
+                [store_id],
+            )
+            total = rows[0]["tokens_disponibles"] + sum(
+                row["tokens"] for row in current
+            )
+            balance = total if balance is None else balance
+            shards = len(current) if shards is None else shards
+            if balance == total and shards == len(current):
+                return {"store_id": store_id, "balance": balance, "shards": shards}
+
+            await self._write_counters(conn, store_id, balance, shards)
+            await conn.execute_query(
+                _INSERT_ENTRY,
+                [store_id, balance - total, reason.value, None, None, balance],
+            )
+        return {"store_id": store_id, "balance": balance, "shards": shards}
+
+    async def _write_counters(
+        self, conn: BaseDBAsyncClient, store_id: UUID, balance: int, shards: int
+    ) -> None:
+        await conn.execute_query(
+            "DELETE FROM store_token_shard WHERE store_id = $1", [store_id]
+        )
+        if shards:
+            await conn.execute_query(
+                "INSERT INTO store_token_shard (store_id, shard, tokens) "
+                "SELECT $1, shard - 1, tokens FROM unnest($2::int[]) WITH ORDINALITY AS s(tokens, shard)",
+                [store_id, _split(balance, shards)],
+            )
+        await conn.execute_query(
+            "UPDATE store SET tokens_disponibles = $2 WHERE id = $1",
+            [store_id, 0 if shards else balance],
+        )
+
+    async def record_opening(self, store_id: UUID, balance: int) -> None:
+        """Saldo inicial de una tienda recién creada."""
+        if balance:
+            await StoreTokenLedger.create(
+                store_id=store_id,
+                delta=balance,
+                reason=TokenReason.OPENING,
+                balance_after=balance,
+            )
+
+    async def ledger(
+        self, store_id: UUID, *, skip: int = 0, limit: int = 100
+    ) -> List[StoreTokenLedger]:
+        return (
+            await StoreTokenLedger.filter(store_id=store_id)
+            .order_by("-created_at")
+            .offset(skip)
+            .limit(limit)
+        )
+
+
+store_token_service = StoreTokenService()
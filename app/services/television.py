@@ -1,15 +1,36 @@
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
+from uuid import UUID
 
 from fastapi import HTTPException, status
 from tortoise.exceptions import IntegrityError
 
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import register_cache
 from app.infra.postgres.crud.television import crud_television
+from app.infra.postgres.models.asset import Asset, AssetKind
 from app.infra.postgres.models.television import Television
-from app.schemas.television import TelevisionCreate, TelevisionUpdate
+from app.infra.postgres.pagination import Cursor, paginate
+from app.schemas.television import TelevisionCreate, TelevisionDB, TelevisionUpdate
+from app.services.asset import asset_service
 from app.services.base import BaseService
 
+# Columnas de TelevisionDB
+_COLUMNS = tuple(TelevisionDB.__fields__)
+
 
 class TelevisionService(BaseService[Television, TelevisionCreate, TelevisionUpdate]):
+    def __init__(self, crud):
+        super().__init__(crud)
+        # Check-in de los televisores: número de serie -> fila (solo los que existen)
+        self._by_serial: TTLCache[str, Dict[str, Any]] = register_cache(
+            "television_by_serial",
+            TTLCache(
+                ttl=settings.TELEVISION_SERIAL_CACHE_TTL,
+                maxsize=settings.TELEVISION_SERIAL_CACHE_SIZE,
+            ),
+        )
+
     async def create(self, *, obj_in: TelevisionCreate) -> Television:
         try:
             return await self.crud.create(obj_in=obj_in)
@@ -27,13 +48,97 @@ class TelevisionService(BaseService[Television, TelevisionCreate, TelevisionUpda
                 detail=f"Database integrity error: {e}",
             )
 
-    async def count(self) -> int:
+    async def list_page(
+        self,
+        *,
+        enrolment_id: Optional[UUID] = None,
+        user_id: Optional[UUID] = None,
+        store_id: Optional[UUID] = None,
+        after: Optional[Cursor] = None,
+        limit: int = 100,
+    ) -> List[Television]:
+        """
+        Página de televisores, los más recientes primero. La tienda es la de
+        `asset` (ver AssetService.ids_in_store), igual que en count().
+        """
+        query = Television.all()
+        if enrolment_id:
+            query = query.filter(enrolment_id=enrolment_id)
+        if user_id:
+            query = query.filter(enrolment__user_id=user_id)
+        if store_id:
+            query = query.filter(
+                television_id__in=asset_service.ids_in_store(store_id, AssetKind.TELEVISION)
+            )
+        return await paginate(query, "television_id", after=after, limit=limit)
+
+    async def get_by_serial(self, serial_number: str) -> Optional[Dict[str, Any]]:
+        television = await self._by_serial.get_or_load(
+            serial_number,
+            lambda: Television.filter(serial_number=serial_number).first().values(*_COLUMNS),
+        )
+        if television is None:
+            # No se guardan las ausencias: el televisor puede darse de alta ya
+            self._by_serial.invalidate(serial_number)
+        return television
+
+    async def get_by_serials(self, serial_numbers: List[str]) -> List[Dict[str, Any]]:
+        """Televisores de los números de serie dados, en el mismo orden; omite los que no existen."""
+        found: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for serial_number in dict.fromkeys(serial_numbers):
+            television = self._by_serial.get(serial_number)
+            if television is None:
+                missing.append(serial_number)
+            else:
+                found[serial_number] = television
+        if missing:
+            rows = await Television.filter(serial_number__in=missing).values(*_COLUMNS)
+            for row in rows:
+                self._by_serial.set(row["serial_number"], row)
+                found[row["serial_number"]] = row
+        return [found[serial] for serial in dict.fromkeys(serial_numbers) if serial in found]
+
+    async def _serial_of(self, id: Any) -> Optional[str]:
+        return await Television.all_objects.filter(pk=id).first().values_list(
+            "serial_number", flat=True
+        )
+
+    def _forget(self, serial_number: Optional[str]) -> None:
+        if serial_number is not None:
+            self._by_serial.invalidate(serial_number)
+
+    async def update(self, *, id: Any, obj_in: TelevisionUpdate) -> Optional[Television]:
+        serial_number = await self._serial_of(id)
+        updated = await super().update(id=id, obj_in=obj_in)
+        self._forget(serial_number)
+        return updated
+
+    async def delete(self, *, id: Any) -> bool:
+        serial_number = await self._serial_of(id)
+        deleted = await super().delete(id=id)
+        self._forget(serial_number)
+        return deleted
+
+    async def restore(self, *, id: Any) -> Optional[Television]:
+        restored = await super().restore(id=id)
+        if restored is not None:
+            self._forget(restored.serial_number)
+        return restored
+
+    async def count(self, store_id: Optional[UUID] = None) -> int:
         """
         Count the total number of devices in the system.
 
+        With store_id, counts the store's televisions from the asset table
+        (idx_asset_store_created_live) instead of joining enrolments, with the
+        same store rule as the list (AssetService.ids_in_store).
+
         Returns:
             int: The total count of devices
         """
+        if store_id is not None:
+            return await Asset.filter(store_id=store_id, kind=AssetKind.TELEVISION).count()
         return await self.crud.count(payload={})
 
 
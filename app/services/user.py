@@ -1,38 +1,101 @@
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Sequence
 
+from fastapi import HTTPException
+from tortoise.exceptions import IntegrityError
 from tortoise.expressions import Q
 
 from app.infra.postgres.crud.user import crud_user
+from app.infra.postgres.models.store import Store
 from app.infra.postgres.models.user import User
-from app.schemas.user import UserCreate
+from app.infra.postgres.projection import Projection
+from app.schemas.user import UserCreate, UserUpdate
 from app.services.base import BaseService
+from app.services.store_token import store_token_service
 from uuid import UUID
 
+
+async def _with_store_balances(users: Iterable[Any]) -> None:
+    """Saldo total de tokens en la tienda de cada usuario (ver `with_balances`)."""
+    stores = []
+    for user in users:
+        if isinstance(user, dict):
+            store = user.get("store")
+        else:
+            # Sin precargar, `user.store` es una consulta pendiente
+            store = getattr(user, "store", None) if user is not None else None
+        if isinstance(store, (Store, dict)):
+            stores.append(store)
+    await store_token_service.with_balances(stores)
+
+
 class UserService(BaseService):
     async def get_by_id(self, user_id: UUID) -> Optional[User]:
         """Obtiene un usuario por ID con relaciones precargadas."""
-        return await crud_user.get_by_id(user_id=user_id)
+        user = await crud_user.get_by_id(user_id=user_id)
+        await _with_store_balances([user])
+        return user
     
     async def get_by_dni(self, *, dni: str) -> Optional[User]:
-        return await self.crud.get_by_dni(dni=dni)
+        user = await self.crud.get_by_dni(dni=dni)
+        await _with_store_balances([user])
+        return user
 
     async def get_by_email(self, *, email: str) -> Optional[User]:
-        return await self.crud.get_by_email(email=email)
+        user = await self.crud.get_by_email(email=email)
+        await _with_store_balances([user])
+        return user
+
+    async def get_all(self, **kwargs: Any) -> List[User]:
+        users = await super().get_all(**kwargs)
+        await _with_store_balances(users)
+        return users
         
     async def get_all_with_filter(self, q_filter: Q, *, payload: Dict[str, Any] = None, skip: int = 0, limit: int = 100) -> List[User]:
         """Obtiene usuarios aplicando un filtro Q de Tortoise ORM además de los filtros regulares."""
-        return await self.crud.get_all_with_filter(q_filter=q_filter, payload=payload, skip=skip, limit=limit)
+        users = await self.crud.get_all_with_filter(q_filter=q_filter, payload=payload, skip=skip, limit=limit)
+        await _with_store_balances(users)
+        return users
+
+    async def get_all_projected(self, projection: Projection, **kwargs: Any) -> List[Dict[str, Any]]:
+        rows = await super().get_all_projected(projection, **kwargs)
+        await _with_store_balances(rows)
+        return rows
+
+    async def get_projected(self, projection: Projection, *, id: Any) -> Optional[Dict[str, Any]]:
+        row = await super().get_projected(projection, id=id)
+        await _with_store_balances([row])
+        return row
 
     async def create(self, *, obj_in: UserCreate) -> Optional[User]:
-        """Crea un usuario y precarga las relaciones para la respuesta."""
-        # Primero, crea el usuario usando el método base
-        new_user = await super().create(obj_in=obj_in)
-        
-        # Si el usuario se creó correctamente, obténlo de nuevo con las relaciones
-        if new_user:
-            return await self.get_by_id(user_id=new_user.user_id)
-        
-        return None
+        """Crea un usuario; el CRUD ya devuelve las relaciones de la respuesta."""
+        user = await super().create(obj_in=obj_in)
+        await _with_store_balances([user])
+        return user
+
+    async def update(
+        self, *, id: UUID, obj_in: UserUpdate, expand: Sequence[str] = ()
+    ) -> Optional[User]:
+        """
+        Actualización parcial en una sola consulta (UPDATE ... RETURNING).
+
+        Las relaciones de la respuesta solo se cargan si se piden en `expand`.
+        """
+        try:
+            user = await self.crud.update_partial(id=id, obj_in=obj_in, expand=expand)
+        except IntegrityError as e:
+            error_message = str(e).lower()
+            if "violates foreign key constraint" in error_message:
+                raise HTTPException(status_code=400, detail="Referencia a entidad relacionada no válida.")
+            elif "unique constraint" in error_message or "duplicate key" in error_message:
+                if "username" in error_message:
+                    raise HTTPException(status_code=409, detail="Ya existe un usuario con este username.")
+                elif "dni" in error_message:
+                    raise HTTPException(status_code=409, detail="Ya existe un usuario con este DNI en la tienda.")
+                raise HTTPException(status_code=409, detail="El recurso ya existe o viola una restricción única.")
+            else:
+                raise HTTPException(status_code=500, detail=f"Error de integridad de datos: {error_message}")
+        await _with_store_balances([user])
+        return user
 
 
 user_service = UserService(crud=crud_user)
@@ -0,0 +1,292 @@
+from datetime import datetime, timezone
+from functools import lru_cache
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from uuid import UUID, uuid4
+
+from pydantic import ValidationError
+from tortoise import Tortoise
+from tortoise.exceptions import IntegrityError
+from tortoise.transactions import in_transaction
+
+from app.core.config import settings
+from app.core.metrics import register_cache
+from app.core.records import RecordFormatError, format_validation_error, iter_records
+from app.core.security import hash_passwords, is_password_hash
+from app.schemas.user_import import UserImportReport, UserImportRow, UserImportRowError
+
+_USER_COLUMNS = (
+    "user_id",
+    "city_id",
+    "store_id",
+    "dni",
+    "first_name",
+    "middle_name",
+    "last_name",
+    "second_last_name",
+    "email",
+    "prefix",
+    "phone",
+    "address",
+    "username",
+    "password",
+    "role_id",
+    "state",
+    "created_at",
+    "updated_at",
+)
+
+
+@lru_cache(maxsize=16)
+def _insert_sql(rows: int) -> str:
+    width = len(_USER_COLUMNS)
+    values = ", ".join(
+        "(" + ", ".join(f"${row * width + col + 1}" for col in range(width)) + ")"
+        for row in range(rows)
+    )
+    columns = ", ".join(_USER_COLUMNS)
+    return (
+        f'INSERT INTO "user" ({columns}) VALUES {values} '
+        "ON CONFLICT DO NOTHING RETURNING user_id"
+    )
+
+
+register_cache("user_import_sql", _insert_sql)
+
+
+class UserImportService:
+    """Carga masiva de usuarios desde CSV o NDJSON."""
+
+    async def import_users(
+        self,
+        data: bytes,
+        *,
+        fmt: str,
+        default_store_id: Optional[UUID] = None,
+        batch_size: Optional[int] = None,
+        accept_password_hashes: bool = False,
+    ) -> UserImportReport:
+        """
+        Con `accept_password_hashes` las contraseñas que ya son un hash bcrypt
+        se guardan tal cual; si no, todas se hashean como texto plano.
+        """
+        started = perf_counter()
+        batch_size = batch_size or settings.USER_IMPORT_BATCH_SIZE
+        errors: Dict[int, UserImportRowError] = {}
+
+        def fail(row: int, username: Optional[str], *messages: str) -> None:
+            entry = errors.setdefault(
+                row, UserImportRowError(row=row, username=username, errors=[])
+            )
+            entry.errors.extend(messages)
+
+        # 1. Parseo y validación de filas
+        parsed: List[Tuple[int, UserImportRow]] = []
+        total = 0
+        for record in iter_records(data, fmt):
+            total += 1
+            if total > settings.USER_IMPORT_MAX_ROWS:
+                raise RecordFormatError(
+                    f"La carga supera el máximo de {settings.USER_IMPORT_MAX_ROWS} filas"
+                )
+            if record.error:
+                fail(record.row, None, record.error)
+                continue
+            try:
+                row = UserImportRow(**record.data)
+            except ValidationError as e:
+                fail(
+                    record.row, record.data.get("username"), *format_validation_error(e)
+                )
+                continue
+            if row.store_id is None and default_store_id is not None:
+                row.store_id = default_store_id
+            parsed.append((record.row, row))
+
+        # 2. Duplicados dentro del mismo archivo
+        seen_usernames: Dict[str, int] = {}
+        seen_dnis: Dict[Tuple[Optional[UUID], str], int] = {}
+        unique_rows: List[Tuple[int, UserImportRow]] = []
+        for line, row in parsed:
+            username_key = row.username.lower()
+            dni_key = (row.store_id, row.dni)
+            if username_key in seen_usernames:
+                fail(
+                    line,
+                    row.username,
+                    f"username duplicado en la fila {seen_usernames[username_key]}",
+                )
+                continue
+            if dni_key in seen_dnis:
+                fail(
+                    line,
+                    row.username,
+                    f"DNI duplicado para la tienda en la fila {seen_dnis[dni_key]}",
+                )
+                continue
+            seen_usernames[username_key] = line
+            seen_dnis[dni_key] = line
+            unique_rows.append((line, row))
+
+        # 3. Resolución de referencias: una consulta por tabla
+        cities = await self._resolve(
+            "city",
+            "city_id",
+            names={row.city for _, row in unique_rows if row.city and not row.city_id},
+            ids={row.city_id for _, row in unique_rows if row.city_id},
+        )
+        roles = await self._resolve(
+            "role",
+            "role_id",
+            names={row.role for _, row in unique_rows if row.role and not row.role_id},
+            ids={row.role_id for _, row in unique_rows if row.role_id},
+        )
+        stores = await self._existing_stores(
+            {row.store_id for _, row in unique_rows if row.store_id}
+        )
+
+        ready: List[Tuple[int, UserImportRow, UUID, UUID]] = []
+        for line, row in unique_rows:
+            row_errors = []
+            city_id, city_error = self._pick(cities, row.city_id, row.city, "Ciudad")
+            role_id, role_error = self._pick(roles, row.role_id, row.role, "Rol")
+            if city_error:
+                row_errors.append(city_error)
+            if role_error:
+                row_errors.append(role_error)
+            if row.store_id and row.store_id not in stores:
+                row_errors.append(f"Tienda {row.store_id} no encontrada")
+            if row_errors:
+                fail(line, row.username, *row_errors)
+                continue
+            ready.append((line, row, city_id, role_id))
+
+        # 4. Hash de contraseñas en paralelo
+        pending = [
+            index
+            for index, (_, row, _, _) in enumerate(ready)
+            if not (accept_password_hashes and is_password_hash(row.password))
+        ]
+        hashed = await hash_passwords([ready[index][1].password for index in pending])
+        passwords = [row.password for _, row, _, _ in ready]
+        for index, value in zip(pending, hashed):
+            passwords[index] = value
+
+        # 5. Inserción por lotes, una transacción por lote
+        created = 0
+        for start in range(0, len(ready), batch_size):
+            batch = ready[start : start + batch_size]
+            created += await self._insert_batch(
+                batch, passwords[start : start + batch_size], fail
+            )
+
+        duration = perf_counter() - started
+        return UserImportReport(
+            total=total,
+            created=created,
+            failed=len(errors),
+            duration_ms=round(duration * 1000, 2),
+            users_per_minute=round(created / duration * 60, 1) if duration else 0.0,
+            errors=[errors[row] for row in sorted(errors)],
+        )
+
+    async def _resolve(
+        self, table: str, pk: str, *, names: Set[str], ids: Set[UUID]
+    ) -> Dict[str, List[UUID]]:
+        """Devuelve {nombre en minúsculas | id en texto: [ids]} en una sola consulta."""
+        if not names and not ids:
+            return {}
+        conn = Tortoise.get_connection("default")
+        rows = await conn.execute_query_dict(
+            f"SELECT {pk} AS id, lower(name) AS name FROM {table} "
+            "WHERE lower(name) = ANY($1::text[]) OR "
+            f"{pk} = ANY($2::uuid[])",
+            [[name.lower() for name in names], list(ids)],
+        )
+        resolved: Dict[str, List[UUID]] = {}
+        for item in rows:
+            resolved.setdefault(item["name"], []).append(item["id"])
+            resolved[str(item["id"])] = [item["id"]]
+        return resolved
+
+    async def _existing_stores(self, ids: Set[UUID]) -> Set[UUID]:
+        if not ids:
+            return set()
+        conn = Tortoise.get_connection("default")
+        rows = await conn.execute_query_dict(
+            "SELECT id FROM store WHERE id = ANY($1::uuid[])", [list(ids)]
+        )
+        return {item["id"] for item in rows}
+
+    @staticmethod
+    def _pick(
+        resolved: Dict[str, List[UUID]],
+        ref_id: Optional[UUID],
+        name: Optional[str],
+        label: str,
+    ) -> Tuple[Optional[UUID], Optional[str]]:
+        if ref_id:
+            if str(ref_id) not in resolved:
+                return None, f"{label} {ref_id} no encontrado"
+            return ref_id, None
+        matches = resolved.get(name.lower(), [])
+        if not matches:
+            return None, f"{label} '{name}' no encontrado"
+        if len(matches) > 1:
+            return None, f"{label} '{name}' es ambiguo; use el ID"
+        return matches[0], None
+
+    async def _insert_batch(
+        self,
+        batch: List[Tuple[int, UserImportRow, UUID, UUID]],
+        passwords: Iterable[str],
+        fail,
+    ) -> int:
+        now = datetime.now(timezone.utc)
+        params = []
+        user_ids = []
+        for (_, row, city_id, role_id), password in zip(batch, passwords):
+            user_id = uuid4()
+            user_ids.append(user_id)
+            params.extend(
+                (
+                    user_id,
+                    city_id,
+                    row.store_id,
+                    row.dni,
+                    row.first_name,
+                    row.middle_name,
+                    row.last_name,
+                    row.second_last_name,
+                    row.email,
+                    row.prefix,
+                    row.phone,
+                    row.address,
+                    row.username,
+                    password,
+                    role_id,
+                    row.state.value,
+                    now,
+                    now,
+                )
+            )
+        try:
+            async with in_transaction() as conn:
+                _, inserted = await conn.execute_query(_insert_sql(len(batch)), params)
+        except IntegrityError as e:
+            for line, row, _, _ in batch:
+                fail(line, row.username, f"Lote rechazado por la base de datos: {e}")
+            return 0
+
+        inserted_ids = {item["user_id"] for item in inserted}
+        for user_id, (line, row, _, _) in zip(user_ids, batch):
+            if user_id not in inserted_ids:
+                fail(
+                    line,
+                    row.username,
+                    "Ya existe un usuario con este username o DNI en la tienda",
+                )
+        return len(inserted_ids)
+
+
+user_import_service = UserImportService()
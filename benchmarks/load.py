@@ -0,0 +1,252 @@
+#!/usr/bin/env python
+"""
+Driver de carga HTTP para los endpoints calientes.
+
+Lanza `--concurrency` clientes concurrentes contra un servidor en marcha
+durante `--duration` segundos, eligiendo los escenarios de `scenarios.py`
+según su peso. Por escenario informa peticiones, errores, p50/p95/p99 y las
+consultas SQL por petición (leídas de la cabecera `Server-Timing`), guarda
+el resultado en JSON y lo compara con `benchmarks/baseline.json`.
+
+Uso:
+    python benchmarks/seed.py --scale 0.01           # una vez
+    uvicorn app.main:app --port 8000                  # en otra terminal
+    python benchmarks/load.py --base-url http://localhost:8000 --duration 60
+    python benchmarks/load.py ... --save-baseline     # fija la referencia
+
+Sale con código 1 si algún escenario empeora p95/p99 más de `--tolerance`
+o ejecuta más consultas que en la referencia.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+from collections import defaultdict
+from datetime import datetime, timezone
+from time import perf_counter
+from typing import Any, Dict, List, Optional
+
+import httpx
+from scenarios import SCENARIOS, load_manifest, queries_from_server_timing
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baseline.json")
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+
+class Samples:
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.queries: List[int] = []
+        self.errors = 0
+        self.statuses: Dict[int, int] = defaultdict(int)
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, int(round(p * len(ordered))) - 1))]
+
+
+async def worker(
+    client: httpx.AsyncClient,
+    manifest: Dict[str, Any],
+    scenarios: List[Any],
+    deadline: float,
+    samples: Dict[str, Samples],
+    rng: random.Random,
+    record: bool,
+) -> None:
+    weights = [scenario.weight for scenario in scenarios]
+    while perf_counter() < deadline:
+        scenario = rng.choices(scenarios, weights)[0]
+        request = scenario.build(manifest, rng)
+        started = perf_counter()
+        try:
+            response = await client.request(
+                request.method, request.path, params=request.params, json=request.json
+            )
+        except httpx.HTTPError:
+            if record:
+                samples[scenario.name].errors += 1
+            continue
+        elapsed = (perf_counter() - started) * 1000
+        if not record:
+            continue
+        sample = samples[scenario.name]
+        sample.latencies.append(elapsed)
+        sample.statuses[response.status_code] += 1
+        if response.status_code >= 400:
+            sample.errors += 1
+        queries = queries_from_server_timing(response.headers.get("server-timing"))
+        if queries is not None:
+            sample.queries.append(queries)
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    manifest = load_manifest()
+    scenarios = [s for s in SCENARIOS if not args.scenario or s.name in args.scenario]
+    if not scenarios:
+        raise SystemExit(f"Error: escenarios desconocidos {args.scenario}")
+
+    limits = httpx.Limits(
+        max_connections=args.concurrency, max_keepalive_connections=args.concurrency
+    )
+    async with httpx.AsyncClient(
+        base_url=args.base_url, limits=limits, timeout=30
+    ) as client:
+        for phase, seconds, record in (
+            ("Calentamiento", args.warmup, False),
+            ("Medición", args.duration, True),
+        ):
+            if seconds <= 0:
+                continue
+            print(f"{phase}: {seconds}s con {args.concurrency} clientes...")
+            samples: Dict[str, Samples] = defaultdict(Samples)
+            deadline = perf_counter() + seconds
+            await asyncio.gather(
+                *(
+                    worker(
+                        client,
+                        manifest,
+                        scenarios,
+                        deadline,
+                        samples,
+                        random.Random(args.seed + i),
+                        record,
+                    )
+                    for i in range(args.concurrency)
+                )
+            )
+
+    results = {}
+    for scenario in scenarios:
+        sample = samples[scenario.name]
+        results[scenario.name] = {
+            "requests": len(sample.latencies),
+            "errors": sample.errors,
+            "rps": round(len(sample.latencies) / args.duration, 1),
+            "p50_ms": round(percentile(sample.latencies, 0.50), 2),
+            "p95_ms": round(percentile(sample.latencies, 0.95), 2),
+            "p99_ms": round(percentile(sample.latencies, 0.99), 2),
+            "max_ms": round(max(sample.latencies, default=0.0), 2),
+            "queries_median": (
+                statistics.median(sample.queries) if sample.queries else None
+            ),
+            "queries_max": max(sample.queries) if sample.queries else None,
+            "statuses": dict(sample.statuses),
+        }
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "dataset": manifest.get("counts"),
+        "scenarios": results,
+    }
+
+
+def print_results(report: Dict[str, Any]) -> None:
+    print(
+        f"\n{'escenario':18} {'peticiones':>10} {'errores':>8} {'rps':>8} "
+        f"{'p50':>9} {'p95':>9} {'p99':>9} {'consultas':>10}"
+    )
+    for name, row in report["scenarios"].items():
+        queries = (
+            "-"
+            if row["queries_max"] is None
+            else f"{row['queries_median']:g}/{row['queries_max']}"
+        )
+        print(
+            f"{name:18} {row['requests']:>10} {row['errors']:>8} {row['rps']:>8} "
+            f"{row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms {queries:>10}"
+        )
+
+
+def compare(
+    report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float
+) -> List[str]:
+    """Lista de regresiones respecto a la referencia."""
+    regressions = []
+    for name, row in report["scenarios"].items():
+        base: Optional[Dict[str, Any]] = baseline.get("scenarios", {}).get(name)
+        if not base or not row["requests"]:
+            continue
+        for metric in ("p95_ms", "p99_ms"):
+            if base[metric] and row[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {metric} {row[metric]:.1f} > {base[metric]:.1f} (+{tolerance:.0%})"
+                )
+        if base.get("queries_max") is not None and row["queries_max"] is not None:
+            if row["queries_max"] > base["queries_max"]:
+                regressions.append(
+                    f"{name}: consultas/petición {row['queries_max']} > {base['queries_max']}"
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Prueba de carga de los endpoints calientes"
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--duration", type=float, default=60, help="Segundos de medición"
+    )
+    parser.add_argument(
+        "--warmup", type=float, default=5, help="Segundos de calentamiento sin medir"
+    )
+    parser.add_argument(
+        "--scenario", action="append", help="Limitar a estos escenarios (repetible)"
+    )
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument(
+        "--output", help="Archivo JSON de resultados (por defecto benchmarks/results/)"
+    )
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Guardar este resultado como referencia",
+    )
+    parser.add_argument(
+        "--tolerance", type=float, default=0.2, help="Empeoramiento admitido de p95/p99"
+    )
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_results(report)
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"load-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as file:
+        json.dump(report, file, indent=2)
+    print(f"\nResultados: {output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as file:
+            json.dump(report, file, indent=2)
+        print(f"Referencia guardada en {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("Sin referencia con la que comparar (use --save-baseline)")
+        return
+    with open(args.baseline) as file:
+        regressions = compare(report, json.load(file), args.tolerance)
+    if regressions:
+        print("\nRegresiones respecto a la referencia:")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print("\nSin regresiones respecto a la referencia")
+
+
+if __name__ == "__main__":
+    main()
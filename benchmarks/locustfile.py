@@ -0,0 +1,59 @@
+"""
+Perfil de carga para locust, con los mismos escenarios y pesos que `load.py`.
+
+Uso:
+    locust -f benchmarks/locustfile.py --host http://localhost:8000 \\
+        --users 64 --spawn-rate 8 --run-time 5m --headless --csv benchmarks/results/locust
+
+Las consultas SQL por petición (cabecera `Server-Timing`) se publican como
+una métrica aparte con nombre `<escenario>:queries`, cuyo "tiempo de
+respuesta" es el número de consultas.
+"""
+
+import random
+
+from locust import HttpUser, between, events, task
+from scenarios import SCENARIOS, load_manifest, queries_from_server_timing
+
+MANIFEST = load_manifest()
+
+
+def _make_task(scenario):
+    def run(user):
+        request = scenario.build(MANIFEST, user.rng)
+        with user.client.request(
+            request.method,
+            request.path,
+            params=request.params,
+            json=request.json,
+            name=scenario.name,
+            catch_response=True,
+        ) as response:
+            if response.status_code >= 400:
+                response.failure(f"HTTP {response.status_code}")
+                return
+            response.success()
+            queries = queries_from_server_timing(response.headers.get("server-timing"))
+            if queries is not None:
+                events.request.fire(
+                    request_type="SQL",
+                    name=f"{scenario.name}:queries",
+                    response_time=queries,
+                    response_length=0,
+                    exception=None,
+                    context={},
+                )
+
+    run.__name__ = scenario.name
+    return task(scenario.weight)(run)
+
+
+class SmartpayUser(HttpUser):
+    wait_time = between(0.05, 0.2)
+
+    def on_start(self):
+        self.rng = random.Random()
+
+
+for _scenario in SCENARIOS:
+    setattr(SmartpayUser, _scenario.name, _make_task(_scenario))
@@ -0,0 +1,103 @@
+"""
+Perfil de carga compartido por `load.py` y `locustfile.py`.
+
+Cada escenario es un endpoint caliente con su peso relativo y una función que,
+a partir del manifiesto de `seed.py`, construye una petición concreta.
+"""
+
+import json
+import os
+import random
+import re
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+MANIFEST_PATH = os.path.join(os.path.dirname(__file__), "data", "manifest.json")
+API = "/api/v1"
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    params: Optional[Dict[str, Any]] = None
+    json: Optional[Dict[str, Any]] = None
+
+
+class Scenario(NamedTuple):
+    name: str
+    weight: int
+    build: Callable[[Dict[str, Any], random.Random], Request]
+
+
+def load_manifest(path: str = MANIFEST_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        raise SystemExit(f"Error: no existe {path}. Ejecute antes benchmarks/seed.py")
+    with open(path) as file:
+        return json.load(file)
+
+
+def _imei_lookup(manifest: Dict[str, Any], rng: random.Random) -> Request:
+    return Request("GET", f"{API}/devices/imei/{rng.choice(manifest['imeis'])}")
+
+
+def _action_polling(manifest: Dict[str, Any], rng: random.Random) -> Request:
+    return Request(
+        "GET",
+        f"{API}/actions",
+        params={"device_id": rng.choice(manifest["device_ids"]), "state": "pending"},
+    )
+
+
+def _location_ingest(manifest: Dict[str, Any], rng: random.Random) -> Request:
+    return Request(
+        "POST",
+        f"{API}/locations/",
+        json={
+            "device_id": rng.choice(manifest["device_ids"]),
+            "latitude": 4.6 + rng.uniform(-0.5, 0.5),
+            "longitude": -74.08 + rng.uniform(-0.5, 0.5),
+        },
+    )
+
+
+def _payment_listing(manifest: Dict[str, Any], rng: random.Random) -> Request:
+    return Request(
+        "GET",
+        f"{API}/payments",
+        params={"store_id": rng.choice(manifest["store_ids"]), "limit": 100},
+    )
+
+
+def _plan_listing(manifest: Dict[str, Any], rng: random.Random) -> Request:
+    return Request(
+        "GET", f"{API}/plans", params={"user_id": rng.choice(manifest["user_ids"])}
+    )
+
+
+def _analytics(manifest: Dict[str, Any], rng: random.Random) -> Request:
+    return Request(
+        "GET",
+        f"{API}/analytics/date-range",
+        params={
+            "start_date": (date.today() - timedelta(days=30)).isoformat(),
+            "store_id": rng.choice(manifest["store_ids"]),
+        },
+    )
+
+
+SCENARIOS: List[Scenario] = [
+    Scenario("imei_lookup", 30, _imei_lookup),
+    Scenario("action_polling", 30, _action_polling),
+    Scenario("location_ingest", 25, _location_ingest),
+    Scenario("payment_listing", 6, _payment_listing),
+    Scenario("plan_listing", 6, _plan_listing),
+    Scenario("analytics", 3, _analytics),
+]
+
+_SERVER_TIMING_QUERIES = re.compile(r'(?:^|,)\s*db;desc="(\d+) queries"')
+
+
+def queries_from_server_timing(header: Optional[str]) -> Optional[int]:
+    """Número de consultas de la respuesta (formato de app.core.instrumentation)."""
+    match = _SERVER_TIMING_QUERIES.search(header or "")
+    return int(match.group(1)) if match else None
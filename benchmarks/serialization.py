@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Microbenchmark de serialización para listas de 1.000 planes con pagos.
+
+Compara el camino de FastAPI (validar cada fila con Pydantic, jsonable_encoder
+y json.dumps) con RowSerializer + orjson. No necesita base de datos: las filas
+son objetos en memoria con la misma forma que las instancias de Tortoise.
+
+Uso:
+    python benchmarks/serialization.py --rows 1000 --repeat 20
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from time import perf_counter
+from types import SimpleNamespace
+from uuid import uuid4
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from fastapi.encoders import jsonable_encoder
+
+from app.api.serialization import dumps, serializer_for
+from app.schemas.payment import PaymentState, PlanResponse
+
+
+def make_user():
+    return SimpleNamespace(
+        user_id=uuid4(),
+        first_name="Ana",
+        middle_name=None,
+        last_name="Pérez",
+        second_last_name="Gómez",
+    )
+
+
+def make_plan(payments_per_plan):
+    now = datetime.now(timezone.utc)
+    user, vendor = make_user(), make_user()
+    return SimpleNamespace(
+        plan_id=uuid4(),
+        user_id=user.user_id,
+        vendor_id=vendor.user_id,
+        device_id=None,
+        television_id=None,
+        initial_date=date.today(),
+        value=Decimal("1250000.00"),
+        quotas=12,
+        period=30,
+        contract="https://example.com/contract.pdf",
+        user=user,
+        vendor=vendor,
+        device=None,
+        television=None,
+        payments=[
+            SimpleNamespace(
+                payment_id=uuid4(),
+                value=Decimal("104166.67"),
+                method="cash",
+                state=PaymentState.APPROVED,
+                date=now,
+                reference=f"REF-{i}",
+            )
+            for i in range(payments_per_plan)
+        ],
+    )
+
+
+def pydantic_path(rows):
+    validated = [PlanResponse.from_orm(row) for row in rows]
+    return json.dumps(jsonable_encoder(validated)).encode()
+
+
+def fast_path(rows):
+    return dumps(serializer_for(PlanResponse).many(rows))
+
+
+def measure(label, func, rows, repeat):
+    func(rows)  # calentamiento
+    timings = []
+    for _ in range(repeat):
+        started = perf_counter()
+        body = func(rows)
+        timings.append((perf_counter() - started) * 1000)
+    print(
+        f"{label:24} mediana={statistics.median(timings):8.2f} ms  "
+        f"mín={min(timings):8.2f} ms  tamaño={len(body) / 1024:7.1f} KiB"
+    )
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de serialización de listas")
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--payments", type=int, default=3, help="Pagos por plan")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = [make_plan(args.payments) for _ in range(args.rows)]
+    assert json.loads(pydantic_path(rows[:5])) == json.loads(fast_path(rows[:5]))
+
+    print(f"{args.rows} planes x {args.payments} pagos, {args.repeat} repeticiones\n")
+    slow = measure("Pydantic + json", pydantic_path, rows, args.repeat)
+    fast = measure("RowSerializer + orjson", fast_path, rows, args.repeat)
+    print(f"\nAceleración: {slow / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
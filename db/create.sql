@@ -90,7 +90,7 @@ CREATE TABLE IF NOT EXISTS store (
     id                 UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     nombre             VARCHAR(100) NOT NULL,
     country_id         UUID NOT NULL REFERENCES country(country_id) ON DELETE RESTRICT,
-    tokens_disponibles INTEGER NOT NULL DEFAULT 0,
+    tokens_disponibles INTEGER NOT NULL DEFAULT 0 CONSTRAINT chk_store_tokens_non_negative CHECK (tokens_disponibles >= 0),
     plan               VARCHAR(50) NOT NULL,
     created_at         TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at         TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
@@ -99,6 +99,40 @@ CREATE TABLE IF NOT EXISTS store (
 );
 CREATE INDEX IF NOT EXISTS idx_store_country ON store(country_id);
 
+-- Libro de tokens (solo inserciones) y contadores repartidos por tienda
+CREATE TABLE IF NOT EXISTS store_token_ledger (
+    entry_id      UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    store_id      UUID        NOT NULL REFERENCES store(id) ON DELETE CASCADE,
+    delta         INTEGER     NOT NULL,
+    reason        VARCHAR(20) NOT NULL
+                  CHECK (reason IN ('opening', 'consume', 'credit', 'adjustment', 'reshard')),
+    reference     VARCHAR(80),
+    shard         SMALLINT,
+    balance_after INTEGER,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_store_token_ledger_store
+    ON store_token_ledger(store_id, created_at DESC);
+
+CREATE OR REPLACE FUNCTION store_token_ledger_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'store_token_ledger solo admite inserciones';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_store_token_ledger_append_only ON store_token_ledger;
+CREATE TRIGGER trg_store_token_ledger_append_only
+    BEFORE UPDATE ON store_token_ledger
+    FOR EACH ROW EXECUTE FUNCTION store_token_ledger_append_only();
+
+CREATE TABLE IF NOT EXISTS store_token_shard (
+    id       SERIAL PRIMARY KEY,
+    store_id UUID     NOT NULL REFERENCES store(id) ON DELETE CASCADE,
+    shard    SMALLINT NOT NULL,
+    tokens   INTEGER  NOT NULL DEFAULT 0 CHECK (tokens >= 0),
+    CONSTRAINT uq_store_token_shard UNIQUE (store_id, shard)
+);
+
 -- =======================
 --  USER y dependientes
 -- =======================
@@ -123,9 +157,13 @@ CREATE TABLE IF NOT EXISTS "user" (
     state            user_state NOT NULL DEFAULT 'Active',
     created_at       TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
     updated_at       TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    deleted_at       TIMESTAMPTZ,
     CONSTRAINT uq_user_store_dni UNIQUE (store_id, dni)
 );
 CREATE INDEX IF NOT EXISTS idx_user_store ON "user"(store_id);
+CREATE INDEX IF NOT EXISTS idx_user_store_live ON "user"(store_id, created_at DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_user_store_role_live ON "user"(store_id, role_id, created_at DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_user_deleted ON "user"(deleted_at) WHERE deleted_at IS NOT NULL;
 CREATE INDEX IF NOT EXISTS idx_user_city ON "user"(city_id);
 CREATE INDEX IF NOT EXISTS idx_user_role ON "user"(role_id);
 
@@ -138,6 +176,7 @@ CREATE TABLE IF NOT EXISTS configuration (
     store_id         UUID,
     CONSTRAINT configuration_key_store_unique UNIQUE (key, store_id)
 );
+CREATE INDEX IF NOT EXISTS idx_configuration_store_key ON configuration(store_id, key);
 /*
 -- Si quieres FK dura:
 ALTER TABLE configuration
@@ -151,10 +190,12 @@ CREATE TABLE IF NOT EXISTS enrolment (
     user_id      UUID NOT NULL REFERENCES "user"(user_id) ON DELETE RESTRICT,
     vendor_id    UUID NOT NULL REFERENCES "user"(user_id) ON DELETE RESTRICT,
     created_at   TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-    updated_at   TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    updated_at   TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    deleted_at   TIMESTAMPTZ
 );
 CREATE INDEX IF NOT EXISTS idx_enrolment_user ON enrolment(user_id);
 CREATE INDEX IF NOT EXISTS idx_enrolment_vendor ON enrolment(vendor_id);
+CREATE INDEX IF NOT EXISTS idx_enrolment_deleted ON enrolment(deleted_at) WHERE deleted_at IS NOT NULL;
 
 -- device (OneToOne enrolment)
 CREATE TABLE IF NOT EXISTS device (
@@ -169,9 +210,12 @@ CREATE TABLE IF NOT EXISTS device (
     product_name  VARCHAR(40)  NOT NULL,
     state         device_state NOT NULL DEFAULT 'Active',
     created_at    TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-    updated_at    TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    updated_at    TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    deleted_at    TIMESTAMPTZ
 );
 CREATE INDEX IF NOT EXISTS idx_device_enrolment ON device(enrolment_id);
+CREATE INDEX IF NOT EXISTS idx_device_created_live ON device(created_at DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_device_deleted ON device(deleted_at) WHERE deleted_at IS NOT NULL;
 
 CREATE TABLE IF NOT EXISTS television (
     television_id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
@@ -184,8 +228,11 @@ CREATE TABLE IF NOT EXISTS television (
     fingerprint     VARCHAR(500),
     state           television_state NOT NULL DEFAULT 'Active',
     created_at    TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
-    updated_at    TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
+    updated_at    TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP,
+    deleted_at    TIMESTAMPTZ
 );
+CREATE INDEX IF NOT EXISTS idx_television_created_id_live ON television(created_at DESC, television_id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_television_deleted ON television(deleted_at) WHERE deleted_at IS NOT NULL;
 
 -- sim
 CREATE TABLE IF NOT EXISTS sim (
@@ -200,6 +247,7 @@ CREATE TABLE IF NOT EXISTS sim (
     updated_at TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
 CREATE INDEX IF NOT EXISTS idx_sim_device ON sim(device_id);
+CREATE INDEX IF NOT EXISTS idx_sim_number ON sim(number);
 
 -- plan
 CREATE TABLE plan (
@@ -213,12 +261,16 @@ CREATE TABLE plan (
     period         INT,
     value          NUMERIC(10,2) NOT NULL,
     contract       VARCHAR(80) NOT NULL,
+    updated_at     TIMESTAMPTZ NOT NULL DEFAULT now(),
+    deleted_at     TIMESTAMPTZ,
     CONSTRAINT chk_plan_device_or_tv CHECK (
         (device_id IS NOT NULL)::int + (television_id IS NOT NULL)::int = 1
     )
 );
 CREATE INDEX IF NOT EXISTS idx_plan_device ON plan(device_id);
 CREATE INDEX IF NOT EXISTS idx_plan_television ON plan(television_id);
+CREATE INDEX IF NOT EXISTS idx_plan_user_live ON plan(user_id, initial_date DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_plan_deleted ON plan(deleted_at) WHERE deleted_at IS NOT NULL;
 
 -- payment
 CREATE TABLE IF NOT EXISTS payment (
@@ -231,13 +283,31 @@ CREATE TABLE IF NOT EXISTS payment (
     state          payment_state NOT NULL,
     date           TIMESTAMPTZ   NOT NULL,
     reference      VARCHAR(80)   NOT NULL,
+    updated_at     TIMESTAMPTZ   NOT NULL DEFAULT now(),
+    deleted_at     TIMESTAMPTZ,
     CONSTRAINT chk_payment_device_or_tv CHECK (
         ((device_id IS NOT NULL)::int + (television_id IS NOT NULL)::int) = 1
-    )
+    ),
+    -- Idempotencia de pagos de la pasarela (POST /payments/bulk)
+    CONSTRAINT uq_payment_plan_reference UNIQUE (plan_id, reference)
 );
 CREATE INDEX IF NOT EXISTS idx_payment_plan ON payment(plan_id);
 CREATE INDEX IF NOT EXISTS idx_payment_device ON payment(device_id);
 CREATE INDEX IF NOT EXISTS idx_payment_television ON payment(television_id);
+CREATE INDEX IF NOT EXISTS idx_payment_date ON payment(date) INCLUDE (plan_id, value);
+CREATE INDEX IF NOT EXISTS idx_payment_deleted ON payment(deleted_at) WHERE deleted_at IS NOT NULL;
+
+-- updated_at también en UPDATE hechos fuera del ORM (marcador de cambio para ETag)
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+CREATE TRIGGER trg_plan_updated_at BEFORE UPDATE ON plan
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+CREATE TRIGGER trg_payment_updated_at BEFORE UPDATE ON payment
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
 
 -- action (PK y FKs siguiendo convención Tortoise: *_id)
 CREATE TABLE IF NOT EXISTS action (
@@ -276,7 +346,7 @@ DO $$ BEGIN
     END IF;
 END $$;
 
-CREATE INDEX IF NOT EXISTS idx_action_device ON action(device_id);
+CREATE INDEX IF NOT EXISTS idx_action_device_state_created ON action(device_id, state, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_action_applied_by_id ON action(applied_by_id);
 
 -- location
@@ -287,8 +357,7 @@ CREATE TABLE IF NOT EXISTS location (
     longitude   DOUBLE PRECISION NOT NULL,
     created_at  TIMESTAMPTZ DEFAULT CURRENT_TIMESTAMP
 );
-CREATE INDEX IF NOT EXISTS idx_location_device ON location(device_id);
-CREATE INDEX IF NOT EXISTS idx_location_device ON location(device_id);
+CREATE INDEX IF NOT EXISTS idx_location_device_created ON location(device_id, created_at DESC);
 
 -- factory reset protection (FRP)
 CREATE TABLE IF NOT EXISTS "factoryResetProtection" (
@@ -474,6 +543,179 @@ DO $$ BEGIN
     END IF;
 END $$;
 
+-- deletion_job (borrado asíncrono por lotes de tiendas y usuarios)
+CREATE TABLE IF NOT EXISTS deletion_job (
+    job_id      UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    entity      VARCHAR(10) NOT NULL CHECK (entity IN ('store', 'user')),
+    entity_id   UUID        NOT NULL,
+    state       VARCHAR(10) NOT NULL DEFAULT 'Pending'
+                CHECK (state IN ('Pending', 'Running', 'Completed', 'Failed')),
+    step        VARCHAR(40),
+    progress    JSONB       NOT NULL DEFAULT '{}'::jsonb,
+    processed   BIGINT      NOT NULL DEFAULT 0,
+    error       TEXT,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at  TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+CREATE UNIQUE INDEX IF NOT EXISTS uq_deletion_job_open
+    ON deletion_job(entity, entity_id) WHERE state <> 'Completed';
+CREATE INDEX IF NOT EXISTS idx_deletion_job_entity ON deletion_job(entity, entity_id, created_at DESC);
+
+-- asset: inventario unificado de dispositivos y televisores. Tabla derivada
+-- mantenida por triggers (ver db/migrations/20261019_13_asset.sql)
+CREATE TABLE IF NOT EXISTS asset (
+    asset_id     UUID        PRIMARY KEY,  -- device_id o television_id
+    kind         VARCHAR(10) NOT NULL CHECK (kind IN ('device', 'television')),
+    enrolment_id UUID        NOT NULL,
+    store_id     UUID,                     -- tienda del vendedor (o del cliente si no tiene)
+    customer_id  UUID,
+    vendor_id    UUID,
+    state        VARCHAR(20) NOT NULL,
+    last_seen_at TIMESTAMPTZ,              -- última ubicación (solo dispositivos)
+    created_at   TIMESTAMPTZ NOT NULL,
+    deleted_at   TIMESTAMPTZ
+);
+
+-- Definición de una fila de asset a partir de las tablas de origen
+CREATE OR REPLACE VIEW asset_source AS
+SELECT d.device_id AS asset_id,
+       'device'::varchar(10) AS kind,
+       d.enrolment_id,
+       coalesce(v.store_id, c.store_id) AS store_id,
+       e.user_id AS customer_id,
+       e.vendor_id,
+       d.state::text AS state,
+       (SELECT max(l.created_at) FROM location l WHERE l.device_id = d.device_id) AS last_seen_at,
+       coalesce(d.created_at, d.updated_at, now()) AS created_at,
+       d.deleted_at
+FROM device d
+JOIN enrolment e ON e.enrolment_id = d.enrolment_id
+LEFT JOIN "user" c ON c.user_id = e.user_id
+LEFT JOIN "user" v ON v.user_id = e.vendor_id
+UNION ALL
+SELECT t.television_id,
+       'television'::varchar(10),
+       t.enrolment_id,
+       coalesce(v.store_id, c.store_id),
+       e.user_id,
+       e.vendor_id,
+       t.state::text,
+       NULL::timestamptz,
+       coalesce(t.created_at, t.updated_at, now()),
+       t.deleted_at
+FROM television t
+JOIN enrolment e ON e.enrolment_id = t.enrolment_id
+LEFT JOIN "user" c ON c.user_id = e.user_id
+LEFT JOIN "user" v ON v.user_id = e.vendor_id;
+
+CREATE OR REPLACE FUNCTION asset_sync(ids UUID[]) RETURNS void AS $$
+    INSERT INTO asset (asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+                       state, last_seen_at, created_at, deleted_at)
+    SELECT asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+           state, last_seen_at, created_at, deleted_at
+    FROM asset_source WHERE asset_id = ANY(ids)
+    ON CONFLICT (asset_id) DO UPDATE SET
+        kind = EXCLUDED.kind,
+        enrolment_id = EXCLUDED.enrolment_id,
+        store_id = EXCLUDED.store_id,
+        customer_id = EXCLUDED.customer_id,
+        vendor_id = EXCLUDED.vendor_id,
+        state = EXCLUDED.state,
+        last_seen_at = EXCLUDED.last_seen_at,
+        created_at = EXCLUDED.created_at,
+        deleted_at = EXCLUDED.deleted_at;
+$$ LANGUAGE sql;
+
+-- device / television: alta, cambios y borrado físico
+CREATE OR REPLACE FUNCTION asset_on_source_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM asset WHERE asset_id = (to_jsonb(OLD) ->> TG_ARGV[0])::uuid;
+        RETURN OLD;
+    END IF;
+    PERFORM asset_sync(ARRAY[(to_jsonb(NEW) ->> TG_ARGV[0])::uuid]);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- enrolment: cambio de cliente o vendedor
+CREATE OR REPLACE FUNCTION asset_on_enrolment_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM asset_sync(ARRAY(
+        SELECT device_id FROM device WHERE enrolment_id = NEW.enrolment_id
+        UNION ALL
+        SELECT television_id FROM television WHERE enrolment_id = NEW.enrolment_id
+    ));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- user: cambio de tienda del cliente o del vendedor
+CREATE OR REPLACE FUNCTION asset_on_user_store_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM asset_sync(ARRAY(
+        SELECT asset_id FROM asset WHERE customer_id = NEW.user_id
+        UNION
+        SELECT asset_id FROM asset WHERE vendor_id = NEW.user_id
+    ));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- location: última vez visto. Solo avanza; last_seen_at no está indexada
+-- para que esta actualización pueda ser HOT
+CREATE OR REPLACE FUNCTION asset_on_location() RETURNS trigger AS $$
+BEGIN
+    UPDATE asset SET last_seen_at = NEW.created_at
+    WHERE asset_id = NEW.device_id
+      AND (last_seen_at IS NULL OR last_seen_at < NEW.created_at);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_asset_device ON device;
+CREATE TRIGGER trg_asset_device
+    AFTER INSERT OR UPDATE OF enrolment_id, state, created_at, deleted_at OR DELETE ON device
+    FOR EACH ROW EXECUTE FUNCTION asset_on_source_change('device_id');
+
+DROP TRIGGER IF EXISTS trg_asset_television ON television;
+CREATE TRIGGER trg_asset_television
+    AFTER INSERT OR UPDATE OF enrolment_id, state, created_at, deleted_at OR DELETE ON television
+    FOR EACH ROW EXECUTE FUNCTION asset_on_source_change('television_id');
+
+DROP TRIGGER IF EXISTS trg_asset_enrolment ON enrolment;
+CREATE TRIGGER trg_asset_enrolment
+    AFTER UPDATE OF user_id, vendor_id ON enrolment
+    FOR EACH ROW
+    WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id OR OLD.vendor_id IS DISTINCT FROM NEW.vendor_id)
+    EXECUTE FUNCTION asset_on_enrolment_change();
+
+DROP TRIGGER IF EXISTS trg_asset_user_store ON "user";
+CREATE TRIGGER trg_asset_user_store
+    AFTER UPDATE OF store_id ON "user"
+    FOR EACH ROW
+    WHEN (OLD.store_id IS DISTINCT FROM NEW.store_id)
+    EXECUTE FUNCTION asset_on_user_store_change();
+
+DROP TRIGGER IF EXISTS trg_asset_location ON location;
+CREATE TRIGGER trg_asset_location
+    AFTER INSERT ON location
+    FOR EACH ROW EXECUTE FUNCTION asset_on_location();
+CREATE INDEX IF NOT EXISTS idx_asset_store_created_live
+    ON asset(store_id, created_at DESC, asset_id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_asset_created_live
+    ON asset(created_at DESC, asset_id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX IF NOT EXISTS idx_asset_customer ON asset(customer_id);
+CREATE INDEX IF NOT EXISTS idx_asset_vendor ON asset(vendor_id);
+INSERT INTO asset (asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+                   state, last_seen_at, created_at, deleted_at)
+SELECT asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+       state, last_seen_at, created_at, deleted_at
+FROM asset_source
+ON CONFLICT (asset_id) DO NOTHING;
+
 -- =======================
 --  Fin
 -- =======================
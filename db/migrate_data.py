@@ -1,23 +1,15 @@
 """
 Script para ejecutar migraciones de datos.
-Se ejecuta después de las migraciones de esquema.
-"""
-import asyncio
-from tortoise import run_async
-
-from db.migrations import (
-   0005_add_admin_to_store,
-   0006_assign_store_admins
-)
 
-async def run_data_migrations():
-    print("🏗️ Ejecutando migraciones de datos...")
-    
-    # Ejecutar migraciones en orden
-    await run_async(0005_add_admin_to_store.init())
-    await run_async(0006_assign_store_admins.init())
-    
-    print("✅ Migraciones de datos completadas")
+Las migraciones de datos (`db/migrations/*.py`) se aplican ahora junto con
+las de esquema, en orden y registradas en `schema_migrations`, con
+`scripts/migrate.py`. Este script se mantiene como atajo.
+"""
+import os
+import runpy
 
 if __name__ == "__main__":
-    asyncio.run(run_data_migrations())
+    runpy.run_path(
+        os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "scripts", "migrate.py"),
+        run_name="__main__",
+    )
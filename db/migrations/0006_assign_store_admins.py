@@ -1,23 +1,29 @@
-import asyncio
-from uuid import UUID
+"""
+Asigna un administrador por defecto a las tiendas sin admin.
 
-from tortoise import run_async
+Migración de datos: la aplica scripts/migrate.py con una conexión asyncpg.
+"""
+import asyncpg
 
-async def assign_default_store_admins():
-    """Asigna admins por defecto a tiendas existentes"""
-    from app.infra.postgres.models import Store, User
-    
-    # Buscar un usuario con rol de administrador
-    admin = await User.filter(role__name="admin").first()
-    
-    if not admin:
+from app.infra.postgres.migrator import backfill
+
+# Cada lote de tiendas confirma por separado
+TRANSACTION = False
+
+
+async def upgrade(conn: asyncpg.Connection) -> None:
+    # Buscar un usuario con rol de administrador. Sin filtro por deleted_at:
+    # la columna llega después, en 20261019_02_soft_delete
+    admin_id = await conn.fetchval(
+        'SELECT u.user_id FROM "user" u JOIN role r ON r.role_id = u.role_id '
+        "WHERE r.name = 'admin' ORDER BY u.created_at LIMIT 1"
+    )
+    if admin_id is None:
         print("⚠️ No se encontró ningún usuario administrador")
         return
-    
+
     # Actualizar tiendas sin admin
-    updated = await Store.filter(admin=None).update(admin=admin)
+    updated = await backfill(
+        conn, table="store", pk="id", set="admin_id = $1", where="admin_id IS NULL", args=(admin_id,)
+    )
     print(f"✅ Se asignó admin por defecto a {updated} tiendas")
-
-# Para ejecutar con Tortoise
-def init():
-    run_async(assign_default_store_admins())
@@ -0,0 +1,31 @@
+-- Migración para agregar updated_at a plan y payment
+--
+-- Los listados usan count(*) y max(updated_at) como ETag (GET condicional).
+-- El trigger mantiene la columna también en UPDATE hechos fuera del ORM
+-- (QuerySet.update, SQL manual), que no aplican auto_now.
+--
+-- now() es STABLE: desde PostgreSQL 11 ADD COLUMN ... DEFAULT now() no
+-- reescribe la tabla (las filas existentes toman la hora de la migración).
+
+ALTER TABLE plan ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+ALTER TABLE payment ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT now();
+
+CREATE OR REPLACE FUNCTION set_updated_at() RETURNS trigger AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_plan_updated_at ON plan;
+CREATE TRIGGER trg_plan_updated_at
+    BEFORE UPDATE ON plan
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+DROP TRIGGER IF EXISTS trg_payment_updated_at ON payment;
+CREATE TRIGGER trg_payment_updated_at
+    BEFORE UPDATE ON payment
+    FOR EACH ROW EXECUTE FUNCTION set_updated_at();
+
+COMMENT ON COLUMN plan.updated_at IS 'Última modificación (marcador de cambio para ETag)';
+COMMENT ON COLUMN payment.updated_at IS 'Última modificación (marcador de cambio para ETag)';
@@ -0,0 +1,40 @@
+-- migrate: no-transaction
+-- Migración para borrado lógico de user, device, television y plan
+--
+-- DELETE en la API marca deleted_at (también en los planes que dependen del
+-- registro) y las consultas del ORM filtran deleted_at IS NULL. El DELETE real
+-- lo hace el purgado por lotes (app/services/purge.py) pasado el periodo de
+-- retención, fuera del horario de oficina.
+--
+-- Índices parciales:
+-- - WHERE deleted_at IS NULL: los listados y búsquedas solo leen filas vivas.
+-- - WHERE deleted_at IS NOT NULL: el purgado encuentra las filas borradas sin
+--   recorrer la tabla; el índice solo contiene las pendientes de purgar.
+--
+-- Las restricciones UNIQUE (username, imei, serial_number) siguen aplicando a
+-- las filas borradas: para volver a dar de alta se restaura el registro.
+--
+-- Sin transacción: los índices se construyen con CONCURRENTLY para no
+-- bloquear las escrituras en user/device mientras tanto.
+
+ALTER TABLE "user" ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+ALTER TABLE device ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+ALTER TABLE television ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+ALTER TABLE plan ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+
+-- Filas vivas
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_store_live ON "user"(store_id, created_at DESC) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_device_created_live ON device(created_at DESC) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_television_created_live ON television(created_at DESC) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_plan_user_live ON plan(user_id, initial_date DESC) WHERE deleted_at IS NULL;
+
+-- Pendientes de purgar
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_deleted ON "user"(deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_device_deleted ON device(deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_television_deleted ON television(deleted_at) WHERE deleted_at IS NOT NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_plan_deleted ON plan(deleted_at) WHERE deleted_at IS NOT NULL;
+
+COMMENT ON COLUMN "user".deleted_at IS 'Borrado lógico; NULL = vivo';
+COMMENT ON COLUMN device.deleted_at IS 'Borrado lógico; NULL = vivo';
+COMMENT ON COLUMN television.deleted_at IS 'Borrado lógico; NULL = vivo';
+COMMENT ON COLUMN plan.deleted_at IS 'Borrado lógico; NULL = vivo';
@@ -0,0 +1,28 @@
+-- Migración para crear deletion_job
+--
+-- Trabajos de borrado asíncrono de tiendas y usuarios (POST /deletion-jobs).
+-- Cada lote borra pocas filas de un dependiente y actualiza el progreso en la
+-- misma transacción, así que un trabajo interrumpido se reanuda donde quedó.
+--
+-- Como mucho un trabajo abierto (pendiente, en curso o fallido) por registro:
+-- repetir la petición devuelve o reanuda el existente.
+
+CREATE TABLE IF NOT EXISTS deletion_job (
+    job_id      UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    entity      VARCHAR(10) NOT NULL CHECK (entity IN ('store', 'user')),
+    entity_id   UUID        NOT NULL,
+    state       VARCHAR(10) NOT NULL DEFAULT 'Pending'
+                CHECK (state IN ('Pending', 'Running', 'Completed', 'Failed')),
+    step        VARCHAR(40),
+    progress    JSONB       NOT NULL DEFAULT '{}'::jsonb,
+    processed   BIGINT      NOT NULL DEFAULT 0,
+    error       TEXT,
+    created_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    updated_at  TIMESTAMPTZ NOT NULL DEFAULT now(),
+    started_at  TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_deletion_job_open
+    ON deletion_job(entity, entity_id) WHERE state <> 'Completed';
+CREATE INDEX IF NOT EXISTS idx_deletion_job_entity ON deletion_job(entity, entity_id, created_at DESC);
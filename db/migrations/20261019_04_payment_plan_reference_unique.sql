@@ -0,0 +1,36 @@
+-- migrate: no-transaction
+-- Migración para hacer única la referencia de pago por plan
+--
+-- La pasarela identifica cada pago por su referencia: reenviar un archivo de
+-- liquidación o reintentar un webhook no debe registrar el pago dos veces.
+-- POST /payments/bulk inserta con ON CONFLICT DO NOTHING sobre esta restricción
+-- y POST /payments responde 409 ante un duplicado.
+--
+-- Si ya hay duplicados la migración se detiene. Para revisarlos:
+--   SELECT plan_id, reference, count(*) FROM payment
+--   GROUP BY plan_id, reference HAVING count(*) > 1;
+--
+-- Sin transacción: el índice único se construye con CONCURRENTLY y después se
+-- convierte en restricción (USING INDEX), que solo bloquea la tabla un instante.
+
+DO $$
+BEGIN
+    IF EXISTS (
+        SELECT 1 FROM payment GROUP BY plan_id, reference HAVING count(*) > 1
+    ) THEN
+        RAISE EXCEPTION 'Hay pagos duplicados por (plan_id, reference); resuélvalos antes de migrar';
+    END IF;
+END $$;
+
+CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS uq_payment_plan_reference
+    ON payment(plan_id, reference);
+
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'uq_payment_plan_reference'
+    ) THEN
+        ALTER TABLE payment
+            ADD CONSTRAINT uq_payment_plan_reference UNIQUE USING INDEX uq_payment_plan_reference;
+    END IF;
+END $$;
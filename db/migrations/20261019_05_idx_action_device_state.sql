@@ -0,0 +1,8 @@
+-- migrate: no-transaction
+-- Índice para el polling de acciones de un dispositivo:
+--   GET /actions?device_id=...&state=pending (ORDER BY created_at DESC)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_action_device_state_created
+    ON action(device_id, state, created_at DESC);
+
+-- Cubierto por el índice anterior (device_id es la primera columna)
+DROP INDEX CONCURRENTLY IF EXISTS idx_action_device;
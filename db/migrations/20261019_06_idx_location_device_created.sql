@@ -0,0 +1,10 @@
+-- migrate: no-transaction
+-- Índice para la última ubicación de un dispositivo:
+--   WHERE device_id = $1 ORDER BY created_at DESC LIMIT 1
+-- La lectura es un único descenso del índice en lugar de ordenar todas las
+-- ubicaciones del dispositivo.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_location_device_created
+    ON location(device_id, created_at DESC);
+
+-- Cubierto por el índice anterior (estaba declarado dos veces en create.sql)
+DROP INDEX CONCURRENTLY IF EXISTS idx_location_device;
@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Índice para la analítica de pagos por rango de fechas (GET /analytics):
+--   WHERE date BETWEEN $1 AND $2, unido a plan → user para filtrar por tienda
+-- INCLUDE deja plan_id y value en el índice: la suma del día no visita la tabla.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payment_date
+    ON payment(date) INCLUDE (plan_id, value);
@@ -0,0 +1,6 @@
+-- migrate: no-transaction
+-- Índice para los listados de usuarios de una tienda por rol:
+--   GET /users?store_id=...&role_name=... (ORDER BY created_at DESC)
+-- Parcial como idx_user_store_live: solo usuarios sin borrado lógico.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_user_store_role_live
+    ON "user"(store_id, role_id, created_at DESC) WHERE deleted_at IS NULL;
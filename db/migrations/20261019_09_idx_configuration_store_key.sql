@@ -0,0 +1,7 @@
+-- migrate: no-transaction
+-- Índice para la configuración de una tienda:
+--   GET /configurations?store_id=... [&key=...]
+-- La restricción única (key, store_id) empieza por key y no sirve para
+-- filtrar solo por tienda.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_configuration_store_key
+    ON configuration(store_id, key);
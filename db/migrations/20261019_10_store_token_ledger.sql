@@ -0,0 +1,63 @@
+-- Migración para el libro de tokens de las tiendas
+--
+-- Los consumos y abonos de tokens son sentencias atómicas
+-- (UPDATE ... WHERE tokens_disponibles >= n RETURNING) y cada una deja un
+-- movimiento en store_token_ledger (ver app/services/store_token.py).
+--
+-- store_token_ledger solo admite inserciones: un trigger rechaza UPDATE. El
+-- DELETE queda para el borrado de la tienda. Cada tienda recibe un
+-- movimiento 'opening' con su saldo actual, así la suma de delta es el saldo.
+--
+-- store_token_shard reparte el saldo de tiendas muy concurridas entre varios
+-- contadores (PUT /stores/{id}/tokens/shards).
+
+CREATE TABLE IF NOT EXISTS store_token_ledger (
+    entry_id      UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+    store_id      UUID        NOT NULL REFERENCES store(id) ON DELETE CASCADE,
+    delta         INTEGER     NOT NULL,
+    reason        VARCHAR(20) NOT NULL
+                  CHECK (reason IN ('opening', 'consume', 'credit', 'adjustment', 'reshard')),
+    reference     VARCHAR(80),
+    shard         SMALLINT,
+    balance_after INTEGER,
+    created_at    TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS idx_store_token_ledger_store
+    ON store_token_ledger(store_id, created_at DESC);
+
+CREATE OR REPLACE FUNCTION store_token_ledger_append_only() RETURNS trigger AS $$
+BEGIN
+    RAISE EXCEPTION 'store_token_ledger solo admite inserciones';
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_store_token_ledger_append_only ON store_token_ledger;
+CREATE TRIGGER trg_store_token_ledger_append_only
+    BEFORE UPDATE ON store_token_ledger
+    FOR EACH ROW EXECUTE FUNCTION store_token_ledger_append_only();
+
+CREATE TABLE IF NOT EXISTS store_token_shard (
+    id       SERIAL PRIMARY KEY,
+    store_id UUID     NOT NULL REFERENCES store(id) ON DELETE CASCADE,
+    shard    SMALLINT NOT NULL,
+    tokens   INTEGER  NOT NULL DEFAULT 0 CHECK (tokens >= 0),
+    CONSTRAINT uq_store_token_shard UNIQUE (store_id, shard)
+);
+
+-- Saldo nunca negativo en lo que se escriba a partir de ahora (NOT VALID no
+-- revisa las filas existentes ni bloquea la tabla mientras tanto)
+DO $$
+BEGIN
+    IF NOT EXISTS (
+        SELECT 1 FROM pg_constraint WHERE conname = 'chk_store_tokens_non_negative'
+    ) THEN
+        ALTER TABLE store
+            ADD CONSTRAINT chk_store_tokens_non_negative CHECK (tokens_disponibles >= 0) NOT VALID;
+    END IF;
+END $$;
+
+INSERT INTO store_token_ledger (store_id, delta, reason, balance_after)
+SELECT s.id, s.tokens_disponibles, 'opening', s.tokens_disponibles
+FROM store s
+WHERE s.tokens_disponibles <> 0
+  AND NOT EXISTS (SELECT 1 FROM store_token_ledger l WHERE l.store_id = s.id);
@@ -0,0 +1,4 @@
+-- migrate: no-transaction
+-- Índice para GET /sims/number/{number}: la búsqueda por número recorría
+-- la tabla entera. El ICC ID ya tiene su índice único (sim_icc_id_key).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_sim_number ON sim(number);
@@ -0,0 +1,11 @@
+-- migrate: no-transaction
+-- Índice para la paginación por cursor de GET /televisions:
+--   WHERE (created_at, television_id) < ($1, $2)
+--   ORDER BY created_at DESC, television_id DESC LIMIT n
+-- Con el desempate por television_id cada página es un único recorrido del
+-- índice, aunque varios televisores compartan created_at.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_television_created_id_live
+    ON television(created_at DESC, television_id DESC) WHERE deleted_at IS NULL;
+
+-- Cubierto por el índice anterior
+DROP INDEX CONCURRENTLY IF EXISTS idx_television_created_live;
@@ -0,0 +1,193 @@
+-- migrate: no-transaction
+-- Inventario unificado de dispositivos y televisores (tabla asset).
+--
+-- Planes, pagos y listados de flota consultaban device y television por
+-- separado y mezclaban los resultados en Python. `asset` tiene una fila por
+-- dispositivo o televisor con su tienda, cliente, vendedor, estado y última
+-- ubicación, y se lista con una consulta indexada (GET /assets).
+--
+-- Es una tabla derivada: la mantienen los triggers de device, television,
+-- enrolment, "user" (cambio de tienda) y location. No se escribe desde la
+-- aplicación. `asset_source` define cómo se calcula cada fila; para
+-- reconstruirla entera: TRUNCATE asset y repetir el backfill del final.
+--
+-- Sin transacción: los triggers se crean antes del backfill, y el backfill
+-- (ON CONFLICT DO NOTHING) no pisa las filas que ya hayan escrito. Va por
+-- lotes de 1000 que confirman uno a uno: un trigger que escribe un asset del
+-- lote en curso espera en el ON CONFLICT a que ese lote confirme (poco), no
+-- al backfill entero. Todo es idempotente.
+
+CREATE TABLE IF NOT EXISTS asset (
+    asset_id     UUID        PRIMARY KEY,  -- device_id o television_id
+    kind         VARCHAR(10) NOT NULL CHECK (kind IN ('device', 'television')),
+    enrolment_id UUID        NOT NULL,
+    store_id     UUID,                     -- tienda del vendedor (o del cliente si no tiene)
+    customer_id  UUID,
+    vendor_id    UUID,
+    state        VARCHAR(20) NOT NULL,
+    last_seen_at TIMESTAMPTZ,              -- última ubicación (solo dispositivos)
+    created_at   TIMESTAMPTZ NOT NULL,
+    deleted_at   TIMESTAMPTZ
+);
+
+-- Definición de una fila de asset a partir de las tablas de origen
+CREATE OR REPLACE VIEW asset_source AS
+SELECT d.device_id AS asset_id,
+       'device'::varchar(10) AS kind,
+       d.enrolment_id,
+       coalesce(v.store_id, c.store_id) AS store_id,
+       e.user_id AS customer_id,
+       e.vendor_id,
+       d.state::text AS state,
+       (SELECT max(l.created_at) FROM location l WHERE l.device_id = d.device_id) AS last_seen_at,
+       coalesce(d.created_at, d.updated_at, now()) AS created_at,
+       d.deleted_at
+FROM device d
+JOIN enrolment e ON e.enrolment_id = d.enrolment_id
+LEFT JOIN "user" c ON c.user_id = e.user_id
+LEFT JOIN "user" v ON v.user_id = e.vendor_id
+UNION ALL
+SELECT t.television_id,
+       'television'::varchar(10),
+       t.enrolment_id,
+       coalesce(v.store_id, c.store_id),
+       e.user_id,
+       e.vendor_id,
+       t.state::text,
+       NULL::timestamptz,
+       coalesce(t.created_at, t.updated_at, now()),
+       t.deleted_at
+FROM television t
+JOIN enrolment e ON e.enrolment_id = t.enrolment_id
+LEFT JOIN "user" c ON c.user_id = e.user_id
+LEFT JOIN "user" v ON v.user_id = e.vendor_id;
+
+CREATE OR REPLACE FUNCTION asset_sync(ids UUID[]) RETURNS void AS $$
+    INSERT INTO asset (asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+                       state, last_seen_at, created_at, deleted_at)
+    SELECT asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+           state, last_seen_at, created_at, deleted_at
+    FROM asset_source WHERE asset_id = ANY(ids)
+    ON CONFLICT (asset_id) DO UPDATE SET
+        kind = EXCLUDED.kind,
+        enrolment_id = EXCLUDED.enrolment_id,
+        store_id = EXCLUDED.store_id,
+        customer_id = EXCLUDED.customer_id,
+        vendor_id = EXCLUDED.vendor_id,
+        state = EXCLUDED.state,
+        last_seen_at = EXCLUDED.last_seen_at,
+        created_at = EXCLUDED.created_at,
+        deleted_at = EXCLUDED.deleted_at;
+$$ LANGUAGE sql;
+
+-- device / television: alta, cambios y borrado físico
+CREATE OR REPLACE FUNCTION asset_on_source_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM asset WHERE asset_id = (to_jsonb(OLD) ->> TG_ARGV[0])::uuid;
+        RETURN OLD;
+    END IF;
+    PERFORM asset_sync(ARRAY[(to_jsonb(NEW) ->> TG_ARGV[0])::uuid]);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- enrolment: cambio de cliente o vendedor
+CREATE OR REPLACE FUNCTION asset_on_enrolment_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM asset_sync(ARRAY(
+        SELECT device_id FROM device WHERE enrolment_id = NEW.enrolment_id
+        UNION ALL
+        SELECT television_id FROM television WHERE enrolment_id = NEW.enrolment_id
+    ));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- user: cambio de tienda del cliente o del vendedor
+CREATE OR REPLACE FUNCTION asset_on_user_store_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM asset_sync(ARRAY(
+        SELECT asset_id FROM asset WHERE customer_id = NEW.user_id
+        UNION
+        SELECT asset_id FROM asset WHERE vendor_id = NEW.user_id
+    ));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+-- location: última vez visto. Solo avanza; last_seen_at no está indexada
+-- para que esta actualización pueda ser HOT
+CREATE OR REPLACE FUNCTION asset_on_location() RETURNS trigger AS $$
+BEGIN
+    UPDATE asset SET last_seen_at = NEW.created_at
+    WHERE asset_id = NEW.device_id
+      AND (last_seen_at IS NULL OR last_seen_at < NEW.created_at);
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_asset_device ON device;
+CREATE TRIGGER trg_asset_device
+    AFTER INSERT OR UPDATE OF enrolment_id, state, created_at, deleted_at OR DELETE ON device
+    FOR EACH ROW EXECUTE FUNCTION asset_on_source_change('device_id');
+
+DROP TRIGGER IF EXISTS trg_asset_television ON television;
+CREATE TRIGGER trg_asset_television
+    AFTER INSERT OR UPDATE OF enrolment_id, state, created_at, deleted_at OR DELETE ON television
+    FOR EACH ROW EXECUTE FUNCTION asset_on_source_change('television_id');
+
+DROP TRIGGER IF EXISTS trg_asset_enrolment ON enrolment;
+CREATE TRIGGER trg_asset_enrolment
+    AFTER UPDATE OF user_id, vendor_id ON enrolment
+    FOR EACH ROW
+    WHEN (OLD.user_id IS DISTINCT FROM NEW.user_id OR OLD.vendor_id IS DISTINCT FROM NEW.vendor_id)
+    EXECUTE FUNCTION asset_on_enrolment_change();
+
+DROP TRIGGER IF EXISTS trg_asset_user_store ON "user";
+CREATE TRIGGER trg_asset_user_store
+    AFTER UPDATE OF store_id ON "user"
+    FOR EACH ROW
+    WHEN (OLD.store_id IS DISTINCT FROM NEW.store_id)
+    EXECUTE FUNCTION asset_on_user_store_change();
+
+DROP TRIGGER IF EXISTS trg_asset_location ON location;
+CREATE TRIGGER trg_asset_location
+    AFTER INSERT ON location
+    FOR EACH ROW EXECUTE FUNCTION asset_on_location();
+
+-- Backfill de los dispositivos y televisores existentes, por lotes en orden
+-- de asset_id. COMMIT dentro de DO funciona porque la sentencia se ejecuta
+-- en autocommit (PostgreSQL 11+).
+DO $$
+DECLARE
+    last_id UUID := '00000000-0000-0000-0000-000000000000';
+    batch UUID[];
+BEGIN
+    LOOP
+        SELECT array_agg(asset_id ORDER BY asset_id) INTO batch
+        FROM (
+            SELECT asset_id FROM asset_source
+            WHERE asset_id > last_id
+            ORDER BY asset_id LIMIT 1000
+        ) next_ids;
+        EXIT WHEN batch IS NULL;
+
+        INSERT INTO asset (asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+                           state, last_seen_at, created_at, deleted_at)
+        SELECT asset_id, kind, enrolment_id, store_id, customer_id, vendor_id,
+               state, last_seen_at, created_at, deleted_at
+        FROM asset_source WHERE asset_id = ANY(batch)
+        ON CONFLICT (asset_id) DO NOTHING;
+
+        last_id := batch[array_length(batch, 1)];
+        COMMIT;
+    END LOOP;
+END $$;
+
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asset_store_created_live
+    ON asset(store_id, created_at DESC, asset_id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asset_created_live
+    ON asset(created_at DESC, asset_id DESC) WHERE deleted_at IS NULL;
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asset_customer ON asset(customer_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_asset_vendor ON asset(vendor_id);
@@ -0,0 +1,21 @@
+-- migrate: no-transaction
+-- Migración para borrado lógico de payment
+--
+-- Los pagos se marcan junto con su plan, dispositivo o televisor (misma marca
+-- de tiempo, ver CRUDBase.delete) y se restauran con él: un pago vivo nunca
+-- apunta a un plan oculto. Las consultas del ORM filtran deleted_at IS NULL.
+--
+-- Los pagos de planes ya borrados toman la marca del plan. Son pocas filas
+-- (solo las de planes pendientes de purgar): un UPDATE basta.
+
+ALTER TABLE payment ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+
+UPDATE payment pay SET deleted_at = p.deleted_at
+FROM plan p
+WHERE p.plan_id = pay.plan_id AND p.deleted_at IS NOT NULL AND pay.deleted_at IS NULL;
+
+-- Pendientes de purgar
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_payment_deleted
+    ON payment(deleted_at) WHERE deleted_at IS NOT NULL;
+
+COMMENT ON COLUMN payment.deleted_at IS 'Borrado lógico; NULL = vivo';
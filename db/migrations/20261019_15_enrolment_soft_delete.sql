@@ -0,0 +1,48 @@
+-- migrate: no-transaction
+-- Migración para borrado lógico de enrolment
+--
+-- Borrar un usuario (cliente o vendedor) marca sus enrolamientos, y con ellos
+-- los dispositivos y televisores, sus planes y sus pagos, con la misma marca
+-- de tiempo (ver CRUDBase.delete). Antes el enrolamiento no tenía deleted_at y
+-- quedaba vivo, junto con su dispositivo, apuntando a un usuario oculto.
+--
+-- Los enrolamientos de usuarios ya borrados toman la marca del usuario, y sus
+-- dependientes vivos la del enrolamiento. Son pocas filas (solo las de
+-- usuarios pendientes de purgar): un UPDATE por tabla basta.
+
+ALTER TABLE enrolment ADD COLUMN IF NOT EXISTS deleted_at TIMESTAMPTZ;
+
+UPDATE enrolment e SET deleted_at = coalesce(c.deleted_at, v.deleted_at)
+FROM "user" c, "user" v
+WHERE c.user_id = e.user_id AND v.user_id = e.vendor_id
+  AND (c.deleted_at IS NOT NULL OR v.deleted_at IS NOT NULL)
+  AND e.deleted_at IS NULL;
+
+UPDATE device d SET deleted_at = e.deleted_at
+FROM enrolment e
+WHERE e.enrolment_id = d.enrolment_id AND e.deleted_at IS NOT NULL
+  AND d.deleted_at IS NULL;
+
+UPDATE television t SET deleted_at = e.deleted_at
+FROM enrolment e
+WHERE e.enrolment_id = t.enrolment_id AND e.deleted_at IS NOT NULL
+  AND t.deleted_at IS NULL;
+
+UPDATE plan p SET deleted_at = d.deleted_at
+FROM device d
+WHERE d.device_id = p.device_id AND d.deleted_at IS NOT NULL AND p.deleted_at IS NULL;
+
+UPDATE plan p SET deleted_at = t.deleted_at
+FROM television t
+WHERE t.television_id = p.television_id AND t.deleted_at IS NOT NULL
+  AND p.deleted_at IS NULL;
+
+UPDATE payment pay SET deleted_at = p.deleted_at
+FROM plan p
+WHERE p.plan_id = pay.plan_id AND p.deleted_at IS NOT NULL AND pay.deleted_at IS NULL;
+
+-- Pendientes de purgar
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_enrolment_deleted
+    ON enrolment(deleted_at) WHERE deleted_at IS NOT NULL;
+
+COMMENT ON COLUMN enrolment.deleted_at IS 'Borrado lógico; NULL = vivo';
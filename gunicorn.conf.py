@@ -0,0 +1,52 @@
+"""
+Configuración de gunicorn para producción (`gunicorn -c gunicorn.conf.py app.main:app`).
+
+- Workers: `WEB_CONCURRENCY` o una por CPU de la cuota del contenedor.
+- Worker de uvicorn con uvloop y httptools (`app.core.server.UvicornWorker`).
+- SIGTERM: gunicorn deja de aceptar conexiones y espera hasta
+  `graceful_timeout` a que terminen las peticiones en curso.
+- `preload_app`: la aplicación se importa una vez en el maestro y las cachés
+  de solo lectura (serializadores, OpenAPI) se construyen antes del fork; las
+  conexiones a PostgreSQL se abren en cada worker en el evento de arranque.
+- Pool por worker: con `DB_CONNECTION_BUDGET` el maestro exporta
+  `WEB_CONCURRENCY` para que cada worker use `budget // workers` conexiones.
+"""
+
+import gc
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.core.server import worker_count  # noqa: E402
+
+workers = worker_count()
+os.environ["WEB_CONCURRENCY"] = str(workers)
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '80')}"
+worker_class = "app.core.server.UvicornWorker"
+preload_app = True
+
+# Menor que terminationGracePeriodSeconds del Deployment
+graceful_timeout = int(os.environ.get("GRACEFUL_TIMEOUT", "25"))
+timeout = int(os.environ.get("WORKER_TIMEOUT", "60"))
+keepalive = int(os.environ.get("KEEP_ALIVE", "5"))
+
+# Los logs de acceso ya los emite QueryInstrumentationMiddleware
+accesslog = None
+errorlog = "-"
+loglevel = os.environ.get("LOG_LEVEL", "info").lower()
+
+
+def when_ready(server):
+    """Maestro con la app cargada: calentar cachés compartidas antes del fork."""
+    from app.core.lifecycle import warm_caches
+    from app.main import app
+
+    serializers = warm_caches(app)
+    # Los objetos existentes no se recorren en las colecciones de los workers,
+    # así que sus páginas se mantienen compartidas (copy-on-write)
+    gc.freeze()
+    server.log.info(
+        "Cachés precalculadas (%d serializadores), %d workers", serializers, workers
+    )
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Perfil del arranque de la API.
+
+Importa `app.main` en un proceso nuevo con `python -X importtime` y muestra
+el tiempo total y los módulos más costosos (propio y acumulado). Con
+`--startup` además ejecuta los eventos de arranque (init_db + calentamiento)
+contra POSTGRES_DATABASE_URL y mide cuánto tardan.
+
+Uso:
+    python scripts/profile_startup.py
+    python scripts/profile_startup.py --top 40 --filter openpyxl,passlib
+    POSTGRES_DATABASE_URL=postgres://... python scripts/profile_startup.py --startup
+"""
+import argparse
+import os
+import re
+import subprocess
+import sys
+from typing import List, NamedTuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+_STARTUP_CODE = """
+import asyncio
+from time import perf_counter
+started = perf_counter()
+from app.main import app
+imported = perf_counter()
+async def main():
+    await app.router.startup()
+    ready = perf_counter()
+    await app.router.shutdown()
+    return ready
+ready = asyncio.run(main())
+print(f"import={(imported - started) * 1000:.0f} startup={(ready - imported) * 1000:.0f}")
+"""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def parse_importtime(stderr: str) -> List[ImportTime]:
+    entries = []
+    for line in stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            entries.append(
+                ImportTime(
+                    module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2
+                )
+            )
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Perfil de importación y arranque de app.main"
+    )
+    parser.add_argument("--module", default="app.main", help="Módulo a importar")
+    parser.add_argument(
+        "--top", type=int, default=25, help="Número de módulos a mostrar"
+    )
+    parser.add_argument(
+        "--filter", help="Mostrar solo estos módulos (separados por comas)"
+    )
+    parser.add_argument(
+        "--startup", action="store_true", help="Medir también los eventos de arranque"
+    )
+    args = parser.parse_args()
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {args.module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        print(result.stderr[-2000:])
+        sys.exit(result.returncode)
+
+    entries = parse_importtime(result.stderr)
+    total = sum(entry.self_us for entry in entries)
+    print(f"Importar {args.module}: {total / 1000:.0f} ms en {len(entries)} módulos\n")
+
+    if args.filter:
+        wanted = tuple(args.filter.split(","))
+        selected = [entry for entry in entries if entry.module.startswith(wanted)]
+        for entry in selected:
+            print(f"  {entry.cumulative_us / 1000:>9.1f} ms  {entry.module}")
+        if not selected:
+            print("  (ninguno se importa al arrancar)")
+        return
+
+    # Importaciones directas del módulo (profundidad 1) por tiempo acumulado
+    direct = sorted(
+        (entry for entry in entries if entry.depth == 1),
+        key=lambda entry: entry.cumulative_us,
+        reverse=True,
+    )
+    print(f"{'acumulado':>12}  importado directamente por {args.module}")
+    for entry in direct[: args.top]:
+        print(f"{entry.cumulative_us / 1000:>9.1f} ms  {entry.module}")
+
+    print(f"\n{'propio':>12}  módulo")
+    for entry in sorted(entries, key=lambda entry: entry.self_us, reverse=True)[
+        : args.top
+    ]:
+        print(f"{entry.self_us / 1000:>9.1f} ms  {entry.module}")
+
+    if args.startup:
+        print("\nEventos de arranque (init_db + calentamiento)...")
+        result = subprocess.run(
+            [sys.executable, "-c", _STARTUP_CODE],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            print(result.stderr[-2000:])
+            sys.exit(result.returncode)
+        timings = dict(part.split("=") for part in result.stdout.split()[-2:])
+        print(f"  import: {timings['import']} ms, startup: {timings['startup']} ms")
+
+
+if __name__ == "__main__":
+    main()
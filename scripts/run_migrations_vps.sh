@@ -4,19 +4,8 @@
 DB_USER="tu_usuario"
 DB_NAME="tu_base_de_datos"
 DB_HOST="tu_host"
-MIGRATIONS_DIR="$(dirname "$0")/../db/migrations"
-
-# 1. Verificar e instalar dependencias
-if ! command -v goose &> /dev/null; then
-    echo "Instalando goose..."
-    if ! command -v go &> /dev/null; then
-        echo "Instalando Go..."
-        sudo apt update && sudo apt install -y golang-go
-    fi
-    go install github.com/pressly/goose/v3/cmd/goose@latest
-    export PATH="$PATH:$(go env GOPATH)/bin"
-fi
 
+# 1. Verificar dependencias
 if ! command -v psql &> /dev/null; then
     echo "Instalando PostgreSQL client..."
     sudo apt update && sudo apt install -y postgresql-client
@@ -35,10 +24,10 @@ else
     echo "Advertencia: pg_dump no disponible, omitiendo backup"
 fi
 
-# 3. Ejecutar migraciones
-echo "Aplicando migraciones desde $MIGRATIONS_DIR"
-cd "$MIGRATIONS_DIR"
-"$(go env GOPATH)/bin/goose" postgres "user=$DB_USER dbname=$DB_NAME host=$DB_HOST sslmode=disable" up
+# 3. Ejecutar migraciones (registradas en la tabla schema_migrations)
+echo "Aplicando migraciones desde $(dirname "$0")/../db/migrations"
+cd "$(dirname "$0")/.."
+POSTGRES_DATABASE_URL="postgres://$DB_USER@$DB_HOST/$DB_NAME" python scripts/migrate.py "$@"
 
 if [ $? -eq 0 ]; then
     echo "Migraciones aplicadas exitosamente"
@@ -0,0 +1,108 @@
+"""Trabajos de borrado por lotes contra el esquema de `db/create.sql`."""
+
+import time
+from uuid import uuid4
+
+
+def _wait(client, job_id, timeout=10.0):
+    deadline = time.monotonic() + timeout
+    while True:
+        response = client.get(f"/api/v1/deletion-jobs/{job_id}")
+        assert response.status_code == 200, response.text
+        job = response.json()
+        if job["state"] in ("Completed", "Failed") or time.monotonic() > deadline:
+            return job
+        time.sleep(0.05)
+
+
+def _enqueue(client, entity, entity_id):
+    response = client.post(
+        "/api/v1/deletion-jobs", json={"entity": entity, "entity_id": str(entity_id)}
+    )
+    assert response.status_code == 202, response.text
+    return response.json()["job_id"]
+
+
+def test_user_deletion_job(client, sql, store_world):
+    device_id = store_world["device_id"]
+    group_id = uuid4()
+    sql(
+        "execute",
+        'INSERT INTO "group" (group_id, name) VALUES ($1, $2)',
+        group_id,
+        f"Grupo {group_id.hex[:8]}",
+    )
+    sql(
+        "execute",
+        "INSERT INTO device_group (device_id, group_id) VALUES ($1, $2)",
+        device_id,
+        group_id,
+    )
+    sql(
+        "execute",
+        "INSERT INTO location (device_id, latitude, longitude) VALUES ($1, 4.6, -74.1)",
+        device_id,
+    )
+    sql(
+        "execute",
+        "INSERT INTO action (device_id, applied_by_id, action) VALUES ($1, $2, 'block')",
+        device_id,
+        store_world["vendor_id"],
+    )
+    sql(
+        "execute",
+        "INSERT INTO sim (device_id, icc_id, slot_index, operator, number) "
+        "VALUES ($1, $2, '0', 'Claro', '3000000000')",
+        device_id,
+        device_id.hex[:20],
+    )
+
+    job = _wait(client, _enqueue(client, "user", store_world["customer_id"]))
+
+    assert job["state"] == "Completed", job
+    for table, column in (
+        ("payment", "device_id"),
+        ("location", "device_id"),
+        ("action", "device_id"),
+        ("sim", "device_id"),
+        ("device_group", "device_id"),
+        ("device", "device_id"),
+    ):
+        count = sql(
+            "fetchval", f"SELECT count(*) FROM {table} WHERE {column} = $1", device_id
+        )
+        assert count == 0, table
+    assert (
+        sql(
+            "fetchval",
+            'SELECT count(*) FROM "user" WHERE user_id = $1',
+            store_world["customer_id"],
+        )
+        == 0
+    )
+    # El vendedor que enroló el dispositivo se conserva
+    assert (
+        sql(
+            "fetchval",
+            'SELECT count(*) FROM "user" WHERE user_id = $1',
+            store_world["vendor_id"],
+        )
+        == 1
+    )
+
+
+def test_store_deletion_job(client, sql, store_world):
+    store_id = store_world["store_id"]
+
+    job = _wait(client, _enqueue(client, "store", store_id))
+
+    assert job["state"] == "Completed", job
+    assert sql("fetchval", "SELECT count(*) FROM store WHERE id = $1", store_id) == 0
+    assert (
+        sql(
+            "fetchval",
+            'SELECT count(*) FROM "user" WHERE user_id = $1 AND store_id IS NULL',
+            store_world["vendor_id"],
+        )
+        == 1
+    )
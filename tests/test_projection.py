@@ -0,0 +1,31 @@
+"""Listados con `?fields=` (proyección dispersa) que incluyen la clave primaria."""
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "path, fields, key",
+    (
+        ("/api/v1/payments", "payment_id", "payment_id"),
+        ("/api/v1/plans", "plan_id,value", "plan_id"),
+        ("/api/v1/users/", "user_id,username", "user_id"),
+        ("/api/v1/stores/", "id,nombre", "id"),
+    ),
+)
+def test_projected_list_includes_pk(client, store_world, path, fields, key):
+    response = client.get(path, params={"fields": fields, "limit": 1000})
+
+    assert response.status_code == 200, response.text
+    rows = response.json()
+    assert rows and all(set(row) <= set(fields.split(",")) for row in rows)
+    assert all(isinstance(row[key], str) for row in rows)
+
+
+def test_projected_payments_of_plan(client, store_world):
+    response = client.get(
+        "/api/v1/payments",
+        params={"fields": "payment_id,value", "plan_id": str(store_world["plan_id"])},
+    )
+
+    assert response.status_code == 200, response.text
+    assert sorted(row["value"] for row in response.json()) == [5.0, 6.0]
@@ -0,0 +1,53 @@
+"""Respuestas orjson con filas leídas por asyncpg (UUID de asyncpg incluidos)."""
+
+import json
+
+import orjson
+
+from app.api.serialization import serializer_for
+from app.schemas.store import StoreDB
+from app.schemas.user_out import UserOut
+
+
+def test_response_encodes_asyncpg_rows(sql, store_world):
+    rows = sql(
+        "fetch", 'SELECT * FROM "user" WHERE store_id = $1', store_world["store_id"]
+    )
+    assert type(rows[0]["user_id"]).__module__.startswith("asyncpg")
+
+    response = serializer_for(UserOut).response([dict(row) for row in rows])
+
+    body = orjson.loads(response.body)
+    assert {user["user_id"] for user in body} == {
+        str(store_world["vendor_id"]),
+        str(store_world["customer_id"]),
+    }
+
+
+def test_response_encodes_asyncpg_dicts_without_schema(sql, store_world):
+    row = sql("fetchrow", "SELECT * FROM store WHERE id = $1", store_world["store_id"])
+
+    body = orjson.loads(serializer_for(StoreDB).response([dict(row)]).body)
+
+    assert body[0]["id"] == str(store_world["store_id"])
+
+
+def test_list_endpoints(client, store_world):
+    for path, key in (
+        ("/api/v1/users/", "vendor_id"),
+        ("/api/v1/stores/", "store_id"),
+        ("/api/v1/plans", "plan_id"),
+    ):
+        response = client.get(path, params={"limit": 1000})
+        assert response.status_code == 200, (path, response.text)
+        assert str(store_world[key]) in json.dumps(response.json())
+
+
+def test_single_row_projection(client, store_world):
+    for path, params in (
+        (f"/api/v1/users/{store_world['vendor_id']}", {"fields": "user_id,username"}),
+        (f"/api/v1/stores/{store_world['store_id']}", {"fields": "id,nombre"}),
+        (f"/api/v1/plans/{store_world['plan_id']}", {"fields": "plan_id,value"}),
+    ):
+        response = client.get(path, params=params)
+        assert response.status_code == 200, (path, response.text)
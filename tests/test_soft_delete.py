@@ -0,0 +1,43 @@
+"""Borrado lógico de usuarios con enrolamientos."""
+
+
+def _deleted(sql, table, pk, id_):
+    return sql("fetchval", f"SELECT deleted_at FROM {table} WHERE {pk} = $1", id_)
+
+
+def test_deleting_customer_hides_enrolment_and_device(client, sql, store_world):
+    response = client.delete(f"/api/v1/users/{store_world['customer_id']}")
+    assert response.status_code == 204, response.text
+
+    enrolment = client.get(f"/api/v1/enrolments/{store_world['enrolment_id']}")
+    assert enrolment.status_code == 404
+    device = client.get(f"/api/v1/devices/{store_world['device_id']}")
+    assert device.status_code == 404
+    # Misma marca de tiempo en toda la cascada
+    stamp = _deleted(sql, '"user"', "user_id", store_world["customer_id"])
+    assert stamp is not None
+    for table, pk, key in (
+        ("enrolment", "enrolment_id", "enrolment_id"),
+        ("device", "device_id", "device_id"),
+        ("plan", "plan_id", "plan_id"),
+    ):
+        assert _deleted(sql, table, pk, store_world[key]) == stamp, table
+    # El vendedor sigue vivo
+    assert _deleted(sql, '"user"', "user_id", store_world["vendor_id"]) is None
+
+
+def test_restoring_customer_restores_enrolment_and_device(client, sql, store_world):
+    customer_id = store_world["customer_id"]
+    assert client.delete(f"/api/v1/users/{customer_id}").status_code == 204
+
+    response = client.post(f"/api/v1/users/{customer_id}/restore")
+
+    assert response.status_code == 200, response.text
+    for table, pk, key in (
+        ("enrolment", "enrolment_id", "enrolment_id"),
+        ("device", "device_id", "device_id"),
+        ("plan", "plan_id", "plan_id"),
+    ):
+        assert _deleted(sql, table, pk, store_world[key]) is None, table
+    enrolment = client.get(f"/api/v1/enrolments/{store_world['enrolment_id']}")
+    assert enrolment.status_code == 200, enrolment.text
@@ -0,0 +1,32 @@
+"""Resumen de la tienda (`GET /stores/{id}/summary`)."""
+
+from app.services.store_summary import store_summary_service
+
+
+def _summary(client, store_id):
+    # El resumen se cachea unos segundos por tienda
+    store_summary_service._summaries.invalidate(store_id)
+    response = client.get(f"/api/v1/stores/{store_id}/summary")
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_summary_ignores_deleted_payments(client, sql, store_world):
+    store_id = store_world["store_id"]
+    before = _summary(client, store_id)
+    assert before["payments_month"]["count"] == 2
+    assert float(before["payments_month"]["value"]) == 11
+    assert before["active_plans"] == 0
+
+    # Borrado lógico, como DELETE /payments/{id}
+    sql(
+        "execute",
+        "UPDATE payment SET deleted_at = now() WHERE plan_id = $1 AND value = 5",
+        store_world["plan_id"],
+    )
+
+    after = _summary(client, store_id)
+    assert after["payments_month"]["count"] == 1
+    assert float(after["payments_month"]["value"]) == 6
+    # Con un pago de dos cuotas el plan vuelve a estar activo
+    assert after["active_plans"] == 1
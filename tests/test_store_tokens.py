@@ -0,0 +1,44 @@
+"""Consumo de tokens con el saldo repartido en contadores."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+
+def test_concurrent_consumes_on_sharded_store(client, sql, store_world):
+    store_id = store_world["store_id"]
+    tokens = f"/api/v1/stores/{store_id}/tokens"
+    sql("execute", "UPDATE store SET tokens_disponibles = 40 WHERE id = $1", store_id)
+    response = client.put(f"{tokens}/shards", json={"shards": 2})
+    assert response.status_code == 200, response.text
+
+    def consume(i):
+        return client.post(f"{tokens}/consume", json={"amount": 1, "reference": str(i)})
+
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        responses = list(pool.map(consume, range(20)))
+
+    assert [r.status_code for r in responses] == [200] * 20, [
+        r.text for r in responses if r.status_code != 200
+    ]
+    assert client.get(tokens).json()["balance"] == 20
+    consumed = sql(
+        "fetchval",
+        "SELECT -sum(delta) FROM store_token_ledger WHERE store_id = $1 "
+        "AND reason = 'consume'",
+        store_id,
+    )
+    assert consumed == 20
+
+
+def test_consume_across_shards(client, sql, store_world):
+    store_id = store_world["store_id"]
+    tokens = f"/api/v1/stores/{store_id}/tokens"
+    sql("execute", "UPDATE store SET tokens_disponibles = 10 WHERE id = $1", store_id)
+    assert client.put(f"{tokens}/shards", json={"shards": 2}).status_code == 200
+
+    # Ningún contador (5 y 5) basta por sí solo
+    response = client.post(f"{tokens}/consume", json={"amount": 8})
+
+    assert response.status_code == 200, response.text
+    assert sum(entry["delta"] for entry in response.json()) == -8
+    assert client.get(tokens).json()["balance"] == 2
+    assert client.post(f"{tokens}/consume", json={"amount": 3}).status_code == 409